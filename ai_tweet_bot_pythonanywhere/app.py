@@ -5,7 +5,8 @@ import time
 from datetime import datetime, timedelta
 from utils import (
     fetch_latest_ai_articles, generate_ai_tweet_with_mcp_analysis,
-    post_tweet, mark_article_as_posted, load_json, save_json,
+    post_tweet, mark_article_as_posted, load_posted_articles,
+    add_pending_tweet, update_pending_tweet, get_pending_tweets,
     get_posted_articles_summary, reset_all_data, clear_pending_tweets,
     get_data_statistics, load_automation_settings, save_automation_settings,
     get_automation_status, send_telegram_notification, test_telegram_connection,
@@ -40,8 +41,8 @@ def index():
                 last_check_time = current_time
         
         # Sayfa verilerini hazırla
-        articles = load_json("posted_articles.json")
-        pending_tweets = load_json("pending_tweets.json")
+        articles = load_posted_articles()
+        pending_tweets = get_pending_tweets("pending")
         stats = get_data_statistics()
         automation_status = get_automation_status()
         
@@ -129,15 +130,8 @@ def check_and_post_articles():
                     else:
                         print(f"❌ Tweet paylaşım hatası: {tweet_result.get('error', 'Bilinmeyen hata')}")
                 else:
-                    # Pending listesine ekle
-                    pending_tweets = load_json("pending_tweets.json")
-                    pending_tweets.append({
-                        "article": article,
-                        "tweet_data": tweet_data,
-                        "created_at": datetime.now().isoformat(),
-                        "status": "pending"
-                    })
-                    save_json("pending_tweets.json", pending_tweets)
+                    # Onay kuyruğuna ekle (kilitli, id'li kayıt)
+                    add_pending_tweet(article, tweet_data['tweet'], impact_score)
                     print(f"📝 Tweet onay bekliyor: {article['title'][:50]}...")
                 
                 # Rate limiting
@@ -154,6 +148,13 @@ def check_and_post_articles():
         print(f"❌ Makale kontrol hatası: {e}")
         return {"success": False, "message": str(e)}
 
+def find_pending_tweet(tweet_id):
+    """Bekleyen tweet'i kuyruk id'si ile bul (liste sırası eşzamanlı yazımlarda değişebilir)"""
+    for pending in get_pending_tweets("pending"):
+        if pending.get('id') == str(tweet_id):
+            return pending
+    return None
+
 @app.route('/post_tweet', methods=['POST'])
 def post_tweet_route():
     """Tweet paylaşım endpoint'i"""
@@ -164,21 +165,15 @@ def post_tweet_route():
         if not tweet_id:
             return jsonify({"success": False, "error": "Tweet ID gerekli"})
         
-        # Pending tweet'i bul
-        pending_tweets = load_json("pending_tweets.json")
-        tweet_to_post = None
-        
-        for i, pending in enumerate(pending_tweets):
-            if str(i) == str(tweet_id):
-                tweet_to_post = pending
-                break
+        # Bekleyen tweet'i kuyruk id'si ile bul
+        tweet_to_post = find_pending_tweet(tweet_id)
         
         if not tweet_to_post:
             return jsonify({"success": False, "error": "Tweet bulunamadı"})
         
         # Tweet'i paylaş
         tweet_result = post_tweet(
-            tweet_to_post['tweet_data']['tweet'], 
+            tweet_to_post['tweet_text'], 
             tweet_to_post['article']['title']
         )
         
@@ -186,15 +181,14 @@ def post_tweet_route():
             # Başarılı paylaşım
             mark_article_as_posted(tweet_to_post['article'], tweet_result)
             
-            # Pending listesinden kaldır
-            pending_tweets = [p for i, p in enumerate(pending_tweets) if str(i) != str(tweet_id)]
-            save_json("pending_tweets.json", pending_tweets)
+            # Kuyrukta paylaşıldı olarak işaretle (arşive taşınır)
+            update_pending_tweet(tweet_to_post, status='posted')
             
             # Telegram bildirimi
             settings = load_automation_settings()
             if settings.get('telegram_notifications', False):
                 send_telegram_notification(
-                    f"✅ Tweet manuel olarak paylaşıldı!\n\n{tweet_to_post['tweet_data']['tweet'][:100]}...",
+                    f"✅ Tweet manuel olarak paylaşıldı!\n\n{tweet_to_post['tweet_text'][:100]}...",
                     tweet_result.get('tweet_url', ''),
                     tweet_to_post['article']['title']
                 )
@@ -223,10 +217,10 @@ def delete_tweet_route():
         if not tweet_id:
             return jsonify({"success": False, "error": "Tweet ID gerekli"})
         
-        # Pending listesinden kaldır
-        pending_tweets = load_json("pending_tweets.json")
-        pending_tweets = [p for i, p in enumerate(pending_tweets) if str(i) != str(tweet_id)]
-        save_json("pending_tweets.json", pending_tweets)
+        # Kayıt silinmez, reddedildi olarak arşive taşınır
+        tweet_to_delete = find_pending_tweet(tweet_id)
+        if not tweet_to_delete or not update_pending_tweet(tweet_to_delete, status='rejected'):
+            return jsonify({"success": False, "error": "Tweet bulunamadı"})
         
         return jsonify({"success": True, "message": "Tweet silindi"})
         
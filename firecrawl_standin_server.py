@@ -0,0 +1,196 @@
+"""Firecrawl HTTP API için yerel yedek sunucu (geliştirme ve test amaçlı)
+
+utils.FirecrawlClient'ın kullandığı uçları taklit eder:
+  POST /v1/scrape             {"url", "formats", ...}  -> {"success", "data"}
+  POST /v1/batch/scrape       {"urls", "formats", ...} -> {"success", "id", "url"}
+  GET  /v1/batch/scrape/<id>  -> {"success", "status", "total", "completed", "data"}
+
+Kullanım:
+  python firecrawl_standin_server.py                 # sayfaları indirip markdown üretir
+  python firecrawl_standin_server.py --offline       # ağ yok, URL'den türetilmiş sabit içerik
+  python firecrawl_standin_server.py --port 3000 --api-key test-key
+
+mcp_config.json > firecrawl_mcp.server_url bu sunucunun adresine (varsayılan
+http://localhost:3000) ayarlanıp mcp_enabled ve firecrawl_mcp.enabled açılmalıdır.
+"""
+
+import argparse
+import json
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin, urlparse
+
+import utils
+
+def scrape_page(url, formats, offline=False):
+    """URL'yi Firecrawl belge biçiminde (markdown, links, metadata) döndür"""
+    if offline:
+        slug = urlparse(url).path.rstrip("/").rsplit("/", 1)[-1] or "index"
+        title = f"Stand-in article {slug}"
+        paragraphs = [
+            f"Paragraph {index} of the stand-in article for {url}, served without network access."
+            for index in range(1, 6)
+        ]
+        links = []
+        metadata = {"title": title, "statusCode": 200}
+    else:
+        response = utils.http_get(url, headers={"User-Agent": utils.HTTP_USER_AGENT})
+        soup = utils.parse_html(response.text)
+        content, _ = utils.extract_main_content(soup)
+        heading = soup.find("h1") or soup.find("title")
+        title = heading.get_text(" ", strip=True) if heading else ""
+        paragraphs = content.split("\n") if content else []
+        links = [urljoin(url, link["href"]) for link in soup.find_all("a", href=True)]
+        metadata = {
+            "title": title,
+            "statusCode": response.status_code,
+            "canonical": utils.extract_canonical_url(soup, url)
+        }
+
+    metadata.update({"sourceURL": url, "url": url})
+    document = {"metadata": metadata}
+    if "markdown" in formats:
+        document["markdown"] = "\n\n".join([f"# {title}"] + paragraphs)
+    if "links" in formats:
+        document["links"] = links
+    return document
+
+class StandInState:
+    """Toplu scrape işleri ve bunları işleyen thread havuzu"""
+
+    def __init__(self, offline=False, api_key="", workers=4):
+        self.offline = offline
+        self.api_key = api_key
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="standin-scrape")
+
+    def start_batch(self, urls, formats):
+        job_id = str(uuid.uuid4())
+        with self.lock:
+            self.jobs[job_id] = {
+                "status": "scraping",
+                "total": len(urls),
+                "completed": 0,
+                "data": [],
+                "createdAt": datetime.now().isoformat()
+            }
+
+        def _scrape(url):
+            try:
+                document = scrape_page(url, formats, self.offline)
+            except Exception as e:
+                print(f"[STANDIN] {url} çekilemedi: {e}")
+                document = None
+            with self.lock:
+                job = self.jobs[job_id]
+                if document is not None:
+                    job["data"].append(document)
+                job["completed"] += 1
+                if job["completed"] >= job["total"]:
+                    job["status"] = "completed"
+
+        for url in urls:
+            self.executor.submit(_scrape, url)
+        if not urls:
+            self.jobs[job_id]["status"] = "completed"
+        return job_id
+
+    def get_job(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return json.loads(json.dumps(job)) if job else None
+
+def make_handler(state):
+    class StandInHandler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _authorized(self):
+            if state.api_key and self.headers.get("Authorization") != f"Bearer {state.api_key}":
+                self._send(401, {"success": False, "error": "Unauthorized"})
+                return False
+            return True
+
+        def _read_json(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                return json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                return None
+
+        def do_POST(self):
+            if not self._authorized():
+                return
+            payload = self._read_json()
+            if not isinstance(payload, dict):
+                self._send(400, {"success": False, "error": "Geçersiz JSON"})
+                return
+            formats = payload.get("formats") or ["markdown"]
+
+            if self.path == "/v1/scrape":
+                if not payload.get("url"):
+                    self._send(400, {"success": False, "error": "url gerekli"})
+                    return
+                try:
+                    document = scrape_page(payload["url"], formats, state.offline)
+                except Exception as e:
+                    self._send(500, {"success": False, "error": str(e)})
+                    return
+                self._send(200, {"success": True, "data": document})
+            elif self.path == "/v1/batch/scrape":
+                urls = payload.get("urls")
+                if not isinstance(urls, list):
+                    self._send(400, {"success": False, "error": "urls listesi gerekli"})
+                    return
+                job_id = state.start_batch(urls, formats)
+                host = self.headers.get("Host") or f"localhost:{self.server.server_address[1]}"
+                self._send(200, {"success": True, "id": job_id, "url": f"http://{host}/v1/batch/scrape/{job_id}"})
+            else:
+                self._send(404, {"success": False, "error": "Bilinmeyen uç"})
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            prefix = "/v1/batch/scrape/"
+            job = state.get_job(self.path[len(prefix):]) if self.path.startswith(prefix) else None
+            if job is None:
+                self._send(404, {"success": False, "error": "İş bulunamadı"})
+                return
+            self._send(200, {"success": True, **job})
+
+        def log_message(self, format, *args):
+            print(f"[STANDIN] {self.address_string()} {format % args}")
+
+    return StandInHandler
+
+def main():
+    parser = argparse.ArgumentParser(description="Yerel Firecrawl yedek sunucusu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--api-key", default="", help="Verilirse Bearer anahtarı zorunlu olur")
+    parser.add_argument("--offline", action="store_true", help="Ağa çıkmadan sabit içerik döndür")
+    args = parser.parse_args()
+
+    state = StandInState(offline=args.offline, api_key=args.api_key)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    mode = "çevrimdışı" if args.offline else "canlı"
+    print(f"🔥 Firecrawl yedek sunucusu ({mode}) http://{args.host}:{args.port} adresinde dinliyor")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("⏹️ Sunucu durduruldu")
+    finally:
+        server.server_close()
+        state.executor.shutdown(wait=False)
+
+if __name__ == "__main__":
+    main()
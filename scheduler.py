@@ -1,24 +1,39 @@
 import schedule
 import time
 import os
+import queue
+import threading
 from datetime import datetime
 from dotenv import load_dotenv
 from utils import (
     fetch_latest_ai_articles, 
     summarize_article, 
     score_article,
+    score_article_data,
     generate_ai_tweet_with_content,
     post_tweet,
     mark_article_as_posted,
     check_duplicate_articles,
+    compact_pending_queue_async,
     load_json,
     save_json,
     load_automation_settings,
-    get_automation_status
+    get_automation_status,
+    apply_rate_limit_settings,
+    get_rate_limiter_stats,
+    add_pending_tweet,
+    commit_news_poll_state,
+    flush_persistent_caches
 )
 
 load_dotenv()
 
+# Pipeline aşamaları arasındaki kuyrukların kapasitesi
+PIPELINE_QUEUE_SIZE = 2
+
+# Kuyruk sonu işareti
+_PIPELINE_DONE = object()
+
 class AutoTweetScheduler:
     def __init__(self):
         self.api_key = os.getenv("GOOGLE_API_KEY")
@@ -54,6 +69,9 @@ class AutoTweetScheduler:
             self.require_manual_approval = settings.get("require_manual_approval", True)
             self.rate_limit_delay = settings.get("rate_limit_delay", 2)
             
+            # API bütçelerini güncel ayarlarla yenile
+            apply_rate_limit_settings(settings)
+            
             print(f"[CONFIG] Ayarlar yüklendi:")
             print(f"  - Otomatik mod: {'AÇIK' if self.auto_mode else 'KAPALI'}")
             print(f"  - Minimum skor: {self.min_score}")
@@ -107,92 +125,184 @@ class AutoTweetScheduler:
             if cleaned_count > 0:
                 print(f"[INFO] {cleaned_count} eski makale temizlendi")
             
-            # Yeni makaleleri çek
-            articles = fetch_latest_ai_articles()
+            # Onay kuyruğu arşivine saklama politikasını arka planda uygula
+            compact_pending_queue_async()
+            
+            # Yeni makaleleri çek (liste sayfası değişmediyse hiçbir şey çekilmez)
+            poll_state = {}
+            articles = fetch_latest_ai_articles(skip_unchanged=True, poll_state=poll_state)
             
             if not articles:
+                commit_news_poll_state(poll_state)
                 print("[INFO] Yeni makale bulunamadı")
                 return
             
             print(f"[INFO] {len(articles)} yeni makale bulundu")
             
             # Maksimum makale sayısını sınırla
-            if len(articles) > self.max_articles_per_run:
+            truncated = len(articles) > self.max_articles_per_run
+            if truncated:
                 articles = articles[:self.max_articles_per_run]
                 print(f"[INFO] Maksimum {self.max_articles_per_run} makale ile sınırlandırıldı")
             
-            processed_count = 0
-            for article in articles:
-                try:
-                    print(f"[PROCESSING] {article['title'][:60]}...")
-                    
-                    # Makale skorunu hesapla
-                    score = score_article(article["content"], self.api_key)
-                    
-                    # API hatası kontrolü
-                    if score == 5 and "API" in str(score):  # Varsayılan skor API hatası olabilir
-                        print(f"[WARNING] API hatası olabilir, devam ediliyor...")
-                    
-                    # Minimum skor kontrolü
-                    if score < self.min_score:
-                        print(f"[SKIP] Düşük skor ({score}): {article['title'][:50]}...")
-                        continue
-                    
-                    # Tweet oluştur
-                    tweet_text = generate_ai_tweet_with_content(article, self.api_key)
-                    
-                    if "oluşturulamadı" in tweet_text:
-                        print(f"[ERROR] Tweet oluşturulamadı: {article['title'][:50]}...")
-                        continue
-                    
-                    # Paylaşım stratejisi
-                    if self.auto_post_enabled and not self.require_manual_approval:
-                        # Direkt otomatik paylaş
-                        result = post_tweet(tweet_text, article.get('title', ''))
+            stats = self.run_article_pipeline(articles, verbose=True)
+            processed_count = stats["posted"] + stats["pending"]
+            self.commit_poll_state(poll_state, stats, truncated)
+            
+            print(f"[COMPLETED] {processed_count} makale işlendi")
+            
+        except Exception as e:
+            print(f"[ERROR] Otomatik işlem hatası: {e}")
+    
+    def run_article_pipeline(self, articles, verbose=False):
+        """Makaleleri aşamalı pipeline ile işle: skor -> tweet oluşturma -> paylaşım
+        
+        Her aşama ayrı thread'de çalışır ve sınırlı kuyruklarla bağlanır. Böylece
+        N+1. makalenin skorlanması/tweet'i, N. makalenin paylaşım beklemesiyle
+        örtüşür. Beklemeler API bazlı token bucket'larda yapılır.
+        """
+        stats = {"posted": 0, "pending": 0, "post_failed": 0, "skipped": 0, "errors": 0}
+        stats_lock = threading.Lock()
+        
+        # Rate limiter metrikleri süreç boyunca birikir - bu tur için sıfırla
+        get_rate_limiter_stats(reset=True)
+        
+        score_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        generate_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        publish_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        
+        def count(key):
+            with stats_lock:
+                stats[key] += 1
+        
+        def feed_stage():
+            try:
+                for article in articles:
+                    score_queue.put(article)
+            finally:
+                score_queue.put(_PIPELINE_DONE)
+        
+        def score_stage():
+            try:
+                while True:
+                    article = score_queue.get()
+                    if article is _PIPELINE_DONE:
+                        break
+                    try:
+                        if verbose:
+                            print(f"[PROCESSING] {article['title'][:60]}...")
+                        
+                        # Makale skorunu hesapla
+                        score = score_article_data(article, self.api_key)
+                        
+                        # Minimum skor kontrolü
+                        if score < self.min_score:
+                            if verbose:
+                                print(f"[SKIP] Düşük skor ({score}): {article['title'][:50]}...")
+                            count("skipped")
+                            continue
+                        
+                        generate_queue.put((article, score))
+                    except Exception as e:
+                        print(f"[ERROR] Makale işleme hatası: {e}")
+                        count("errors")
+            finally:
+                generate_queue.put(_PIPELINE_DONE)
+        
+        def generate_stage():
+            try:
+                while True:
+                    item = generate_queue.get()
+                    if item is _PIPELINE_DONE:
+                        break
+                    article, score = item
+                    try:
+                        # Tweet oluştur
+                        tweet_text = generate_ai_tweet_with_content(article, self.api_key)
+                        
+                        if "oluşturulamadı" in tweet_text:
+                            print(f"[ERROR] Tweet oluşturulamadı: {article['title'][:50]}...")
+                            count("errors")
+                            continue
                         
-                        if result["success"]:
-                            mark_article_as_posted(article, result)
+                        publish_queue.put((article, tweet_text, score))
+                    except Exception as e:
+                        print(f"[ERROR] Makale işleme hatası: {e}")
+                        count("errors")
+            finally:
+                publish_queue.put(_PIPELINE_DONE)
+        
+        workers = [
+            threading.Thread(target=feed_stage, name="pipeline-feed", daemon=True),
+            threading.Thread(target=score_stage, name="pipeline-score", daemon=True),
+            threading.Thread(target=generate_stage, name="pipeline-generate", daemon=True)
+        ]
+        for worker in workers:
+            worker.start()
+        
+        # Paylaşım aşaması - çağıran thread'de; Twitter bütçesi post_tweet içindeki token bucket'ta
+        while True:
+            item = publish_queue.get()
+            if item is _PIPELINE_DONE:
+                break
+            article, tweet_text, score = item
+            try:
+                if self.auto_post_enabled and not self.require_manual_approval:
+                    # Direkt otomatik paylaş
+                    result = post_tweet(tweet_text, article.get('title', ''))
+                    
+                    if result["success"]:
+                        mark_article_as_posted(article, result)
+                        count("posted")
+                        if verbose:
                             print(f"[SUCCESS] Tweet otomatik paylaşıldı: {result['url']}")
                             if result.get('telegram_sent'):
                                 print(f"[SUCCESS] Telegram bildirimi gönderildi")
-                            processed_count += 1
-                        else:
-                            print(f"[ERROR] Tweet paylaşım hatası: {result['error']}")
                     else:
-                        # Manuel onay için kaydet
-                        self.save_pending_tweet(article, tweet_text, score)
+                        count("post_failed")
+                        print(f"[ERROR] Tweet paylaşım hatası: {result['error']}")
+                else:
+                    # Manuel onay için kaydet
+                    self.save_pending_tweet(article, tweet_text, score)
+                    count("pending")
+                    if verbose:
                         print(f"[PENDING] Manuel onay için kaydedildi: {article['title'][:50]}...")
-                        processed_count += 1
-                    
-                    # Rate limiting için bekleme
-                    if self.rate_limit_delay > 0:
-                        time.sleep(self.rate_limit_delay)
-                    
-                except Exception as e:
-                    print(f"[ERROR] Makale işleme hatası: {e}")
-                    continue
-            
-            print(f"[COMPLETED] {processed_count} makale işlendi")
-            
-        except Exception as e:
-            print(f"[ERROR] Otomatik işlem hatası: {e}")
+            except Exception as e:
+                print(f"[ERROR] Makale işleme hatası: {e}")
+                count("errors")
+        
+        for worker in workers:
+            worker.join()
+        
+        # Turda biriken makale/Gemini önbellek kayıtları tek seferde diske yazılır
+        flush_persistent_caches()
+        
+        # Bu turun rate limiter kuyruk bekleme metrikleri
+        for name, limiter_stats in get_rate_limiter_stats(reset=True).items():
+            if limiter_stats["acquired"] or limiter_stats["rejected"]:
+                print(f"[RATE LIMIT] {name}: {limiter_stats['acquired']} istek, "
+                      f"toplam bekleme {limiter_stats['total_wait_seconds']:.1f} sn, "
+                      f"en uzun {limiter_stats['max_wait_seconds']:.1f} sn, "
+                      f"reddedilen {limiter_stats['rejected']}")
+        
+        return stats
+    
+    def commit_poll_state(self, poll_state, stats, truncated):
+        """Kaynak doğrulayıcılarını sadece tüm adaylar işlendiyse kaydet
+        
+        Hata, paylaşım başarısızlığı ya da max_articles_per_run kesintisi varsa
+        kaydedilmez; sonraki turda kaynaklar yeniden taranır ve kalan adaylar
+        tekrar denenir (paylaşılanlar indeksle elenir).
+        """
+        if truncated or stats["errors"] or stats["post_failed"]:
+            print("[INFO] İşlenmemiş adaylar var, kaynak durumu sonraki tur için kaydedilmedi")
+            return
+        commit_news_poll_state(poll_state)
     
     def save_pending_tweet(self, article, tweet_text, score):
         """Manuel onay için tweet'i kaydet"""
         try:
-            pending_file = "pending_tweets.json"
-            pending_tweets = load_json(pending_file)
-            
-            pending_tweet = {
-                "article": article,
-                "tweet_text": tweet_text,
-                "score": score,
-                "created_date": datetime.now().isoformat(),
-                "status": "pending"
-            }
-            
-            pending_tweets.append(pending_tweet)
-            save_json(pending_file, pending_tweets)
+            add_pending_tweet(article, tweet_text, score)
             
         except Exception as e:
             print(f"Pending tweet kaydetme hatası: {e}")
@@ -277,11 +387,14 @@ def run_automation_once():
         
         # Tekrarlanan makaleleri temizle
         cleaned_count = check_duplicate_articles()
+        compact_pending_queue_async()
         
-        # Yeni makaleleri çek
-        articles = fetch_latest_ai_articles()
+        # Yeni makaleleri çek (liste sayfası değişmediyse hiçbir şey çekilmez)
+        poll_state = {}
+        articles = fetch_latest_ai_articles(skip_unchanged=True, poll_state=poll_state)
         
         if not articles:
+            commit_news_poll_state(poll_state)
             return {
                 "success": False,
                 "message": "Yeni makale bulunamadı",
@@ -292,6 +405,7 @@ def run_automation_once():
         new_articles = [a for a in articles if not a.get('already_posted', False)]
         
         if not new_articles:
+            commit_news_poll_state(poll_state)
             return {
                 "success": False,
                 "message": "Tüm makaleler daha önce paylaşılmış",
@@ -300,50 +414,15 @@ def run_automation_once():
             }
         
         # Maksimum makale sayısını sınırla
-        if len(new_articles) > scheduler.max_articles_per_run:
+        truncated = len(new_articles) > scheduler.max_articles_per_run
+        if truncated:
             new_articles = new_articles[:scheduler.max_articles_per_run]
         
-        processed_count = 0
-        pending_count = 0
-        posted_count = 0
-        
-        for article in new_articles:
-            try:
-                # Makale skorunu hesapla
-                score = score_article(article["content"], scheduler.api_key)
-                
-                # Minimum skor kontrolü
-                if score < scheduler.min_score:
-                    continue
-                
-                # Tweet oluştur
-                tweet_text = generate_ai_tweet_with_content(article, scheduler.api_key)
-                
-                if "oluşturulamadı" in tweet_text:
-                    continue
-                
-                # Paylaşım stratejisi
-                if scheduler.auto_post_enabled and not scheduler.require_manual_approval:
-                    # Direkt otomatik paylaş
-                    result = post_tweet(tweet_text, article.get('title', ''))
-                    
-                    if result["success"]:
-                        mark_article_as_posted(article, result)
-                        posted_count += 1
-                else:
-                    # Manuel onay için kaydet
-                    scheduler.save_pending_tweet(article, tweet_text, score)
-                    pending_count += 1
-                
-                processed_count += 1
-                
-                # Rate limiting
-                if scheduler.rate_limit_delay > 0:
-                    time.sleep(scheduler.rate_limit_delay)
-                
-            except Exception as e:
-                print(f"[ERROR] Makale işleme hatası: {e}")
-                continue
+        stats = scheduler.run_article_pipeline(new_articles)
+        scheduler.commit_poll_state(poll_state, stats, truncated)
+        pending_count = stats["pending"]
+        posted_count = stats["posted"]
+        processed_count = stats["posted"] + stats["pending"] + stats["post_failed"]
         
         return {
             "success": True,
@@ -4,16 +4,18 @@ import json
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from utils import (
-    fetch_latest_ai_articles, summarize_article, score_article,
+    fetch_latest_ai_articles, summarize_article, score_article, score_article_data,
     categorize_article, generate_ai_tweet_with_content, create_pdf,
     load_json, save_json, post_tweet, mark_article_as_posted,
+    add_pending_tweet, update_pending_tweet, get_pending_tweets,
     check_duplicate_articles, setup_twitter_api, get_posted_articles_summary,
-    reset_all_data, clear_pending_tweets, get_data_statistics,
+    reset_all_data, clear_pending_tweets, compact_pending_queue, get_data_statistics,
     load_automation_settings, save_automation_settings, get_automation_status,
     update_scheduler_settings, validate_automation_settings,
     send_telegram_notification, test_telegram_connection, get_telegram_chat_id,
     check_telegram_configuration, save_telegram_chat_id, auto_detect_and_save_chat_id,
-    load_mcp_config, save_mcp_config, get_mcp_status, test_mcp_connection
+    load_mcp_config, save_mcp_config, get_mcp_status, test_mcp_connection,
+    GEMINI_SUPPORTED_MODELS
 )
 
 load_dotenv()
@@ -445,7 +447,6 @@ with st.sidebar:
     # İstatistikler
     st.header("📈 İstatistikler")
     posted_summary = get_posted_articles_summary()
-    pending_tweets = load_json("pending_tweets.json")
     data_stats = get_data_statistics()
     
     st.metric("Toplam Paylaşılan", posted_summary["total_posted"])
@@ -474,6 +475,15 @@ with st.sidebar:
             else:
                 st.error(result["message"])
     
+    # Kuyruk arşivine saklama politikasını uygula
+    if st.button("🗜️ Tweet Arşivini Sıkıştır", type="secondary", key="data_compact_queue"):
+        with st.spinner("Tweet arşivi sıkıştırılıyor..."):
+            result = compact_pending_queue()
+            if result["success"]:
+                st.success(result["message"])
+            else:
+                st.error(result["message"])
+    
     # Tüm verileri sıfırla
     st.markdown("---")
     st.markdown("⚠️ **Dikkat: Geri alınamaz işlemler**")
@@ -557,7 +567,7 @@ with col1:
                     # Analiz butonu
                     if st.button(f"📊 Analiz Et", key=f"analyze_{idx}"):
                         with st.spinner("Analiz ediliyor..."):
-                            score = score_article(article['content'], GOOGLE_API_KEY)
+                            score = score_article_data(article, GOOGLE_API_KEY)
                             category = categorize_article(article['content'], GOOGLE_API_KEY)
                             summary = summarize_article(article['content'], GOOGLE_API_KEY)
                             
@@ -621,16 +631,7 @@ with col1:
                         # Kaydet butonu
                         if st.button(f"💾 Kaydet", key=f"tweet_save_{idx}"):
                             # Pending tweets'e kaydet
-                            pending_tweets = load_json("pending_tweets.json")
-                            pending_tweet = {
-                                "article": article,
-                                "tweet_text": tweet_text,
-                                "score": article.get('score', 0),
-                                "created_date": datetime.now().isoformat(),
-                                "status": "pending"
-                            }
-                            pending_tweets.append(pending_tweet)
-                            save_json("pending_tweets.json", pending_tweets)
+                            add_pending_tweet(article, tweet_text, article.get('score', 0))
                             st.success("💾 Tweet kaydedildi!")
                         
                         # Düzenle butonu
@@ -659,8 +660,7 @@ with col2:
     st.header("⏳ Bekleyen Tweet'ler")
     
     # Bekleyen tweet'leri göster
-    pending_tweets = load_json("pending_tweets.json")
-    pending_list = [t for t in pending_tweets if t.get("status") == "pending"]
+    pending_list = get_pending_tweets("pending")
     
     if pending_list:
         st.info(f"📊 {len(pending_list)} bekleyen tweet var")
@@ -677,8 +677,7 @@ with col2:
                         if result["success"]:
                             mark_article_as_posted(pending['article'], result)
                             # Pending'den kaldır
-                            pending['status'] = 'posted'
-                            save_json("pending_tweets.json", pending_tweets)
+                            update_pending_tweet(pending, status='posted')
                             success_msg = "✅ Tweet paylaşıldı!"
                             if result.get('telegram_sent'):
                                 success_msg += "\n📱 Telegram bildirimi gönderildi!"
@@ -690,8 +689,7 @@ with col2:
                         st.error("❌ Twitter API bağlantısı yok")
                 
                 if st.button(f"❌ Reddet", key=f"pending_reject_{idx}"):
-                    pending['status'] = 'rejected'
-                    save_json("pending_tweets.json", pending_tweets)
+                    update_pending_tweet(pending, status='rejected')
                     st.info("❌ Tweet reddedildi")
                     st.rerun()
                 
@@ -704,8 +702,7 @@ with col2:
                     new_tweet = st.text_area("Yeni Tweet:", pending['tweet_text'], key=f"pending_edit_text_{idx}")
                     
                     if st.button(f"💾 Kaydet", key=f"pending_edit_save_{idx}"):
-                        pending['tweet_text'] = new_tweet
-                        save_json("pending_tweets.json", pending_tweets)
+                        update_pending_tweet(pending, tweet_text=new_tweet)
                         st.session_state[f'editing_pending_{idx}'] = False
                         st.success("💾 Değişiklikler kaydedildi!")
                         st.rerun()
@@ -886,16 +883,13 @@ with tab2:
         )
     
     with col2:
+        ai_model_options = list(GEMINI_SUPPORTED_MODELS)
+        current_ai_model = mcp_config.get("ai_analysis", {}).get("model", "gemini-2.0-flash")
         ai_model = st.selectbox(
             "🧠 AI Model",
-            options=[
-                "deepseek/deepseek-chat-v3-0324:free",
-                "meta-llama/llama-3.2-3b-instruct:free",
-                "microsoft/phi-3-mini-128k-instruct:free",
-                "google/gemma-2-9b-it:free"
-            ],
-            index=0,
-            help="Kullanılacak AI modeli",
+            options=ai_model_options,
+            index=ai_model_options.index(current_ai_model) if current_ai_model in ai_model_options else 0,
+            help="Kullanılacak Gemini modeli",
             disabled=not ai_analysis_enabled
         )
         
@@ -924,6 +918,8 @@ with tab2:
                     "fallback_enabled": True
                 },
                 "content_extraction": {
+                    # Arayüzde gösterilmeyen ayarları (paralel çekme vb.) koru
+                    **mcp_config.get("content_extraction", {}),
                     "max_content_length": max_content_length,
                     "min_content_length": min_content_length,
                     "wait_time": wait_time,
@@ -931,6 +927,7 @@ with tab2:
                     "only_main_content": only_main_content
                 },
                 "ai_analysis": {
+                    **mcp_config.get("ai_analysis", {}),
                     "enabled": ai_analysis_enabled,
                     "max_tokens": ai_max_tokens,
                     "temperature": ai_temperature,
@@ -969,7 +966,7 @@ with tab2:
                     "enabled": True,
                     "max_tokens": 300,
                     "temperature": 0.7,
-                    "model": "deepseek/deepseek-chat-v3-0324:free",
+                    "model": "gemini-2.0-flash",
                     "fallback_enabled": True
                 }
             }
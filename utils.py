@@ -1,319 +1,3405 @@
 import os
 import json
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 from fpdf import FPDF
 import tweepy
 from datetime import datetime, timedelta
+import atexit
+import codecs
 import hashlib
+import html as html_lib
+from html.parser import HTMLParser
+from xml.etree import ElementTree
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, urljoin, urlunparse, urldefrag, parse_qsl, urlencode
+
+# lxml kuruluysa C tabanlı ayrıştırıcı kullanılır, yoksa html.parser
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# CSS seçicileri bir kez derlenir (soupsieve bs4 ile birlikte gelir)
+try:
+    import soupsieve
+except ImportError:
+    soupsieve = None
+
+# Firecrawl istemcisi (mcp_config.json > firecrawl_mcp: server_url, api_key, timeout, retry_count)
+FIRECRAWL_RETRY_STATUSES = (429, 500, 502, 503, 504)
+FIRECRAWL_RETRY_BACKOFF = 1.0
+# Toplu scrape işinin durumu bu aralıkla sorgulanır; iş için beklenecek süre
+# timeout + URL başına FIRECRAWL_BATCH_WAIT_PER_URL saniyedir
+FIRECRAWL_BATCH_POLL_INTERVAL = 2.0
+FIRECRAWL_BATCH_WAIT_PER_URL = 5
+
+class FirecrawlError(Exception):
+    """Firecrawl sunucusu isteği başarısız (tekrar denemeler tükendi ya da iş hata verdi)"""
+
+class FirecrawlClient:
+    """Firecrawl HTTP API istemcisi (/v1/scrape ve /v1/batch/scrape)
+    
+    Tüm istekler tek bir keep-alive requests.Session üzerinden gider; bağlantı
+    hataları, 429 ve 5xx yanıtları retry_count kez üstel bekleme ile tekrar denenir
+    (429'da Retry-After varsa onun kadar beklenir). Yan etkili istekler (toplu iş
+    oluşturma) sadece 429'da tekrar denenir, aynı iş iki kez başlatılmaz.
+    """
+    
+    def __init__(self, server_url, api_key="", timeout=30, retry_count=3):
+        self.server_url = server_url.rstrip("/")
+        self.timeout = timeout
+        self.retry_count = max(0, retry_count)
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json", "User-Agent": HTTP_USER_AGENT})
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=DEFAULT_FETCH_MAX_WORKERS)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    def _request(self, method, path, payload=None, idempotent=True):
+        url = path if path.startswith("http") else f"{self.server_url}{path}"
+        last_error = None
+        delay = 0
+        for attempt in range(self.retry_count + 1):
+            if attempt:
+                time.sleep(delay)
+            delay = FIRECRAWL_RETRY_BACKOFF * (2 ** attempt)
+            try:
+                response = self.session.request(method, url, json=payload, timeout=self.timeout)
+            except requests.RequestException as e:
+                last_error = f"bağlantı hatası: {e}"
+                if not idempotent:
+                    break
+                continue
+            # 429'da istek işlenmemiştir; yan etkili istekler sadece bu durumda tekrarlanır
+            if response.status_code in FIRECRAWL_RETRY_STATUSES and (idempotent or response.status_code == 429):
+                last_error = f"HTTP {response.status_code}"
+                retry_after = response.headers.get("Retry-After", "")
+                if response.status_code == 429 and retry_after.isdigit():
+                    delay = min(int(retry_after), self.timeout)
+                continue
+            try:
+                data = response.json()
+            except ValueError:
+                raise FirecrawlError(f"HTTP {response.status_code}: JSON olmayan yanıt")
+            if response.status_code >= 400 or data.get("success") is False:
+                raise FirecrawlError(data.get("error") or f"HTTP {response.status_code}")
+            return data
+        raise FirecrawlError(f"{method} {path} {attempt + 1} denemede başarısız ({last_error})")
+    
+    def scrape(self, params):
+        """Tek URL scrape - Firecrawl'ın data nesnesini döndürür"""
+        return self._request("POST", "/v1/scrape", params).get("data") or {}
+    
+    def batch_scrape(self, urls, params=None):
+        """URL listesini tek toplu iş olarak scrape et, {istenen URL: data} döndür
+        
+        Sonuçlar metadata.sourceURL ile önce birebir, eşleşmeyenler sonra kanonik
+        adres üzerinden eşlenir; kanonik adresi birden çok istenen URL'ye denk gelen
+        sonuç hiçbirine atanmaz. İşte sonucu gelmeyen URL'ler sözlükte yer almaz.
+        """
+        if not urls:
+            return {}
+        job = self._request("POST", "/v1/batch/scrape", {**(params or {}), "urls": list(urls)}, idempotent=False)
+        status_path = job.get("url") or f"/v1/batch/scrape/{job['id']}"
+        
+        deadline = time.time() + self.timeout + FIRECRAWL_BATCH_WAIT_PER_URL * len(urls)
+        documents = []
+        while True:
+            status = self._request("GET", status_path)
+            if status.get("status") == "failed":
+                raise FirecrawlError(status.get("error") or "toplu scrape işi başarısız")
+            if status.get("status") == "completed":
+                documents.extend(status.get("data") or [])
+                # Büyük sonuçlar sayfalanır
+                while status.get("next"):
+                    status = self._request("GET", status["next"])
+                    documents.extend(status.get("data") or [])
+                break
+            if time.time() >= deadline:
+                raise FirecrawlError(f"toplu scrape işi zaman aşımına uğradı ({status.get('completed', 0)}/{len(urls)})")
+            time.sleep(FIRECRAWL_BATCH_POLL_INTERVAL)
+        
+        requested = set(urls)
+        results = {}
+        unmatched = []
+        for document in documents:
+            metadata = document.get("metadata") or {}
+            source_url = metadata.get("sourceURL") or metadata.get("url") or ""
+            if source_url in requested and source_url not in results:
+                results[source_url] = document
+            else:
+                unmatched.append((source_url, document))
+        
+        # Sunucu adresi normalize ettiyse kanonik adres üzerinden, sadece tek adaya düşen eşleşmeler
+        by_canonical = {}
+        for url in requested - results.keys():
+            by_canonical.setdefault(canonicalize_url(url), []).append(url)
+        for source_url, document in unmatched:
+            candidates = by_canonical.get(canonicalize_url(source_url)) or []
+            if len(candidates) == 1 and candidates[0] not in results:
+                results[candidates[0]] = document
+        return results
+    
+    def close(self):
+        self.session.close()
+
+_firecrawl_client = None
+_firecrawl_client_key = None
+_firecrawl_client_lock = threading.Lock()
+
+def get_firecrawl_client():
+    """Konfigürasyona göre paylaşılan Firecrawl istemcisini döndür; MCP/Firecrawl kapalıysa None
+    
+    Ayarlar (server_url, api_key, timeout, retry_count) değişince istemci yeniden kurulur.
+    """
+    global _firecrawl_client, _firecrawl_client_key
+    config = load_mcp_config()
+    firecrawl_config = config.get("firecrawl_mcp", {})
+    if not (config.get("mcp_enabled", False) and firecrawl_config.get("enabled", False)):
+        return None
+    server_url = firecrawl_config.get("server_url", "")
+    if not server_url:
+        return None
+    
+    try:
+        timeout = max(1, int(firecrawl_config.get("timeout", 30)))
+        retry_count = max(0, int(firecrawl_config.get("retry_count", 3)))
+    except (TypeError, ValueError):
+        timeout, retry_count = 30, 3
+    key = (server_url, firecrawl_config.get("api_key", ""), timeout, retry_count)
+    
+    with _firecrawl_client_lock:
+        if _firecrawl_client is None or _firecrawl_client_key != key:
+            if _firecrawl_client is not None:
+                _firecrawl_client.close()
+            _firecrawl_client = FirecrawlClient(server_url, key[1], timeout=timeout, retry_count=retry_count)
+            _firecrawl_client_key = key
+        return _firecrawl_client
 
-# Firecrawl MCP fonksiyonları için placeholder
 def mcp_firecrawl_scrape(params):
-    """Firecrawl MCP scrape fonksiyonu - MCP server ile entegre edilecek"""
+    """Firecrawl scrape - başarılıysa data alanları (markdown, links, metadata) ile success True"""
     try:
-        # Bu fonksiyon MCP server ile entegre edildiğinde gerçek Firecrawl API'sini kullanacak
-        # Şimdilik fallback yöntemi kullanıyoruz
-        print(f"[MCP] Firecrawl scrape çağrısı: {params.get('url', 'unknown')}")
+        client = get_firecrawl_client()
+        if client is None:
+            return {"success": False, "reason": "Firecrawl MCP devre dışı veya server_url eksik"}
         
-        # Geçici olarak False döndür ki fallback yöntemi kullanılsın
-        # MCP entegrasyonu tamamlandığında bu fonksiyon gerçek Firecrawl API'sini çağıracak
-        return {
-            "success": False,
-            "reason": "MCP server henüz entegre edilmedi, fallback kullanılıyor"
-        }
+        print(f"[MCP] Firecrawl scrape çağrısı: {params.get('url', 'unknown')}")
+        return {"success": True, **client.scrape(params)}
         
     except Exception as e:
         print(f"[MCP] Firecrawl scrape hatası: {e}")
-        return {"success": False, "error": str(e)}
+        return {"success": False, "error": str(e), "reason": str(e)}
+
+def mcp_firecrawl_batch_scrape(urls, params=None):
+    """Birden çok URL'yi tek Firecrawl toplu işiyle scrape et - results: {URL: data}"""
+    try:
+        client = get_firecrawl_client()
+        if client is None:
+            return {"success": False, "reason": "Firecrawl MCP devre dışı veya server_url eksik"}
+        
+        print(f"[MCP] Firecrawl toplu scrape çağrısı: {len(urls)} URL")
+        return {"success": True, "results": client.batch_scrape(urls, params)}
+        
+    except Exception as e:
+        print(f"[MCP] Firecrawl toplu scrape hatası: {e}")
+        return {"success": False, "error": str(e), "reason": str(e)}
 
 HISTORY_FILE = "posted_articles.json"
+PENDING_FILE = "pending_tweets.json"
+PENDING_ARCHIVE_FILE = "pending_tweets_archive.jsonl"
+POSTED_JOURNAL_FILE = "posted_articles.jsonl"
 HASHTAG_FILE = "hashtags.json"
 ACCOUNT_FILE = "accounts.json"
 SUMMARY_FILE = "summaries.json"
 MCP_CONFIG_FILE = "mcp_config.json"
+LISTING_CACHE_FILE = "listing_cache.json"
+NEWS_SOURCES_FILE = "news_sources.json"
+FEED_SEEN_CACHE_FILE = "feed_seen_cache.json"
+ARTICLE_CACHE_FILE = "article_cache.json"
+CONTENT_SELECTOR_CACHE_FILE = "content_selectors.json"
+LLM_CACHE_FILE = "llm_cache.json"
+POSTED_INDEX_DB = "posted_index.db"
+AUTOMATION_SETTINGS_FILE = "automation_settings.json"
+
+# Durum dosyaları için depolama arka ucu: STORAGE_BACKEND=json (varsayılan) | sqlite
+STORAGE_BACKEND_ENV = "STORAGE_BACKEND"
+STORAGE_DB_ENV = "STORAGE_DB_PATH"
+STORAGE_DB_FILE = "bot_state.db"
+
+# Paylaşım günlüğü bu kadar satıra ulaşınca arka planda posted_articles.json'a birleştirilir
+POSTED_JOURNAL_COMPACT_THRESHOLD = 50
+
+# Paylaşım geçmişinde tutulan gün sayısı (automation_settings.json > history_retention_days)
+DEFAULT_HISTORY_RETENTION_DAYS = 30
+
+# Kanonik URL (sadece tekrar anahtarı): izleme parametreleri atılır, diğerleri tutulur.
+# Kaynak canonical_query_params listesi verirse o host için sadece bu parametreler tutulur.
+CANONICAL_TRACKING_PARAM_PREFIXES = ("utm_",)
+CANONICAL_TRACKING_PARAMS = ("ref", "ref_src", "fbclid", "gclid", "mc_cid", "mc_eid", "guccounter", "ncid", "cmpid")
+# Kanonik URL'de atılan host önekleri (www, AMP ve mobil kopyalar)
+CANONICAL_HOST_PREFIXES = ("www.", "amp.", "m.")
+# normalize_url mantığı değiştiğinde artırılır - indeksteki anahtarlar yeniden hesaplanır
+# (kaynakların canonical_query_params ayarları değişince de yeniden hesaplanır)
+URL_NORMALIZER_VERSION = "3"
+# Tarihli makale URL'leri (/2025/06/06/...) - liste sayfasındaki kategori/etiket linklerini eler
+ARTICLE_URL_DATE_PATTERN = re.compile(r"/20\d{2}/\d{2}/\d{2}/")
+
+# Haber kaynakları (news_sources.json yoksa veya boşsa kullanılır)
+DEFAULT_NEWS_SOURCES = [
+    {
+        "name": "techcrunch_ai",
+        "type": "html",
+        "url": "https://techcrunch.com/category/artificial-intelligence/",
+        "feed_url": "https://techcrunch.com/category/artificial-intelligence/feed/",
+        "link_selector": "a.loop-card__title-link",
+        "url_pattern": r"/20\d{2}/\d{2}/\d{2}/",
+        "max_articles": 4,
+        "fetch_interval_minutes": 0,
+        "enabled": True
+    }
+]
+NEWS_SOURCE_DEFAULTS = {
+    "type": "html",
+    "enabled": True,
+    "max_articles": 4,
+    "fetch_interval_minutes": 0,
+    "same_host_only": True,
+    "link_selector": "a",
+    "url_pattern": "",
+    "items_path": "",
+    "title_field": "title",
+    "url_field": "url",
+    "content_field": "",
+    "feed_url": "",
+    "canonical_query_params": None,
+    "keywords": [],
+    "exclude_keywords": []
+}
+
+ARTICLE_TITLE_SELECTORS = ["h1", "h1.entry-title", "h1.post-title", ".article-title h1"]
+ARTICLE_CONTENT_SELECTORS = [
+    "div.article-content p",
+    "div.entry-content p",
+    "div.post-content p",
+    "article p",
+    "div.content p",
+    ".article-body p"
+]
+# Bir içerik seçicisinin kazanmış sayılması için gereken metin uzunluğu
+ARTICLE_SELECTOR_MIN_CONTENT = 200
+# Metin yoğunluğu puanlaması (readability benzeri): aday bloklar, sınıf/id adına göre
+# artı/eksi ağırlık ve puana katılan en kısa paragraf
+READABILITY_CANDIDATE_TAGS = {"div", "article", "section", "main", "td"}
+READABILITY_POSITIVE_PATTERN = re.compile(r"article|body|content|entry|main|post|story|text", re.I)
+READABILITY_NEGATIVE_PATTERN = re.compile(
+    r"comment|footer|sidebar|nav|menu|promo|related|share|social|newsletter|subscribe|advert|widget", re.I)
+READABILITY_MIN_PARAGRAPH_LENGTH = 25
+# Öğrenilen seçiciler için kabul edilen sınıf/id adları (birden çok rakam içeren üretilmiş adlar hariç)
+LEARNABLE_NAME_PATTERN = re.compile(r"^(?!(?:.*\d){2})[a-zA-Z][\w-]*$")
+# Akışlı çıkarmada içi okunmayan etiketler (satır içi script/stil blokları)
+ARTICLE_STREAM_SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "iframe"}
+# "etiket.sınıf" biçimindeki seçiciler için liste sayfasında sadece o etiket ayrıştırılır
+SIMPLE_SELECTOR_PATTERN = re.compile(r"^([a-zA-Z][a-zA-Z0-9]*)(\.[\w-]+)*$")
+
+# Akış (RSS/Atom) keşfi: parça parça okunur, yeterli yeni kayıt bulununca indirme kesilir
+FEED_CHUNK_SIZE = 8192
+# Akışlar yeniden eskiye sıralı - art arda bu kadar bilinen kayıttan sonra okuma durur
+FEED_KNOWN_STREAK_LIMIT = 3
+# Akıştaki tam metin bu uzunluktaysa makale sayfası hiç indirilmez
+FEED_INLINE_CONTENT_MIN_LENGTH = 800
+# Ön filtreye takılan akış kayıtları bu süre boyunca tekrar değerlendirilmez
+FEED_SEEN_TTL_HOURS = 24 * 7
+FEED_SEEN_MAX_ENTRIES = 5000
+
+# Benzer haber tespiti: 64 bit SimHash, en fazla bu kadar farklı bit benzer sayılır
+# (automation_settings.json > near_duplicate_max_distance). Mesafe arttıkça bantlar
+# kısalır ve aday sayısı büyür; NEAR_DUPLICATE_MAX_DISTANCE_LIMIT üstü kabul edilmez.
+SIMHASH_BITS = 64
+DEFAULT_NEAR_DUPLICATE_MAX_DISTANCE = 6
+NEAR_DUPLICATE_MAX_DISTANCE_LIMIT = 10
+SIMHASH_CONTENT_CHARS = 3000
+
+# Onay kuyruğunda sonuçlanmış durumlar - bu kayıtlar aktif kuyruktan arşive taşınır
+PENDING_TERMINAL_STATUSES = ("posted", "rejected")
+
+# Kuyruk saklama politikası (automation_settings.json > retention ile ezilebilir, None = sınırsız)
+DEFAULT_RETENTION_POLICY = {
+    "pending": {"max_age_days": None, "max_entries": None},
+    "posted": {"max_age_days": 30, "max_entries": 500},
+    "rejected": {"max_age_days": 7, "max_entries": 100},
+}
+# Arşive taşınan kayıtların makale verisinden çıkarılan büyük alanlar
+RETENTION_STRIPPED_ARTICLE_FIELDS = ("content",)
+RETENTION_BATCH_SIZE = 500
+
+# Önbellek dosyalarına yazım aralığı (saniye) - aradaki kayıtlar bellekte birikip tek seferde yazılır
+PERSISTENT_CACHE_FLUSH_INTERVAL = 30
+
+# Makale içerik önbelleği ayarları
+ARTICLE_CACHE_TTL_HOURS = 72
+ARTICLE_CACHE_MAX_ENTRIES = 300
+
+# Alan adı bazlı öğrenilen içerik seçicileri (site tasarımı değişirse süre dolunca yeniden öğrenilir)
+CONTENT_SELECTOR_TTL_DAYS = 30
+CONTENT_SELECTOR_MAX_ENTRIES = 500
+
+# Gemini yanıt önbelleği ayarları
+LLM_CACHE_TTL_HOURS = 24 * 7
+LLM_CACHE_MAX_ENTRIES = 2000
+
+# Gemini model ayarları (mcp_config.json > ai_analysis ile ezilebilir)
+GEMINI_MODEL = "gemini-2.0-flash"
+# gemini_call'ın desteklediği modeller (arayüzde sadece bunlar listelenir)
+GEMINI_SUPPORTED_MODELS = ("gemini-2.0-flash", "gemini-1.5-flash")
+GEMINI_TEMPERATURE = 0.7
+GEMINI_MAX_TOKENS = 300
+GEMINI_STRUCTURED_MAX_TOKENS = 600
+# Skor için yapılan yeni yapılandırılmış çağrının tweet metni, aynı süreçteki ilk
+# tweet oluşturmada kullanılmak üzere bu kadar makale için bellekte tutulur
+STRUCTURED_TWEET_DRAFT_MAX_ENTRIES = 100
+_structured_tweet_drafts = {}
+_structured_tweet_drafts_lock = threading.Lock()
+
+# Gemini model nesneleri için model adı bazlı kayıt (yapılandırılmış anahtar için)
+_gemini_models = {}
+_gemini_lock = threading.Lock()
+_gemini_configured_key = None
+_ai_settings_cache = {"mtime": None, "settings": None}
+
+# Aynı anda Gemini'ye gidebilecek en fazla istek sayısı (ai_analysis.max_concurrency)
+GEMINI_MAX_CONCURRENCY = 3
+# 429 alındığında Gemini bütçesinin kilitli kalacağı süre (saniye)
+GEMINI_RATE_LIMIT_BACKOFF = 30
+_gemini_semaphore = None
+_gemini_semaphore_size = None
+
+# Ortak HTTP istemcisi ayarları
+HTTP_DEFAULT_TIMEOUT = 10
+HTTP_USER_AGENT = "Mozilla/5.0"
+HTTP_RETRY_TOTAL = 3
+HTTP_RETRY_BACKOFF = 0.5
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+HTTP_DEFAULT_POOL_SIZE = 10
+# Host bazlı bağlantı havuzu boyutları
+HTTP_HOST_POOL_SIZES = {
+    "https://techcrunch.com/": 8,
+    "https://api.telegram.org/": 2,
+}
+
+_http_session = None
+_http_post_session = None
+_http_session_lock = threading.Lock()
+
+def _build_http_adapter(pool_size, retry=True):
+    """Keep-alive havuzlu HTTP adapter oluştur
+    
+    retry=True ise sadece idempotent GET/HEAD istekleri 429/5xx ve okuma hatalarında
+    backoff ile tekrar denenir. retry=False adapter hiçbir isteği tekrarlamaz; POST
+    gibi idempotent olmayan çağrılar (Telegram sendMessage vb.) için kullanılır.
+    """
+    if not retry:
+        return HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                           max_retries=Retry(total=0, read=False, raise_on_status=False))
+    retry_policy = Retry(
+        total=HTTP_RETRY_TOTAL,
+        backoff_factor=HTTP_RETRY_BACKOFF,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    return HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry_policy)
+
+def _build_http_session(retry=True):
+    session = requests.Session()
+    session.headers.update({"User-Agent": HTTP_USER_AGENT})
+    session.mount("https://", _build_http_adapter(HTTP_DEFAULT_POOL_SIZE, retry))
+    session.mount("http://", _build_http_adapter(HTTP_DEFAULT_POOL_SIZE, retry))
+    # Daha uzun prefix'ler önceliklidir - host bazlı havuzlar
+    for prefix, pool_size in HTTP_HOST_POOL_SIZES.items():
+        session.mount(prefix, _build_http_adapter(pool_size, retry))
+    return session
+
+def get_http_session():
+    """Tüm dış GET istekleri için paylaşılan, bağlantı havuzlu requests.Session döndür"""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                _http_session = _build_http_session(retry=True)
+    return _http_session
+
+def get_http_post_session():
+    """POST istekleri için tekrar denemesiz, bağlantı havuzlu requests.Session döndür
+    
+    Sunucu isteği kabul ettikten sonra kaybolan bir yanıt otomatik tekrarla
+    çift bildirime dönüşmesin diye POST'lar ayrı, retry'siz oturumdan gider.
+    """
+    global _http_post_session
+    if _http_post_session is None:
+        with _http_session_lock:
+            if _http_post_session is None:
+                _http_post_session = _build_http_session(retry=False)
+    return _http_post_session
+
+def http_get(url, **kwargs):
+    """Ortak oturum üzerinden GET isteği (varsayılan timeout ile)"""
+    kwargs.setdefault("timeout", HTTP_DEFAULT_TIMEOUT)
+    return get_http_session().get(url, **kwargs)
+
+def http_post(url, **kwargs):
+    """Retry'siz ortak oturum üzerinden POST isteği (varsayılan timeout ile)"""
+    kwargs.setdefault("timeout", HTTP_DEFAULT_TIMEOUT)
+    return get_http_post_session().post(url, **kwargs)
+
+# Dış API'ler için token bucket varsayılanları (automation_settings.json > rate_limits ile ezilebilir)
+# rate_per_minute: dakikadaki istek bütçesi, burst: art arda yapılabilecek en fazla istek,
+# max_wait: bütçe için beklenebilecek en uzun süre (saniye)
+DEFAULT_RATE_LIMITS = {
+    "gemini": {"rate_per_minute": 15, "burst": 3, "max_wait": 120},
+    "twitter": {"rate_per_minute": 30, "burst": 1, "max_wait": 60},
+    "telegram": {"rate_per_minute": 20, "burst": 3, "max_wait": 30},
+}
+
+class TokenBucket:
+    """Thread-safe token bucket - çağıran sadece ihtiyaç duyduğu bütçe kadar bekler
+    
+    429 yanıtları veya kalan limit başlıkları ile bucket belirli bir zamana kadar
+    kilitlenebilir. Bekleme süreleri metrik olarak tutulur.
+    """
+    
+    def __init__(self, name, rate_per_minute, burst, max_wait=None):
+        self.name = name
+        self._lock = threading.Lock()
+        self.configure(rate_per_minute, burst, max_wait)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self.stats = self._empty_stats()
+    
+    @staticmethod
+    def _empty_stats():
+        return {"acquired": 0, "rejected": 0, "throttled": 0,
+                "total_wait_seconds": 0.0, "max_wait_seconds": 0.0}
+    
+    def snapshot_stats(self, reset=False):
+        """Metriklerin kopyası; reset=True ise aynı anda sıfırlanır"""
+        with self._lock:
+            stats = dict(self.stats)
+            if reset:
+                self.stats = self._empty_stats()
+        return stats
+    
+    def configure(self, rate_per_minute, burst, max_wait=None):
+        """Bütçeyi güncelle (mevcut token'lar korunur)"""
+        with self._lock:
+            self.rate = max(float(rate_per_minute), 0.001) / 60.0
+            self.capacity = max(1, int(burst))
+            self.max_wait = max_wait
+            if hasattr(self, "_tokens"):
+                self._tokens = min(self._tokens, float(self.capacity))
+    
+    def _refill(self, now):
+        self._tokens = min(float(self.capacity), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def acquire(self, tokens=1, max_wait=None):
+        """Bütçe ayır ve gerekiyorsa tam gereken süre kadar bekle
+        
+        Beklenen süreyi (saniye) döndürür. Gereken bekleme max_wait'i aşıyorsa
+        bütçe ayrılmaz ve None döner.
+        """
+        if max_wait is None:
+            max_wait = self.max_wait
+        
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(0.0, self._blocked_until - now)
+            # Kilit bittiğinde birikecek token'ları da hesaba kat
+            available = min(float(self.capacity), self._tokens + wait * self.rate)
+            if available < tokens:
+                wait += (tokens - available) / self.rate
+            
+            if max_wait is not None and wait > max_wait:
+                self.stats["rejected"] += 1
+                return None
+            
+            # Token'ları şimdiden ayır (negatife düşebilir) - sıradaki çağıranlar adil bekler
+            self._tokens -= tokens
+            self.stats["acquired"] += 1
+            self.stats["total_wait_seconds"] += wait
+            self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"], wait)
+        
+        if wait > 0:
+            print(f"[RATE LIMIT] {self.name}: {wait:.1f} saniye bekleniyor")
+            time.sleep(wait)
+        return wait
+    
+    def block_for(self, seconds):
+        """429 vb. durumlarda bucket'ı belirtilen süre boyunca kilitle"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            self._blocked_until = max(self._blocked_until, now + max(0.0, float(seconds)))
+            self.stats["throttled"] += 1
+        print(f"[RATE LIMIT] {self.name}: {float(seconds):.1f} saniye kısıtlandı")
+    
+    def update_from_headers(self, remaining, reset_epoch=None, retry_after=None):
+        """x-rate-limit-remaining / reset veya Retry-After bilgisine göre uyum sağla"""
+        try:
+            if retry_after is not None:
+                self.block_for(float(retry_after))
+                return
+            if remaining is not None and int(remaining) <= 0 and reset_epoch:
+                self.block_for(float(reset_epoch) - time.time())
+            elif remaining is not None:
+                with self._lock:
+                    self._tokens = min(self._tokens, float(int(remaining)))
+        except (TypeError, ValueError):
+            pass
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+def load_rate_limit_settings(settings=None):
+    """Her API için token bucket ayarlarını döndür
+    
+    Twitter için ayrı ayar yoksa bütçe eski rate_limit_delay değerinden türetilir.
+    """
+    if settings is None:
+        settings = load_automation_settings()
+    overrides = settings.get("rate_limits", {}) if isinstance(settings.get("rate_limits"), dict) else {}
+    
+    limits = {}
+    for name, defaults in DEFAULT_RATE_LIMITS.items():
+        limits[name] = dict(defaults)
+        if name == "twitter":
+            try:
+                delay = float(settings.get("rate_limit_delay", 2))
+                if delay > 0:
+                    limits[name]["rate_per_minute"] = 60.0 / delay
+            except (TypeError, ValueError):
+                pass
+        if isinstance(overrides.get(name), dict):
+            limits[name].update(overrides[name])
+    return limits
+
+def get_rate_limiter(name):
+    """Adı verilen API için paylaşılan token bucket'ı döndür"""
+    limiter = _rate_limiters.get(name)
+    if limiter is not None:
+        return limiter
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(name)
+        if limiter is None:
+            try:
+                config = load_rate_limit_settings().get(name, DEFAULT_RATE_LIMITS.get(name, {}))
+            except Exception:
+                config = DEFAULT_RATE_LIMITS.get(name, {})
+            limiter = TokenBucket(
+                name,
+                config.get("rate_per_minute", 60),
+                config.get("burst", 1),
+                config.get("max_wait")
+            )
+            _rate_limiters[name] = limiter
+        return limiter
+
+def apply_rate_limit_settings(settings=None):
+    """Ayarlar değiştiğinde mevcut bucket'ları güncelle"""
+    limits = load_rate_limit_settings(settings)
+    for name, config in limits.items():
+        get_rate_limiter(name).configure(
+            config.get("rate_per_minute", 60),
+            config.get("burst", 1),
+            config.get("max_wait")
+        )
+
+def get_rate_limiter_stats(reset=False):
+    """Tüm rate limiter'ların kuyruk bekleme metriklerini döndür
+    
+    reset=True ise metrikler okunduktan sonra sıfırlanır (tur bazlı raporlama için).
+    """
+    return {name: limiter.snapshot_stats(reset) for name, limiter in list(_rate_limiters.items())}
+
+# Paralel makale çekme varsayılanları (mcp_config.json > content_extraction ile ezilebilir)
+DEFAULT_FETCH_MAX_WORKERS = 4
+DEFAULT_FETCH_PER_HOST_LIMIT = 2
+# İçerik çıkarma varsayılanları: yeterli paragraf metni toplanınca ya da bayt tavanına
+# ulaşılınca makale sayfasının indirilmesi kesilir
+DEFAULT_MAX_CONTENT_LENGTH = 2500
+DEFAULT_MIN_CONTENT_LENGTH = 100
+DEFAULT_MAX_DOWNLOAD_BYTES = 1024 * 1024
+ARTICLE_STREAM_CHUNK_SIZE = 16384
+
+# Host bazlı eşzamanlılık sınırlayıcıları
+_host_semaphores = {}
+_host_semaphores_lock = threading.Lock()
 
-def fetch_latest_ai_articles_with_firecrawl():
-    """Firecrawl MCP ile gelişmiş haber çekme - Sadece son 4 makale"""
+def get_fetch_concurrency_settings():
+    """Paralel çekme ayarlarını (worker sayısı, host başına limit) döndür"""
     try:
-        # Önce mevcut yayınlanan makaleleri yükle
-        posted_articles = load_json(HISTORY_FILE)
-        posted_urls = [article.get('url', '') for article in posted_articles]
-        posted_hashes = [article.get('hash', '') for article in posted_articles]
-        
-        print("🔍 TechCrunch AI kategorisinden Firecrawl MCP ile makale çekiliyor...")
+        extraction = load_mcp_config().get("content_extraction", {})
+    except Exception:
+        extraction = {}
+    
+    max_workers = extraction.get("max_workers", DEFAULT_FETCH_MAX_WORKERS)
+    per_host_limit = extraction.get("per_host_limit", DEFAULT_FETCH_PER_HOST_LIMIT)
+    
+    try:
+        max_workers = max(1, int(max_workers))
+    except (TypeError, ValueError):
+        max_workers = DEFAULT_FETCH_MAX_WORKERS
+    try:
+        per_host_limit = max(1, int(per_host_limit))
+    except (TypeError, ValueError):
+        per_host_limit = DEFAULT_FETCH_PER_HOST_LIMIT
+    
+    return {"max_workers": max_workers, "per_host_limit": per_host_limit}
+
+def get_content_extraction_settings():
+    """İçerik uzunluğu sınırları ve akışlı indirme ayarlarını döndür"""
+    try:
+        extraction = load_mcp_config().get("content_extraction", {})
+    except Exception:
+        extraction = {}
+    
+    settings = {}
+    for key, default, minimum in (
+        ("max_content_length", DEFAULT_MAX_CONTENT_LENGTH, 1),
+        ("min_content_length", DEFAULT_MIN_CONTENT_LENGTH, 0),
+        ("max_download_bytes", DEFAULT_MAX_DOWNLOAD_BYTES, ARTICLE_STREAM_CHUNK_SIZE),
+    ):
+        try:
+            settings[key] = max(minimum, int(extraction.get(key, default)))
+        except (TypeError, ValueError):
+            settings[key] = default
+    settings["streaming"] = bool(extraction.get("streaming", True))
+    return settings
+
+def _get_host_semaphore(url, per_host_limit):
+    """URL'nin host'u için paylaşılan semaphore'u döndür"""
+    host = urlparse(url).netloc.lower()
+    key = (host, per_host_limit)
+    with _host_semaphores_lock:
+        semaphore = _host_semaphores.get(key)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(per_host_limit)
+            _host_semaphores[key] = semaphore
+        return semaphore
+
+def fetch_urls_concurrently(urls, fetch_func, max_workers=None, per_host_limit=None):
+    """URL listesini sınırlı eşzamanlılık ile paralel işle - sonuç sırası giriş sırasıyla aynı
+    
+    Her URL için fetch_func(url) çağrılır. Hata veren URL'ler için sonuç None olur.
+    """
+    urls = list(urls)
+    if not urls:
+        return []
+    
+    settings = get_fetch_concurrency_settings()
+    if max_workers is None:
+        max_workers = settings["max_workers"]
+    if per_host_limit is None:
+        per_host_limit = settings["per_host_limit"]
+    
+    def _run(url):
+        try:
+            with _get_host_semaphore(url, per_host_limit):
+                return fetch_func(url)
+        except Exception as e:
+            print(f"❌ Paralel çekme hatası ({url}): {e}")
+            return None
+    
+    # Tek URL veya tek worker için thread havuzu açmaya gerek yok
+    if len(urls) == 1 or max_workers == 1:
+        return [_run(url) for url in urls]
+    
+    workers = min(max_workers, len(urls))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="article-fetch") as executor:
+        # executor.map giriş sırasını korur
+        return list(executor.map(_run, urls))
+
+class PersistentCache:
+    """JSON dosyasında saklanan, TTL ve LRU boyut sınırlı thread-safe önbellek
+    
+    Dosya birden çok süreçle (zamanlayıcı, Streamlit) paylaşılır: yeni kayıtlar
+    bellekte birikir ve en fazla PERSISTENT_CACHE_FLUSH_INTERVAL saniyede bir,
+    dosya kilidi altında diskteki güncel içerikle birleştirilerek yazılır. Başka
+    sürecin yazdığı kayıtlar dosya sürümü değişince yeniden okunur.
+    """
+    
+    def __init__(self, path, ttl_seconds, max_entries):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = None
+        self._version = None
+        self._dirty = {}
+        self._deleted = set()
+        self._last_flush = 0
+        self._lock = threading.Lock()
+        _persistent_caches.append(self)
+    
+    def _fresh(self, data, now):
+        if not isinstance(data, dict):
+            return {}
+        return {
+            key: entry for key, entry in data.items()
+            if isinstance(entry, dict) and now - entry.get("cached_at", 0) < self.ttl_seconds
+        }
+    
+    def _load(self):
+        """Önbelleği diskten yükle (ilk kullanımda ve dosya başka süreçte değiştiyse)
+        
+        Henüz yazılmamış yerel kayıtlar yeniden okunan içeriğin üzerine uygulanır.
+        """
+        version = get_file_version(self.path)
+        if self._entries is not None and version == self._version:
+            return
+        try:
+            data = load_json(self.path)
+        except Exception as e:
+            print(f"[CACHE] {self.path} okunamadı, boş önbellek ile devam: {e}")
+            data = {}
+        self._entries = self._fresh(data, datetime.now().timestamp())
+        self._entries.update(self._dirty)
+        for key in self._deleted:
+            self._entries.pop(key, None)
+        self._version = version
+    
+    def _evict(self, entries):
+        """Boyut sınırı aşıldıysa en uzun süredir kullanılmayanları çıkar"""
+        overflow = len(entries) - self.max_entries
+        if overflow <= 0:
+            return
+        oldest = sorted(entries, key=lambda k: entries[k].get("last_access", 0))
+        for key in oldest[:overflow]:
+            del entries[key]
+    
+    def _flush(self, force=False):
+        """Bekleyen kayıtları diskteki içerikle birleştirip yaz (self._lock altında çağrılır)"""
+        if not (self._dirty or self._deleted):
+            return
+        now = datetime.now().timestamp()
+        if not force and now - self._last_flush < PERSISTENT_CACHE_FLUSH_INTERVAL:
+            return
+        
+        def _merge(data):
+            merged = self._fresh(data, now)
+            # Diğer süreçlerin kayıtları korunur; erişim zamanlarının en yenisi alınır
+            for key, entry in self._entries.items():
+                if key in merged:
+                    merged[key]["last_access"] = max(merged[key].get("last_access", 0),
+                                                     entry.get("last_access", 0))
+            merged.update(self._dirty)
+            for key in self._deleted:
+                merged.pop(key, None)
+            self._evict(merged)
+            return merged
         
-        # Firecrawl MCP ile ana sayfa çek
         try:
-            # Firecrawl MCP scrape fonksiyonunu kullan
-            scrape_result = mcp_firecrawl_scrape({
-                "url": "https://techcrunch.com/category/artificial-intelligence/",
-                "formats": ["markdown", "links"],
-                "onlyMainContent": True,
-                "waitFor": 2000
-            })
-            
-            if not scrape_result.get("success", False):
-                print(f"⚠️ Firecrawl MCP hatası, fallback yönteme geçiliyor...")
-                return fetch_latest_ai_articles_fallback()
-            
-            # Markdown içeriğinden makale linklerini çıkar
-            markdown_content = scrape_result.get("markdown", "")
-            links = scrape_result.get("links", [])
-            
-            # TechCrunch makale linklerini filtrele
-            article_urls = []
-            for link in links:
-                url = link.get("url", "")
-                if ("techcrunch.com" in url and 
-                    "/2024/" in url and 
-                    url not in posted_urls and
-                    len(article_urls) < 4):  # Sadece son 4 makale
-                    article_urls.append(url)
-            
-            print(f"🔗 {len(article_urls)} makale URL'si bulundu")
+            with file_lock(self.path):
+                self._entries = update_json(self.path, _merge, default={})
+                self._version = get_file_version(self.path)
+            self._dirty = {}
+            self._deleted = set()
+        except Exception as e:
+            print(f"[CACHE] {self.path} kaydedilemedi: {e}")
+        self._last_flush = now
+    
+    def get(self, key):
+        """Geçerli kayıt varsa değerini, yoksa None döndür"""
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            now = datetime.now().timestamp()
+            if now - entry.get("cached_at", 0) >= self.ttl_seconds:
+                del self._entries[key]
+                return None
+            entry["last_access"] = now
+            return entry.get("value")
+    
+    def set(self, key, value):
+        """Değeri önbelleğe yaz; dosyaya bir sonraki toplu yazımda kaydedilir"""
+        self.set_many({key: value})
+    
+    def set_many(self, values):
+        """{anahtar: değer} kayıtlarını önbelleğe yaz"""
+        if not values:
+            return
+        with self._lock:
+            self._load()
+            now = datetime.now().timestamp()
+            for key, value in values.items():
+                entry = {"value": value, "cached_at": now, "last_access": now}
+                self._entries[key] = entry
+                self._dirty[key] = entry
+                self._deleted.discard(key)
+            self._evict(self._entries)
+            self._flush()
+    
+    def delete(self, key):
+        """Kaydı önbellekten çıkar"""
+        with self._lock:
+            self._load()
+            if self._entries.pop(key, None) is None:
+                return
+            self._dirty.pop(key, None)
+            self._deleted.add(key)
+            self._flush()
+    
+    def flush(self):
+        """Bekleyen kayıtları hemen diske yaz"""
+        with self._lock:
+            if self._entries is not None:
+                self._flush(force=True)
+    
+    def clear(self):
+        """Önbelleği tamamen temizle"""
+        with self._lock:
+            self._entries = {}
+            self._dirty = {}
+            self._deleted = set()
+            save_json(self.path, self._entries)
+            self._version = get_file_version(self.path)
+
+_persistent_caches = []
+
+def flush_persistent_caches():
+    """Tüm önbelleklerin bekleyen kayıtlarını diske yaz (tur sonunda ve çıkışta)"""
+    for cache in _persistent_caches:
+        cache.flush()
+
+atexit.register(flush_persistent_caches)
+
+def absolute_url(url, base_url=None):
+    """Linkin mutlak hali (fragment atılır) - çekme ve paylaşımda kullanılan adres"""
+    if not url:
+        return ""
+    url = url.strip()
+    if base_url:
+        url = urljoin(base_url, url)
+    return urldefrag(url)[0]
+
+def _canonical_host(url):
+    host = (urlparse(url).hostname or "").lower()
+    for prefix in CANONICAL_HOST_PREFIXES:
+        if host.startswith(prefix):
+            return host[len(prefix):]
+    return host
+
+_source_query_params_cache = {"mtime": None, "rules": None}
+
+def get_source_query_params():
+    """Host bazlı tutulacak sorgu parametreleri ({host: (parametreler)}) - news_sources.json'dan
+    
+    Sadece canonical_query_params tanımlayan kaynakların host'ları yer alır; dosya
+    değişmedikçe önbellekten döner.
+    """
+    try:
+        mtime = os.path.getmtime(NEWS_SOURCES_FILE) if os.path.exists(NEWS_SOURCES_FILE) else None
+    except OSError:
+        mtime = None
+    if _source_query_params_cache["rules"] is not None and _source_query_params_cache["mtime"] == mtime:
+        return _source_query_params_cache["rules"]
+    
+    rules = {}
+    for source in load_news_sources():
+        params = source.get("canonical_query_params")
+        if not isinstance(params, list):
+            continue
+        for url in (source["url"], source.get("feed_url")):
+            if url:
+                rules[_canonical_host(url)] = tuple(sorted(str(param).lower() for param in params))
+    _source_query_params_cache.update(mtime=mtime, rules=rules)
+    return rules
+
+def url_normalizer_signature():
+    """İndeksteki normalize URL anahtarlarının geçerli olduğu mantık sürümü"""
+    rules = get_source_query_params()
+    digest = hashlib.md5(json.dumps(sorted(rules.items())).encode("utf-8")).hexdigest()[:8] if rules else "-"
+    return f"{URL_NORMALIZER_VERSION}:{digest}"
+
+def _keep_query_param(key, allowlist):
+    key = key.lower()
+    if allowlist is not None:
+        return key in allowlist
+    return key not in CANONICAL_TRACKING_PARAMS and not key.startswith(CANONICAL_TRACKING_PARAM_PREFIXES)
+
+def canonicalize_url(url, base_url=None):
+    """Tekrar kontrolü için kanonik URL - çekilmez, saklanmaz ve paylaşılmaz
+    
+    https, küçük harf host (www/amp/m öneki ve varsayılan port atılır), AMP yol
+    parçası ve fragment atılır, sondaki / kaldırılır. Sorgu parametrelerinden
+    izleme parametreleri atılır (host'un kaynağı canonical_query_params
+    tanımlıysa sadece onlar tutulur), kalanlar sıralanır.
+    """
+    if not url:
+        return ""
+    url = url.strip()
+    if base_url:
+        url = urljoin(base_url, url)
+    parsed = urlparse(url)
+    if not parsed.hostname:
+        return url
+    host = _canonical_host(url)
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+    
+    segments = [segment for segment in parsed.path.split("/") if segment]
+    if segments and segments[-1].lower() == "amp":
+        segments.pop()
+    if segments and segments[0].lower() == "amp":
+        segments.pop(0)
+    path = "/" + "/".join(segments)
+    
+    allowlist = get_source_query_params().get(_canonical_host(url))
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if _keep_query_param(key, allowlist)
+    ))
+    return urlunparse(("https", host, path, "", query, ""))
+
+def normalize_url(url):
+    """Tekrar kontrolü anahtarı: şemasız kanonik URL"""
+    return canonicalize_url(url).split("://", 1)[-1]
+
+def extract_canonical_url(soup, page_url):
+    """<link rel="canonical"> (yoksa og:url) hedefinin mutlak adresi"""
+    for link in soup.find_all("link", href=True):
+        rel = link.get("rel") or []
+        if isinstance(rel, str):
+            rel = rel.split()
+        if "canonical" in [value.lower() for value in rel]:
+            return absolute_url(link["href"], base_url=page_url)
+    og_url = soup.find("meta", attrs={"property": "og:url"})
+    if og_url and og_url.get("content"):
+        return absolute_url(og_url["content"], base_url=page_url)
+    return absolute_url(page_url)
+
+def _simhash_tokens(text):
+    return [token for token in re.findall(r"\w+", (text or "").lower()) if len(token) > 1]
+
+def compute_simhash(title, content=""):
+    """Başlık kelimeleri, içerik kelimeleri ve kelime ikililerinden 64 bit SimHash imzası"""
+    weights = {}
+    for token in _simhash_tokens(title):
+        weights[token] = weights.get(token, 0) + 2
+    content_tokens = _simhash_tokens(content[:SIMHASH_CONTENT_CHARS])
+    for token in content_tokens:
+        weights[token] = weights.get(token, 0) + 1
+    for first, second in zip(content_tokens, content_tokens[1:]):
+        feature = f"{first} {second}"
+        weights[feature] = weights.get(feature, 0) + 1
+    if not weights:
+        return 0
+    
+    vector = [0] * SIMHASH_BITS
+    for feature, weight in weights.items():
+        feature_hash = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            if feature_hash >> bit & 1:
+                vector[bit] += weight
+            else:
+                vector[bit] -= weight
+    return sum(1 << bit for bit in range(SIMHASH_BITS) if vector[bit] > 0)
+
+def _simhash_band_keys(value, band_count):
+    """İmzayı band_count parçaya böl - (bant no, bant değeri) anahtarları"""
+    band_bits = SIMHASH_BITS // band_count
+    keys = []
+    for band in range(band_count):
+        start = band * band_bits
+        width = SIMHASH_BITS - start if band == band_count - 1 else band_bits
+        keys.append((band, (value >> start) & ((1 << width) - 1)))
+    return keys
+
+class PostedArticleIndex:
+    """Paylaşılmış makaleler için SQLite tabanlı tekrar indeksi
+    
+    URL, normalize URL ve başlık hash'i üzerinde tekil indeksler tutulur;
+    sorgular bellekteki set'lerden O(1) cevaplanır. Paylaşım geçmişi dosyaları
+    değiştiğinde (mtime/boyut) eksik kayıtlar indekse aktarılır.
+    
+    Son senkronize edilen kaynak imzası süreç belleğinde tutulur (veritabanı
+    zamanlayıcı ve Streamlit tarafından paylaşılır). Başka bir süreç indekse
+    yazınca PRAGMA data_version değişir ve set'ler yeniden yüklenir.
+    """
+    
+    def __init__(self, db_path, source_paths, loader):
+        self.db_path = db_path
+        self.source_paths = source_paths
+        self.loader = loader
+        self._lock = threading.RLock()
+        self._conn = None
+        self._urls = None
+        self._normalized_urls = None
+        self._hashes = None
+        self._simhashes = None
+        self._simhash_bands = {}
+        self._data_version = None
+        self._synced_signature = None
+    
+    def _connection(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("""CREATE TABLE IF NOT EXISTS posted_index (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL DEFAULT '',
+                normalized_url TEXT NOT NULL DEFAULT '',
+                title_hash TEXT NOT NULL DEFAULT '',
+                posted_date TEXT NOT NULL DEFAULT ''
+            )""")
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_posted_url ON posted_index(url) WHERE url != ''")
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_posted_normalized_url ON posted_index(normalized_url) WHERE normalized_url != ''")
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_posted_title_hash ON posted_index(title_hash) WHERE title_hash != ''")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_posted_index_date ON posted_index(posted_date)")
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(posted_index)")}
+            if "simhash" not in columns:
+                conn.execute("ALTER TABLE posted_index ADD COLUMN simhash TEXT NOT NULL DEFAULT ''")
+            conn.execute("CREATE TABLE IF NOT EXISTS index_meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._renormalize_urls(conn)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+    
+    def _renormalize_urls(self, conn):
+        """URL normalizasyonu değiştiyse kayıtlı anahtarları yeniden hesapla"""
+        signature = url_normalizer_signature()
+        row = conn.execute("SELECT value FROM index_meta WHERE key = 'url_normalizer'").fetchone()
+        if row and row[0] == signature:
+            return
+        rows = conn.execute("SELECT id, url FROM posted_index WHERE url != ''").fetchall()
+        # Yeni anahtarda çakışan eski kayıtlar için ilk kayıt yeterli
+        conn.executemany(
+            "UPDATE OR IGNORE posted_index SET normalized_url = ? WHERE id = ?",
+            [(normalize_url(url), row_id) for row_id, url in rows]
+        )
+        conn.execute("INSERT OR REPLACE INTO index_meta (key, value) VALUES ('url_normalizer', ?)",
+                     (signature,))
+        if rows:
+            print(f"[INDEX] {len(rows)} URL anahtarı yeniden normalize edildi")
+    
+    def _source_signature(self):
+        storage = get_storage()
+        return "|".join(storage.version(path) or "-" for path in self.source_paths)
+    
+    def _insert(self, conn, url, title_hash, posted_date, simhash=""):
+        """Kaydı indekse ekle - URL/hash zaten kayıtlıysa (satır eklenmediyse) False"""
+        normalized = normalize_url(url)
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO posted_index (url, normalized_url, title_hash, posted_date, simhash) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (url or "", normalized, title_hash or "", posted_date or "", simhash or "")
+        )
+        if not cursor.rowcount:
+            return False
+        if url:
+            self._urls.add(url)
+        if normalized:
+            self._normalized_urls.add(normalized)
+        if title_hash:
+            self._hashes.add(title_hash)
+        if simhash:
+            self._add_simhash(simhash)
+        return True
+    
+    def _add_simhash(self, simhash):
+        try:
+            value = int(simhash, 16)
+        except (TypeError, ValueError):
+            return
+        self._simhashes.append(value)
+        for band_count, bands in self._simhash_bands.items():
+            for key in _simhash_band_keys(value, band_count):
+                bands.setdefault(key, []).append(value)
+    
+    def _ensure_loaded(self, sync_source=True):
+        """Set'leri ilk kullanımda ya da başka süreç indeksi değiştirdiyse doldur,
+        kaynak dosya değiştiyse senkronize et"""
+        conn = self._connection()
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._urls is None or data_version != self._data_version:
+            self._urls, self._normalized_urls, self._hashes = set(), set(), set()
+            self._simhashes, self._simhash_bands = [], {}
+            for url, normalized, title_hash, simhash in conn.execute(
+                    "SELECT url, normalized_url, title_hash, simhash FROM posted_index"):
+                if url:
+                    self._urls.add(url)
+                if normalized:
+                    self._normalized_urls.add(normalized)
+                if title_hash:
+                    self._hashes.add(title_hash)
+                if simhash:
+                    self._add_simhash(simhash)
+            self._data_version = data_version
+        
+        if not sync_source:
+            return
+        
+        signature = self._source_signature()
+        if signature and signature != self._synced_signature:
+            for article in self.loader():
+                self._insert(conn, article.get("url", ""), article.get("hash", ""),
+                             article.get("posted_date", ""), article.get("simhash", ""))
+                self._insert_alias(conn, article.get("url", ""), article.get("canonical_url", ""),
+                                   article.get("posted_date", ""))
+            conn.commit()
+            self._synced_signature = signature
+    
+    def contains(self, url="", title_hash=""):
+        """URL, normalize URL veya başlık hash'i daha önce paylaşılmış mı"""
+        with self._lock:
+            self._ensure_loaded()
+            if url and (url in self._urls or normalize_url(url) in self._normalized_urls):
+                return True
+            return bool(title_hash) and title_hash in self._hashes
+    
+    def sync(self):
+        """Kaynak JSON'daki yeni kayıtları indekse aktar"""
+        with self._lock:
+            self._ensure_loaded()
+    
+    def _insert_alias(self, conn, url, canonical_url, posted_date):
+        """Paylaşılan adresten farklıysa sayfanın kanonik adresini de (hash'siz) indeksle"""
+        if canonical_url and normalize_url(canonical_url) != normalize_url(url):
+            self._insert(conn, canonical_url, "", posted_date)
+    
+    def add(self, url, title_hash, posted_date="", simhash="", canonical_url=""):
+        """Yeni paylaşımı (ve farklıysa kanonik adresini) indekse ekle
+        
+        URL ya da başlık hash'i zaten indeksteyse hiçbir şey eklenmez ve False döner.
+        """
+        with self._lock:
+            self._ensure_loaded(sync_source=False)
+            conn = self._connection()
+            inserted = self._insert(conn, url, title_hash, posted_date, simhash)
+            if inserted:
+                self._insert_alias(conn, url, canonical_url, posted_date)
+            conn.commit()
+            return inserted
+    
+    def find_similar(self, simhash, max_distance):
+        """En fazla max_distance bit farklı SimHash varsa mesafesini, yoksa None döndür
+        
+        İmza max_distance + 1 banda bölünür; güvercin yuvası ilkesiyle benzer her
+        imza en az bir bantta birebir eşleşir, sadece o bantların adayları karşılaştırılır.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            band_count = max_distance + 1
+            bands = self._simhash_bands.get(band_count)
+            if bands is None:
+                bands = {}
+                for value in self._simhashes:
+                    for key in _simhash_band_keys(value, band_count):
+                        bands.setdefault(key, []).append(value)
+                self._simhash_bands[band_count] = bands
             
-        except Exception as firecrawl_error:
-            print(f"⚠️ Firecrawl MCP hatası: {firecrawl_error}")
-            print("🔄 Fallback yönteme geçiliyor...")
-            return fetch_latest_ai_articles_fallback()
-        
-        articles_data = []
-        for url in article_urls:
-            try:
-                # Her makaleyi Firecrawl MCP ile çek
-                article_content = fetch_article_content_with_firecrawl(url)
-                
-                if article_content and len(article_content.get("content", "")) > 100:
-                    title = article_content.get("title", "")
-                    content = article_content.get("content", "")
-                    
-                    # Makale hash'i oluştur
-                    article_hash = hashlib.md5(title.encode()).hexdigest()
-                    
-                    # Tekrar kontrolü
-                    if article_hash not in posted_hashes:
-                        articles_data.append({
-                            "title": title,
-                            "url": url,
-                            "content": content,
-                            "hash": article_hash,
-                            "fetch_date": datetime.now().isoformat(),
-                            "is_new": True,
-                            "already_posted": False,
-                            "source": "firecrawl_mcp"
-                        })
-                        print(f"🆕 Firecrawl ile yeni makale: {title[:50]}...")
-                    else:
-                        print(f"✅ Makale zaten paylaşılmış: {title[:50]}...")
-                else:
-                    print(f"⚠️ İçerik yetersiz: {url}")
-                    
-            except Exception as article_error:
-                print(f"❌ Makale çekme hatası ({url}): {article_error}")
+            best = None
+            for key in _simhash_band_keys(simhash, band_count):
+                for candidate in bands.get(key, ()):
+                    distance = bin(candidate ^ simhash).count("1")
+                    if distance <= max_distance and (best is None or distance < best):
+                        best = distance
+            return best
+    
+    def expire_before(self, cutoff_iso):
+        """cutoff'tan eski paylaşımları indeksten çıkar - çıkarılan kayıt sayısını döndür"""
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute(
+                "DELETE FROM posted_index WHERE posted_date != '' AND posted_date < ?", (cutoff_iso,))
+            conn.commit()
+            if cursor.rowcount:
+                # Set'ler bir sonraki sorguda veritabanından yeniden kurulur
+                self._urls = None
+            return cursor.rowcount
+    
+    def mark_source_synced(self):
+        """Kaynak JSON bu süreç tarafından yazıldı - bu süreçte tekrar senkronizasyona gerek yok"""
+        with self._lock:
+            self._synced_signature = self._source_signature()
+    
+    def clear(self):
+        """İndeksi tamamen sıfırla"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM posted_index")
+            conn.commit()
+            self._urls, self._normalized_urls, self._hashes = set(), set(), set()
+            self._simhashes, self._simhash_bands = [], {}
+            self._synced_signature = None
+
+_posted_journal_lock = threading.RLock()
+_posted_compaction_running = threading.Event()
+
+def _read_posted_journal():
+    """Günlükteki kayıtları oku - yarım yazılmış son satır atlanır"""
+    records = []
+    if not os.path.exists(POSTED_JOURNAL_FILE):
+        return records
+    with open(POSTED_JOURNAL_FILE, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
                 continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                print(f"[JOURNAL] Bozuk günlük satırı atlandı: {line[:60]}")
+    return records
+
+def _posted_record_key(record):
+    return (record.get("hash", ""), record.get("url", ""), record.get("posted_date", ""))
+
+def load_posted_articles():
+    """Paylaşım geçmişi (SQLite tablosu ya da JSON anlık görüntü + günlük)"""
+    storage = get_storage()
+    if storage.has_table(HISTORY_FILE):
+        return storage.load(HISTORY_FILE)
+    return _load_posted_articles_from_files()
+
+def _load_posted_articles_from_files():
+    """posted_articles.json anlık görüntüsü + append-only günlük"""
+    with _posted_journal_lock:
+        snapshot = JsonFileStorage().load(HISTORY_FILE)
+        journal = _read_posted_journal()
+    
+    if not journal:
+        return snapshot
+    
+    # Sıkıştırma yarıda kaldıysa aynı kayıt iki yerde olabilir
+    seen = {_posted_record_key(record) for record in snapshot}
+    merged = list(snapshot)
+    for record in journal:
+        key = _posted_record_key(record)
+        if key not in seen:
+            seen.add(key)
+            merged.append(record)
+    return merged
+
+def append_posted_article(record):
+    """Paylaşım kaydını günlüğe tek satır olarak ekle (fsync'li, sabit maliyet)"""
+    storage = get_storage()
+    if storage.has_table(HISTORY_FILE):
+        storage.append(HISTORY_FILE, record)
+        return
+    
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _posted_journal_lock, file_lock(POSTED_JOURNAL_FILE):
+        with open(POSTED_JOURNAL_FILE, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+    
+    if _count_journal_lines() >= POSTED_JOURNAL_COMPACT_THRESHOLD:
+        compact_posted_journal_async()
+
+def _count_journal_lines():
+    try:
+        with open(POSTED_JOURNAL_FILE, "rb") as f:
+            return sum(1 for _ in f)
+    except OSError:
+        return 0
+
+def rewrite_posted_articles(articles):
+    """Tüm geçmişi anlık görüntüye yaz ve günlüğü boşalt"""
+    storage = get_storage()
+    if storage.has_table(HISTORY_FILE):
+        storage.save(HISTORY_FILE, articles)
+        return
+    
+    with _posted_journal_lock, file_lock(POSTED_JOURNAL_FILE):
+        save_json(HISTORY_FILE, articles)
+        if os.path.exists(POSTED_JOURNAL_FILE):
+            with open(POSTED_JOURNAL_FILE, "w", encoding="utf-8") as f:
+                f.flush()
+                os.fsync(f.fileno())
+
+def compact_posted_journal():
+    """Günlüğü posted_articles.json'a birleştir - birleştirilen kayıt sayısını döndür"""
+    if get_storage().has_table(HISTORY_FILE):
+        return 0
+    
+    # Önce günlükteki kayıtlar indekse alınır (kilit sırası: indeks -> günlük)
+    posted_index.sync()
+    
+    with _posted_journal_lock, file_lock(POSTED_JOURNAL_FILE):
+        journal = _read_posted_journal()
+        if not journal:
+            return 0
+        rewrite_posted_articles(load_posted_articles())
+    
+    posted_index.mark_source_synced()
+    print(f"[JOURNAL] {len(journal)} günlük kaydı birleştirildi")
+    return len(journal)
+
+def compact_posted_journal_async():
+    """Sıkıştırmayı arka plan thread'inde başlat (aynı anda tek sıkıştırma)"""
+    if _posted_compaction_running.is_set():
+        return
+    _posted_compaction_running.set()
+    
+    def _run():
+        try:
+            compact_posted_journal()
+        except Exception as e:
+            print(f"[JOURNAL] Sıkıştırma hatası: {e}")
+        finally:
+            _posted_compaction_running.clear()
+    
+    threading.Thread(target=_run, name="posted-journal-compaction", daemon=True).start()
+
+posted_index = PostedArticleIndex(POSTED_INDEX_DB, [HISTORY_FILE, POSTED_JOURNAL_FILE], load_posted_articles)
+
+def count_posted_articles():
+    """Toplam paylaşım sayısı"""
+    storage = get_storage()
+    if storage.has_table(HISTORY_FILE):
+        return storage.count(HISTORY_FILE)
+    return len(load_posted_articles())
+
+def get_recent_posted_articles(days=7):
+    """Son N günde paylaşılan makaleler (SQLite'ta posted_date indeksi üzerinden)"""
+    cutoff_date = datetime.now() - timedelta(days=days)
+    storage = get_storage()
+    if storage.has_table(HISTORY_FILE):
+        return storage.query_posted_since(cutoff_date.isoformat())
+    
+    recent_articles = []
+    for article in load_posted_articles():
+        try:
+            posted_date = datetime.fromisoformat(article.get("posted_date", ""))
+            if posted_date > cutoff_date:
+                recent_articles.append(article)
+        except:
+            continue
+    return recent_articles
+
+def is_article_posted(url="", title_hash=""):
+    """Makale daha önce paylaşılmış mı (indeks üzerinden)"""
+    return posted_index.contains(url=url, title_hash=title_hash)
+
+def get_near_duplicate_settings(settings=None):
+    """Benzer haber tespiti ayarları (açık/kapalı, en fazla farklı bit sayısı)"""
+    if settings is None:
+        settings = load_automation_settings()
+    try:
+        max_distance = int(settings.get("near_duplicate_max_distance", DEFAULT_NEAR_DUPLICATE_MAX_DISTANCE))
+    except (TypeError, ValueError):
+        max_distance = DEFAULT_NEAR_DUPLICATE_MAX_DISTANCE
+    return {
+        "enabled": bool(settings.get("near_duplicate_detection", True)),
+        "max_distance": min(max(max_distance, 0), NEAR_DUPLICATE_MAX_DISTANCE_LIMIT)
+    }
+
+def filter_near_duplicates(articles):
+    """Daha önce paylaşılanlara ya da aynı partideki başka habere benzeyenleri ele
+    
+    Gemini çağrılarından önce çalışır; her makaleye simhash alanı eklenir.
+    """
+    settings = get_near_duplicate_settings()
+    if not settings["enabled"]:
+        return articles
+    
+    max_distance = settings["max_distance"]
+    kept_articles = []
+    batch_simhashes = []
+    for article in articles:
+        simhash = compute_simhash(article.get("title", ""), article.get("content", ""))
+        article["simhash"] = f"{simhash:016x}"
+        if not simhash:
+            kept_articles.append(article)
+            continue
+        
+        distance = posted_index.find_similar(simhash, max_distance)
+        if distance is None:
+            distance = next((d for d in (bin(other ^ simhash).count("1") for other in batch_simhashes)
+                             if d <= max_distance), None)
+        if distance is not None:
+            print(f"♻️ Benzer haber zaten var (SimHash mesafesi {distance}), atlanıyor: {article.get('title', '')[:50]}...")
+            continue
+        
+        batch_simhashes.append(simhash)
+        kept_articles.append(article)
+    return kept_articles
+
+article_cache = PersistentCache(
+    ARTICLE_CACHE_FILE,
+    ttl_seconds=ARTICLE_CACHE_TTL_HOURS * 3600,
+    max_entries=ARTICLE_CACHE_MAX_ENTRIES
+)
+
+feed_seen_cache = PersistentCache(
+    FEED_SEEN_CACHE_FILE,
+    ttl_seconds=FEED_SEEN_TTL_HOURS * 3600,
+    max_entries=FEED_SEEN_MAX_ENTRIES
+)
+
+content_selector_cache = PersistentCache(
+    CONTENT_SELECTOR_CACHE_FILE,
+    ttl_seconds=CONTENT_SELECTOR_TTL_DAYS * 24 * 3600,
+    max_entries=CONTENT_SELECTOR_MAX_ENTRIES
+)
+
+llm_cache = PersistentCache(
+    LLM_CACHE_FILE,
+    ttl_seconds=LLM_CACHE_TTL_HOURS * 3600,
+    max_entries=LLM_CACHE_MAX_ENTRIES
+)
+
+def fetch_latest_ai_articles_with_firecrawl(skip_unchanged=False, poll_state=None):
+    """Firecrawl MCP ile gelişmiş haber çekme - kayıtlı tüm kaynaklardan
+    
+    HTML liste sayfaları ve makaleler Firecrawl ile çekilir; Firecrawl başarısız
+    olursa ilgili kaynak/makale için HTTP yöntemine düşülür.
+    """
+    try:
+        print("🔍 Haber kaynakları Firecrawl MCP ile taranıyor...")
+        candidates = discover_article_candidates(skip_unchanged, use_firecrawl=True, poll_state=poll_state)
+        print(f"🔗 {len(candidates)} yeni makale adayı bulundu")
         
+        articles_data = _fetch_candidate_articles(
+            candidates, fetch_article_content_with_firecrawl, "firecrawl_mcp",
+            batch_fetcher=fetch_article_contents_with_firecrawl)
         print(f"📊 Firecrawl MCP ile {len(articles_data)} yeni makale bulundu")
         return articles_data
         
     except Exception as e:
         print(f"Firecrawl MCP haber çekme hatası: {e}")
         print("🔄 Fallback yönteme geçiliyor...")
-        return fetch_latest_ai_articles_fallback()
+        if poll_state is not None:
+            poll_state.clear()
+        return fetch_latest_ai_articles_fallback(skip_unchanged, poll_state)
+
+def fetch_latest_ai_articles(skip_unchanged=False, poll_state=None):
+    """Ana haber çekme fonksiyonu - Firecrawl MCP öncelikli
+    
+    skip_unchanged=True ise liste sayfası değişmediğinde (304 veya aynı içerik)
+    hiçbir makale çekilmez ve boş liste döner (zamanlayıcı için). poll_state
+    (dict) verilirse kaynakların yeni doğrulayıcıları kaydedilmeden oraya
+    toplanır; çağıran makaleleri işledikten sonra commit_news_poll_state çağırır.
+    """
+    try:
+        # Firecrawl MCP öncelikli; başarısız kaynak/makaleler kendi içinde HTTP yöntemine düşer
+        if get_firecrawl_client() is None:
+            return fetch_latest_ai_articles_fallback(skip_unchanged, poll_state)
+        return fetch_latest_ai_articles_with_firecrawl(skip_unchanged, poll_state)
+        
+    except Exception as e:
+        print(f"Ana haber çekme hatası: {e}")
+        if poll_state is not None:
+            poll_state.clear()
+        return fetch_latest_ai_articles_fallback(skip_unchanged, poll_state)
+
+def fetch_listing_page(url, headers=None, conditional=False):
+    """Liste sayfasını çek - önceki çekimin ETag/Last-Modified ve içerik hash'i ile karşılaştır
+    
+    conditional=True ise If-None-Match/If-Modified-Since gönderilir. 304 veya
+    önceki çekimle aynı içerik gelirse "changed" False döner. Yeni doğrulayıcılar
+    burada kaydedilmez, "validators" alanında döner; çağıran adayları işledikten
+    sonra commit_news_poll_state ile kaydeder.
+    """
+    cache = load_json(LISTING_CACHE_FILE)
+    if not isinstance(cache, dict):
+        cache = {}
+    entry = cache.get(url, {})
+    
+    request_headers = dict(headers or {})
+    if conditional:
+        if entry.get("etag"):
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            request_headers["If-Modified-Since"] = entry["last_modified"]
+    
+    response = http_get(url, headers=request_headers)
+    
+    if response.status_code == 304:
+        return {"html": None, "changed": False, "status": 304, "validators": None}
+    
+    html = response.text
+    content_hash = hashlib.sha256(html.encode("utf-8")).hexdigest()
+    changed = content_hash != entry.get("content_hash")
+    
+    validators = None
+    if response.status_code == 200:
+        validators = {
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", ""),
+            "content_hash": content_hash,
+            "checked_at": datetime.now().isoformat()
+        }
+    
+    return {"html": html, "changed": changed, "status": response.status_code, "validators": validators}
+
+def commit_news_poll_state(poll_state):
+    """Tarama sırasında toplanan kaynak durumunu (doğrulayıcılar) listing_cache.json'a yaz
+    
+    Zamanlayıcı bunu adaylar işlendikten sonra çağırır; yarıda kalan bir turda
+    çağrılmazsa sonraki koşullu tarama aynı adayları yeniden bulur.
+    """
+    if not poll_state:
+        return
+    
+    def _store(current):
+        if not isinstance(current, dict):
+            current = {}
+        for url, entry in poll_state.items():
+            current[url] = {**current.get(url, {}), **entry}
+        return current
+    
+    update_json(LISTING_CACHE_FILE, _store, default={})
+
+def load_news_sources():
+    """Kayıtlı haber kaynakları (news_sources.json), eksik alanlar varsayılanlarla doldurulur
+    
+    Kaynak tipleri: html (liste sayfası + link seçicisi), rss (RSS/Atom), json (JSON API).
+    """
+    try:
+        data = load_json(NEWS_SOURCES_FILE) if os.path.exists(NEWS_SOURCES_FILE) else []
+    except Exception as e:
+        print(f"[SOURCES] {NEWS_SOURCES_FILE} okunamadı, varsayılan kaynaklar kullanılıyor: {e}")
+        data = []
+    if not isinstance(data, list) or not data:
+        data = DEFAULT_NEWS_SOURCES
+    
+    sources = []
+    for source in data:
+        if not isinstance(source, dict) or not source.get("url"):
+            continue
+        entry = dict(NEWS_SOURCE_DEFAULTS)
+        entry.update(source)
+        entry.setdefault("name", urlparse(entry["url"]).netloc)
+        if entry["type"] not in _NEWS_SOURCE_PARSERS:
+            print(f"[SOURCES] Bilinmeyen kaynak tipi '{entry['type']}', atlanıyor: {entry['name']}")
+            continue
+        sources.append(entry)
+    return sources
+
+def _parse_html_source(source, text):
+    selector = source["link_selector"]
+    match = SIMPLE_SELECTOR_PATTERN.match(selector)
+    soup = parse_html(text, parse_only=[match.group(1)] if match else None)
+    return [
+        {"title": tag.get_text(strip=True), "url": tag.get("href", "")}
+        for tag in select_all(soup, selector)
+    ]
+
+def _xml_local_name(tag):
+    return tag.rsplit("}", 1)[-1].lower()
+
+def _strip_html(text):
+    return " ".join(html_lib.unescape(re.sub(r"<[^>]+>", " ", text or "")).split())
+
+def _feed_item_from_element(element):
+    """RSS <item> / Atom <entry> elemanından başlık, link, guid, özet ve (varsa) tam metin"""
+    item = {"title": "", "url": "", "summary": "", "guid": "", "content": ""}
+    for child in element:
+        name = _xml_local_name(child.tag)
+        if name == "title":
+            item["title"] = (child.text or "").strip()
+        elif name == "link":
+            href = child.get("href")
+            if href and child.get("rel", "alternate") == "alternate":
+                item["url"] = href
+            elif not href and child.text:
+                item["url"] = child.text.strip()
+        elif name in ("guid", "id"):
+            item["guid"] = (child.text or "").strip()
+        elif name in ("description", "summary"):
+            item["summary"] = _strip_html(child.text)
+        elif name in ("encoded", "content"):
+            item["content"] = _strip_html(child.text)
+    return item
+
+def _parse_feed_source(source, text):
+    """RSS <item> ve Atom <entry> kayıtları (tüm belge)"""
+    root = ElementTree.fromstring(text.encode("utf-8") if isinstance(text, str) else text)
+    return [
+        _feed_item_from_element(element) for element in root.iter()
+        if _xml_local_name(element.tag) in ("item", "entry")
+    ]
+
+def iter_feed_items(chunks):
+    """Akışı parça parça ayrıştır, her <item>/<entry> tamamlandığında üret
+    
+    Tüketici durduğunda kalan veri indirilmez; işlenen elemanlar bellekten atılır.
+    """
+    parser = ElementTree.XMLPullParser(events=("end",))
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            if _xml_local_name(element.tag) in ("item", "entry"):
+                yield _feed_item_from_element(element)
+                element.clear()
+
+def _parse_json_source(source, text):
+    """items_path (noktalı yol) altındaki listeden başlık/URL/içerik alanları"""
+    data = json.loads(text)
+    for key in [part for part in source["items_path"].split(".") if part]:
+        data = data.get(key, []) if isinstance(data, dict) else []
+    items = []
+    for entry in data if isinstance(data, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        items.append({
+            "title": str(entry.get(source["title_field"], "") or "").strip(),
+            "url": str(entry.get(source["url_field"], "") or "").strip(),
+            "summary": str(entry.get(source["content_field"], "") or "") if source["content_field"] else ""
+        })
+    return items
 
-def fetch_latest_ai_articles():
-    """Ana haber çekme fonksiyonu - Firecrawl MCP öncelikli"""
-    try:
-        # Önce Firecrawl MCP ile dene
-        articles = fetch_latest_ai_articles_with_firecrawl()
-        
-        # Eğer Firecrawl'dan makale gelmezse fallback kullan
-        if not articles:
-            print("🔄 Firecrawl'dan makale gelmedi, fallback yöntemi deneniyor...")
-            articles = fetch_latest_ai_articles_fallback()
-        
-        return articles
-        
-    except Exception as e:
-        print(f"Ana haber çekme hatası: {e}")
-        return fetch_latest_ai_articles_fallback()
+_NEWS_SOURCE_PARSERS = {
+    "html": _parse_html_source,
+    "rss": _parse_feed_source,
+    "json": _parse_json_source,
+}
 
-def fetch_latest_ai_articles_fallback():
-    """Fallback haber çekme yöntemi - BeautifulSoup ile"""
+def _firecrawl_source_links(source):
+    """HTML kaynağının linklerini Firecrawl ile çek - başarısızsa None"""
+    scrape_result = mcp_firecrawl_scrape({
+        "url": source["url"],
+        "formats": ["links"],
+        "onlyMainContent": True,
+        "waitFor": 2000
+    })
+    if not scrape_result.get("success", False):
+        return None
+    items = []
+    for link in scrape_result.get("links", []):
+        if isinstance(link, dict):
+            items.append({"title": link.get("text", "") or "", "url": link.get("url", "")})
+        else:
+            items.append({"title": "", "url": str(link)})
+    return items
+
+def _feed_item_passes_prefilter(source, item):
+    """Ucuz ön filtre: başlık+özet anahtar kelime (varsa) içermeli, hariç tutulanları içermemeli"""
+    text = f"{item.get('title', '')} {item.get('summary', '')}".lower()
+    keywords = [keyword.lower() for keyword in source.get("keywords") or []]
+    if keywords and not any(keyword in text for keyword in keywords):
+        return False
+    return not any(keyword.lower() in text for keyword in source.get("exclude_keywords") or [])
+
+def _poll_feed_source(source, conditional=False, poll_state=None):
+    """RSS/Atom akışını akış halinde oku, sadece yeni GUID'leri aday yap
+    
+    Bilinen (paylaşılmış ya da ön filtreye takılmış) kayıtlar art arda
+    FEED_KNOWN_STREAK_LIMIT kez görülünce ya da max_articles yeni kayıt
+    bulununca indirme kesilir. Akışın yeni ETag/Last-Modified değerleri
+    koşullu taramada poll_state'e yazılır (bkz. commit_news_poll_state).
+    """
+    feed_url = source.get("feed_url") or source["url"]
+    cache = load_json(LISTING_CACHE_FILE)
+    entry = cache.get(feed_url, {}) if isinstance(cache, dict) else {}
+    
+    headers = {'User-Agent': HTTP_USER_AGENT}
+    if conditional:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    
+    response = http_get(feed_url, headers=headers, stream=True)
     try:
-        # Önce mevcut yayınlanan makaleleri yükle
-        posted_articles = load_json(HISTORY_FILE)
-        posted_urls = [article.get('url', '') for article in posted_articles]
-        posted_hashes = [article.get('hash', '') for article in posted_articles]
+        if response.status_code == 304:
+            print(f"⏭️ {source['name']}: Akış değişmemiş (HTTP 304), atlanıyor")
+            return []
+        response.raise_for_status()
+        
+        if conditional and poll_state is not None:
+            poll_state.setdefault(feed_url, {}).update({
+                "etag": response.headers.get("ETag", ""),
+                "last_modified": response.headers.get("Last-Modified", ""),
+                "checked_at": datetime.now().isoformat()
+            })
         
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        html = requests.get("https://techcrunch.com/category/artificial-intelligence/", headers=headers).text
-        soup = BeautifulSoup(html, "html.parser")
-        article_links = soup.select("a.loop-card__title-link")[:4]  # Sadece son 4 makale
+        found = []
+        filtered_guids = []
+        known_streak = 0
+        downloaded = [0]
         
-        print(f"🔍 Fallback: TechCrunch AI kategorisinden son {len(article_links)} makale kontrol ediliyor...")
+        def _chunks():
+            for chunk in response.iter_content(chunk_size=FEED_CHUNK_SIZE):
+                downloaded[0] += len(chunk)
+                yield chunk
         
-        articles_data = []
-        for link_tag in article_links:
-            title = link_tag.text.strip()
-            url = link_tag['href']
+        for item in iter_feed_items(_chunks()):
+            item["url"] = absolute_url(item.get("url") or item.get("guid"), base_url=feed_url)
+            # Linksiz kayıtlar max_articles'a sayılmadan baştan atlanır
+            if urlparse(item["url"]).scheme not in ("http", "https"):
+                continue
+            guid = item.get("guid") or item["url"]
             
-            # Makale hash'i oluştur (başlık bazlı)
-            article_hash = hashlib.md5(title.encode()).hexdigest()
+            if (feed_seen_cache.get(guid) or
+                    is_article_posted(url=item["url"]) or
+                    (guid.startswith("http") and is_article_posted(url=guid))):
+                known_streak += 1
+                if known_streak >= FEED_KNOWN_STREAK_LIMIT:
+                    break
+                continue
+            known_streak = 0
             
-            # Tekrar kontrolü - URL ve hash bazlı
-            is_already_posted = url in posted_urls or article_hash in posted_hashes
+            if not _feed_item_passes_prefilter(source, item):
+                filtered_guids.append(guid)
+                continue
             
-            if is_already_posted:
-                print(f"✅ Makale zaten paylaşılmış, atlanıyor: {title[:50]}...")
+            found.append(item)
+            if len(found) >= int(source["max_articles"]):
+                break
+        
+        # Ön filtreye takılanlar tek seferde kaydedilir
+        feed_seen_cache.set_many({guid: True for guid in filtered_guids})
+        
+        print(f"📡 {source['name']}: {downloaded[0] / 1024:.1f} KB akış okundu, {len(found)} yeni kayıt")
+        return found
+    finally:
+        response.close()
+
+def _poll_news_source(source, conditional=False, use_firecrawl=False, poll_state=None):
+    """Tek kaynağı tara: liste/akışı çek, linkleri mutlak adrese çevir, desen ve limitle süz
+    
+    Linkler olduğu gibi (mutlak) tutulur; tekrar kontrolü normalize_url anahtarıyla yapılır.
+    
+    poll_state verilirse kaynağın yeni doğrulayıcıları oraya yazılır. Akış okunamazsa
+    kaynağın ayrı bir HTML liste sayfası varsa o taranır; yoksa hata yükseltilir ve
+    kaynağın durumu poll_state'ten çıkarılır (sonraki tur kaynak yeniden taranır).
+    """
+    # Akış tanımlı kaynaklarda HTML liste sayfası hiç indirilmez
+    items = None
+    if source["type"] == "rss" or source.get("feed_url"):
+        feed_url = source.get("feed_url") or source["url"]
+        try:
+            items = _poll_feed_source(source, conditional, poll_state)
+            source = dict(source, type="rss")
+        except Exception as e:
+            if poll_state is not None:
+                poll_state.pop(feed_url, None)
+            if feed_url == source["url"]:
+                raise
+            print(f"⚠️ {source['name']}: Akış okunamadı ({e}), HTML liste sayfası taranıyor")
+            source = dict(source, type="html")
+    
+    if items is None and use_firecrawl and source["type"] == "html":
+        items = _firecrawl_source_links(source)
+        if items is None:
+            print(f"⚠️ Firecrawl MCP başarısız, HTTP ile taranıyor: {source['name']}")
+    
+    if items is None:
+        listing = fetch_listing_page(source["url"], headers={'User-Agent': HTTP_USER_AGENT}, conditional=conditional)
+        # Doğrulayıcılar sadece koşullu (zamanlayıcı) taramalarda kaydedilir
+        if conditional and poll_state is not None and listing["validators"]:
+            poll_state.setdefault(source["url"], {}).update(listing["validators"])
+        if conditional and not listing["changed"]:
+            print(f"⏭️ {source['name']}: Kaynak değişmemiş (HTTP {listing['status']}), atlanıyor")
+            return []
+        try:
+            items = _NEWS_SOURCE_PARSERS[source["type"]](source, listing["html"])
+        except Exception:
+            # Ayrıştırılamayan içeriğin doğrulayıcıları kaydedilirse sonraki tur 304 ile atlanır
+            if poll_state is not None:
+                poll_state.pop(source["url"], None)
+            raise
+    
+    pattern = re.compile(source["url_pattern"]) if source["url_pattern"] else None
+    source_host = _canonical_host(source["url"])
+    found = []
+    seen_urls = set()
+    for item in items:
+        url = absolute_url(item.get("url", ""), base_url=source["url"])
+        key = normalize_url(url)
+        if urlparse(url).scheme not in ("http", "https") or key in seen_urls:
+            continue
+        if pattern and not pattern.search(url):
+            continue
+        if source["type"] == "html" and source["same_host_only"] and _canonical_host(url) != source_host:
+            continue
+        seen_urls.add(key)
+        item["url"] = url
+        found.append(item)
+        if len(found) >= int(source["max_articles"]):
+            break
+    return found
+
+def _news_source_due(source, listing_cache):
+    """Kaynağın fetch_interval_minutes süresi dolduysa True"""
+    interval = float(source.get("fetch_interval_minutes") or 0)
+    if interval <= 0:
+        return True
+    polled_at = listing_cache.get(source["url"], {}).get("polled_at")
+    if not polled_at:
+        return True
+    try:
+        return datetime.now() - datetime.fromisoformat(polled_at) >= timedelta(minutes=interval)
+    except ValueError:
+        return True
+
+def discover_article_candidates(skip_unchanged=False, use_firecrawl=False, poll_state=None):
+    """Tüm kaynakları paralel tara, birleştir, tekrarları ve paylaşılmışları ele
+    
+    skip_unchanged=True (zamanlayıcı) ise sadece süresi gelen kaynaklar taranır ve
+    değişmeyen liste/akışlar atlanır. poll_state verilirse kaynakların yeni durumu
+    oraya toplanır (bkz. commit_news_poll_state).
+    """
+    sources = [source for source in load_news_sources() if source.get("enabled", True)]
+    if skip_unchanged:
+        listing_cache = load_json(LISTING_CACHE_FILE)
+        if not isinstance(listing_cache, dict):
+            listing_cache = {}
+        sources = [source for source in sources if _news_source_due(source, listing_cache)]
+    if not sources:
+        print("⏭️ Taranması gereken haber kaynağı yok")
+        return []
+    
+    sources_by_url = {source["url"]: source for source in sources}
+    results = fetch_urls_concurrently(
+        list(sources_by_url),
+        lambda url: _poll_news_source(sources_by_url[url], conditional=skip_unchanged,
+                                      use_firecrawl=use_firecrawl, poll_state=poll_state)
+    )
+    
+    # Tarama zamanı da doğrulayıcılar gibi adaylar işlendikten sonra kaydedilir
+    # (commit_news_poll_state); aksi halde yarıda kalan tur kaynağı bir aralık geciktirir
+    if skip_unchanged and poll_state is not None:
+        polled_at = datetime.now().isoformat()
+        for url, found in zip(sources_by_url, results):
+            if found is not None:
+                poll_state.setdefault(url, {})["polled_at"] = polled_at
+    
+    # Kaynaklar arası birleştirme: kanonik URL ve başlık hash'i ile tekilleştir
+    candidates = []
+    seen = set()
+    for source, found in zip(sources_by_url.values(), results):
+        for item in found or []:
+            key = normalize_url(item["url"])
+            title_hash = hashlib.md5(item["title"].encode()).hexdigest() if item.get("title") else ""
+            if key in seen or (title_hash and title_hash in seen):
                 continue
+            seen.add(key)
+            if title_hash:
+                seen.add(title_hash)
             
-            # Makale içeriğini gelişmiş şekilde çek
-            content = fetch_article_content_advanced(url, headers)
+            # Tekrar kontrolü - URL, kanonik URL ve hash bazlı (indeks)
+            if is_article_posted(url=item["url"], title_hash=title_hash):
+                print(f"✅ Makale zaten paylaşılmış, atlanıyor: {(item.get('title') or item['url'])[:50]}...")
+                continue
             
-            if content and len(content) > 100:  # Minimum içerik kontrolü
-                articles_data.append({
-                    "title": title, 
-                    "url": url, 
-                    "content": content,
-                    "hash": article_hash,
-                    "fetch_date": datetime.now().isoformat(),
-                    "is_new": True,  # Yeni makale işareti
-                    "already_posted": False,
-                    "source": "fallback"
-                })
-                print(f"🆕 Fallback ile yeni makale bulundu: {title[:50]}...")
-            else:
-                print(f"⚠️ İçerik yetersiz, atlanıyor: {title[:50]}...")
-        
+            item["source_name"] = source["name"]
+            candidates.append(item)
+    
+    print(f"🔍 {len(sources)} kaynaktan {len(candidates)} yeni makale adayı")
+    return candidates
+
+def _fetch_candidate_articles(candidates, content_fetcher, source_label, batch_fetcher=None):
+    """Adayların içeriklerini çek (sıra korunur) ve makale kayıtlarını oluştur
+    
+    batch_fetcher verilirse tüm URL'ler tek çağrıda (URL listesi -> sonuç listesi),
+    yoksa content_fetcher ile paralel çekilir.
+    """
+    # Akışta tam metin gelen adaylar için makale sayfası indirilmez
+    to_fetch = [c["url"] for c in candidates if len(c.get("content") or "") < FEED_INLINE_CONTENT_MIN_LENGTH]
+    if batch_fetcher is not None:
+        fetched = dict(zip(to_fetch, batch_fetcher(to_fetch)))
+    else:
+        fetched = dict(zip(to_fetch, fetch_urls_concurrently(to_fetch, content_fetcher)))
+    max_length = get_content_extraction_settings()["max_content_length"]
+    
+    articles_data = []
+    for candidate in candidates:
+        if candidate["url"] in fetched:
+            result = fetched[candidate["url"]] or {}
+        else:
+            result = {"title": candidate.get("title", ""), "content": candidate["content"][:max_length]}
+        title = candidate.get("title") or result.get("title", "")
+        content = result.get("content", "")
+        if not content or len(content) <= 100:  # Minimum içerik kontrolü
+            print(f"⚠️ İçerik yetersiz, atlanıyor: {(title or candidate['url'])[:50]}...")
+            continue
+        
+        # Makale hash'i oluştur (başlık bazlı)
+        article_hash = hashlib.md5(title.encode()).hexdigest()
+        canonical_url = result.get("canonical_url") or candidate["url"]
+        
+        # Liste aşamasında görülemeyenler: AMP vb. için rel=canonical adresi ve içerikten gelen başlık
+        if is_article_posted(url=canonical_url, title_hash=article_hash):
+            print(f"✅ Makale zaten paylaşılmış, atlanıyor: {title[:50]}...")
+            continue
+        
+        # Paylaşımda kaynaktaki adres kullanılır; kanonik adres sadece tekrar kontrolü için
+        articles_data.append({
+            "title": title,
+            "url": candidate["url"],
+            "canonical_url": canonical_url,
+            "content": content,
+            "hash": article_hash,
+            "fetch_date": datetime.now().isoformat(),
+            "is_new": True,  # Yeni makale işareti
+            "already_posted": False,
+            "source": source_label,
+            "source_name": candidate.get("source_name", "")
+        })
+        print(f"🆕 Yeni makale bulundu ({candidate.get('source_name', '')}): {title[:50]}...")
+    
+    return filter_near_duplicates(articles_data)
+
+def fetch_latest_ai_articles_fallback(skip_unchanged=False, poll_state=None):
+    """Fallback haber çekme yöntemi - kayıtlı kaynaklar HTTP + BeautifulSoup ile"""
+    try:
+        candidates = discover_article_candidates(skip_unchanged, poll_state=poll_state)
+        articles_data = _fetch_candidate_articles(candidates, fetch_article_content_advanced_fallback, "fallback")
         print(f"📊 Fallback ile toplam {len(articles_data)} yeni makale bulundu")
         return articles_data
         
     except Exception as e:
         print(f"Fallback haber çekme hatası: {e}")
+        # Adaylar kayboldu - kaynak durumu kaydedilmemeli
+        if poll_state is not None:
+            poll_state.clear()
         return []
 
+FIRECRAWL_ARTICLE_PARAMS = {
+    "formats": ["markdown"],
+    "onlyMainContent": True,
+    "waitFor": 3000,
+    "removeBase64Images": True
+}
+
+def _firecrawl_article_from_result(scrape_result, url):
+    """Firecrawl markdown sonucundan makale kaydı oluştur - içerik yetersizse None"""
+    markdown_content = scrape_result.get("markdown", "")
+    
+    if not markdown_content or len(markdown_content) < 100:
+        return None
+    
+    # Başlığı çıkar (genellikle ilk # ile başlar)
+    lines = markdown_content.split('\n')
+    title = ""
+    content_lines = []
+    
+    for line in lines:
+        line = line.strip()
+        if line.startswith('# ') and not title:
+            title = line[2:].strip()
+        elif line and not line.startswith('#') and len(line) > 20:
+            content_lines.append(line)
+    
+    # İçeriği birleştir ve temizle
+    content = '\n'.join(content_lines)
+    
+    # Gereksiz karakterleri temizle
+    content = content.replace('*', '').replace('**', '').replace('_', '')
+    content = ' '.join(content.split())  # Çoklu boşlukları tek boşluğa çevir
+    
+    # İçeriği sınırla
+    content = content[:get_content_extraction_settings()["max_content_length"]]
+    
+    metadata = scrape_result.get("metadata") or {}
+    return {
+        "title": title or metadata.get("title") or "Başlık bulunamadı",
+        "content": content,
+        "canonical_url": absolute_url(metadata.get("canonical") or metadata.get("ogUrl") or url, base_url=url),
+        "source": "firecrawl_mcp"
+    }
+
 def fetch_article_content_with_firecrawl(url):
     """Firecrawl MCP ile makale içeriği çekme"""
     try:
         print(f"🔍 Firecrawl MCP ile makale çekiliyor: {url[:50]}...")
         
         # Firecrawl MCP scrape fonksiyonunu kullan
-        scrape_result = mcp_firecrawl_scrape({
-            "url": url,
-            "formats": ["markdown"],
-            "onlyMainContent": True,
-            "waitFor": 3000,
-            "removeBase64Images": True
-        })
+        scrape_result = mcp_firecrawl_scrape({"url": url, **FIRECRAWL_ARTICLE_PARAMS})
         
         if not scrape_result.get("success", False):
             print(f"⚠️ Firecrawl MCP başarısız, fallback deneniyor...")
             return fetch_article_content_advanced_fallback(url)
         
-        # Markdown içeriğini al
-        markdown_content = scrape_result.get("markdown", "")
-        
-        if not markdown_content or len(markdown_content) < 100:
+        result = _firecrawl_article_from_result(scrape_result, url)
+        if result is None:
             print(f"⚠️ Firecrawl'dan yetersiz içerik, fallback deneniyor...")
             return fetch_article_content_advanced_fallback(url)
         
-        # Başlığı çıkar (genellikle ilk # ile başlar)
-        lines = markdown_content.split('\n')
-        title = ""
-        content_lines = []
+        print(f"✅ Firecrawl ile içerik çekildi: {len(result['content'])} karakter")
+        return result
         
-        for line in lines:
-            line = line.strip()
-            if line.startswith('# ') and not title:
-                title = line[2:].strip()
-            elif line and not line.startswith('#') and len(line) > 20:
-                content_lines.append(line)
-        
-        # İçeriği birleştir ve temizle
-        content = '\n'.join(content_lines)
-        
-        # Gereksiz karakterleri temizle
-        content = content.replace('*', '').replace('**', '').replace('_', '')
-        content = ' '.join(content.split())  # Çoklu boşlukları tek boşluğa çevir
-        
-        # İçeriği sınırla
-        content = content[:2500]
-        
-        print(f"✅ Firecrawl ile içerik çekildi: {len(content)} karakter")
+    except Exception as e:
+        print(f"❌ Firecrawl MCP hatası ({url}): {e}")
+        print("🔄 Fallback yönteme geçiliyor...")
+        return fetch_article_content_advanced_fallback(url)
+
+def fetch_article_contents_with_firecrawl(urls):
+    """Makale içeriklerini tek Firecrawl toplu scrape isteğiyle çek (sıra korunur)
+    
+    Toplu iş başarısızsa ya da bir URL için yetersiz içerik gelirse o URL'ler
+    paralel HTTP fallback yöntemiyle çekilir.
+    """
+    if not urls:
+        return []
+    
+    print(f"🔍 Firecrawl MCP ile {len(urls)} makale tek istekte çekiliyor...")
+    batch_result = mcp_firecrawl_batch_scrape(urls, FIRECRAWL_ARTICLE_PARAMS)
+    documents = batch_result.get("results", {}) if batch_result.get("success", False) else {}
+    
+    results = {}
+    for url, document in documents.items():
+        article = _firecrawl_article_from_result(document, url)
+        if article is not None:
+            results[url] = article
+    print(f"✅ Firecrawl ile {len(results)}/{len(urls)} makale çekildi")
+    
+    missing = [url for url in urls if url not in results]
+    if missing:
+        print(f"🔄 {len(missing)} makale fallback yöntemiyle çekiliyor...")
+        results.update(zip(missing, fetch_urls_concurrently(missing, fetch_article_content_advanced_fallback)))
+    
+    return [results.get(url) for url in urls]
+
+_compiled_selectors = {}
+
+def compile_selector(selector):
+    """CSS seçicisini bir kez derle ve önbellekte tut (soupsieve yoksa metin olarak kalır)"""
+    compiled = _compiled_selectors.get(selector)
+    if compiled is None:
+        compiled = soupsieve.compile(selector) if soupsieve is not None else selector
+        _compiled_selectors[selector] = compiled
+    return compiled
+
+def select_all(soup, selector):
+    compiled = compile_selector(selector)
+    if isinstance(compiled, str):
+        return soup.select(compiled)
+    return compiled.select(soup)
+
+def select_one(soup, selector):
+    compiled = compile_selector(selector)
+    if isinstance(compiled, str):
+        return soup.select_one(compiled)
+    return compiled.select_one(soup)
+
+def parse_html(text, parse_only=None):
+    """HTML'i hızlı ayrıştırıcıyla oku; parse_only verilirse sadece o etiketlerin ağacı kurulur"""
+    strainer = SoupStrainer(parse_only) if parse_only else None
+    return BeautifulSoup(text, HTML_PARSER, parse_only=strainer)
+
+_selector_specs_cache = {}
+
+def _container_selector_specs(selectors):
+    """"div.article-content p" gibi seçicilerden kapsayıcı (etiket, sınıflar, id) üçlülerini çıkar"""
+    key = tuple(selectors)
+    cached = _selector_specs_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    specs = []
+    for selector in selectors:
+        match = re.match(r"^([a-zA-Z][a-zA-Z0-9]*)?((?:[.#][\w-]+)*)$", selector.split()[0])
+        if not match or not (match.group(1) or match.group(2)):
+            specs.append(None)
+            continue
+        tag = (match.group(1) or "").lower() or None
+        parts = re.findall(r"([.#])([\w-]+)", match.group(2))
+        classes = frozenset(name for kind, name in parts if kind == ".")
+        element_id = next((name for kind, name in parts if kind == "#"), None)
+        specs.append((tag, classes, element_id))
+    _selector_specs_cache[key] = specs
+    return specs
+
+def _content_domain(url):
+    """Öğrenilen seçiciler için alan adı anahtarı (www/amp/m öneki atılmış host)"""
+    return _canonical_host(url)
+
+def _ordered_content_selectors(learned_selector):
+    """Alan adı için öğrenilmiş seçici önce, ardından genel seçiciler"""
+    if not learned_selector:
+        return list(ARTICLE_CONTENT_SELECTORS)
+    return [learned_selector] + [selector for selector in ARTICLE_CONTENT_SELECTORS if selector != learned_selector]
+
+class StreamingArticleExtractor(HTMLParser):
+    """Parça parça gelen HTML'den başlık, kanonik adres ve paragrafları toplar
+    
+    Paragraflar içerik seçicilerinin kapsayıcılarına göre ayrı ayrı biriktirilir;
+    herhangi bir kapsayıcıda max_content_length kadar metin toplanınca `done` olur
+    ve indirme kesilebilir.
+    """
+    
+    def __init__(self, max_content_length, selectors=None):
+        super().__init__(convert_charrefs=True)
+        self.max_content_length = max_content_length
+        self.selectors = list(selectors or ARTICLE_CONTENT_SELECTORS)
+        self.specs = _container_selector_specs(self.selectors)
+        self.title = ""
+        self.canonical_href = ""
+        self.og_url = ""
+        self.done = False
+        self._buckets = [[] for _ in self.specs]
+        self._bucket_lengths = [0] * len(self.specs)
+        self._loose_paragraphs = []
+        self._loose_length = 0
+        self._containers = []  # [etiket, seçici indeksleri, aynı etiketin açık derinliği]
+        self._skip_depth = 0
+        self._title_parts = None
+        self._paragraph = None
+        self._paragraph_buckets = ()
+    
+    def _matching_specs(self, tag, attrs):
+        values = dict(attrs)
+        classes = set((values.get("class") or "").split())
+        return tuple(index for index, spec in enumerate(self.specs)
+                     if spec and (spec[0] is None or spec[0] == tag) and spec[1] <= classes
+                     and (spec[2] is None or spec[2] == values.get("id")))
+    
+    def _flush_paragraph(self):
+        if self._paragraph is None:
+            return
+        text = " ".join("".join(self._paragraph).split())
+        self._paragraph = None
+        if not text:
+            return
+        for index in self._paragraph_buckets:
+            if self._bucket_lengths[index] < self.max_content_length:
+                self._buckets[index].append(text)
+                self._bucket_lengths[index] += len(text) + 1
+                if self._bucket_lengths[index] >= self.max_content_length:
+                    self.done = True
+        if len(text) > 50 and self._loose_length < self.max_content_length:
+            self._loose_paragraphs.append(text)
+            self._loose_length += len(text) + 1
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in ARTICLE_STREAM_SKIP_TAGS:
+            self._skip_depth += 1
+            return
+        if self._skip_depth:
+            return
+        
+        if tag == "link" and not self.canonical_href:
+            values = dict(attrs)
+            if "canonical" in (values.get("rel") or "").lower().split() and values.get("href"):
+                self.canonical_href = values["href"]
+        elif tag == "meta" and not self.og_url:
+            values = dict(attrs)
+            if values.get("property") == "og:url" and values.get("content"):
+                self.og_url = values["content"]
+        elif tag == "h1" and not self.title:
+            self._title_parts = []
+        elif tag == "p":
+            self._flush_paragraph()
+            self._paragraph = []
+            self._paragraph_buckets = tuple(sorted({index for entry in self._containers for index in entry[1]}))
+        
+        for entry in self._containers:
+            if entry[0] == tag:
+                entry[2] += 1
+        matched = self._matching_specs(tag, attrs)
+        if matched:
+            self._containers.append([tag, matched, 1])
+    
+    def handle_endtag(self, tag):
+        if tag in ARTICLE_STREAM_SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if self._skip_depth:
+            return
+        
+        if tag == "h1" and self._title_parts is not None:
+            self.title = " ".join("".join(self._title_parts).split())
+            self._title_parts = None
+        elif tag == "p":
+            self._flush_paragraph()
+        
+        if any(entry[0] == tag for entry in self._containers):
+            # Kapanmamış <p> kapsayıcı bitmeden tamamlanır
+            self._flush_paragraph()
+            for entry in self._containers:
+                if entry[0] == tag:
+                    entry[2] -= 1
+            self._containers = [entry for entry in self._containers if entry[2] > 0]
+    
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+        if self._paragraph is not None:
+            self._paragraph.append(data)
+    
+    def best_content(self):
+        """Seçici sırasına göre ilk yeterli kapsayıcının metni ve seçicisi
         
-        return {
+        Yeterli kapsayıcı yoksa eldeki en iyi metin ve None döner.
+        """
+        self._flush_paragraph()
+        content = ""
+        for selector, paragraphs in zip(self.selectors, self._buckets):
+            if paragraphs:
+                content = "\n".join(paragraphs)
+                if len(content) > ARTICLE_SELECTOR_MIN_CONTENT:
+                    return content[:self.max_content_length], selector
+        if not content:
+            content = "\n".join(self._loose_paragraphs)
+        return content[:self.max_content_length], None
+    
+    def canonical_url(self, page_url):
+        return absolute_url(self.canonical_href or self.og_url or page_url, base_url=page_url)
+
+def stream_article_html(url, max_content_length, max_download_bytes, headers=None, selectors=None):
+    """Makale sayfasını parça parça indir ve ayrıştır; yeterli içerik ya da bayt tavanında kes
+    
+    Dönüş: (extractor, indirilen HTML metni, indirilen bayt, sayfa sonuna kadar okundu mu).
+    200 dışı yanıtlarda gövde okunmadan requests.HTTPError fırlatılır.
+    """
+    extractor = StreamingArticleExtractor(max_content_length, selectors=selectors)
+    html_parts = []
+    downloaded = 0
+    complete = True
+    
+    response = http_get(url, headers=headers or {'User-Agent': 'Mozilla/5.0'}, stream=True)
+    if response.status_code != 200:
+        response.close()
+        raise requests.HTTPError(f"HTTP {response.status_code}: {url}", response=response)
+    try:
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        for chunk in response.iter_content(chunk_size=ARTICLE_STREAM_CHUNK_SIZE):
+            downloaded += len(chunk)
+            text = decoder.decode(chunk)
+            html_parts.append(text)
+            extractor.feed(text)
+            if extractor.done or downloaded >= max_download_bytes:
+                complete = False
+                break
+        if complete:
+            tail = decoder.decode(b"", final=True)
+            html_parts.append(tail)
+            extractor.feed(tail)
+            extractor.close()
+    finally:
+        response.close()
+    
+    return extractor, "".join(html_parts), downloaded, complete
+
+def _extract_article_title(article_soup):
+    for selector in ARTICLE_TITLE_SELECTORS:
+        title_elem = select_one(article_soup, selector)
+        if title_elem:
+            return title_elem.text.strip()
+    return ""
+
+def _extract_article_from_soup(article_soup, selectors=None):
+    """Makale soup'undan başlık, içerik metni ve kazanan seçiciyi çıkar"""
+    title = _extract_article_title(article_soup)
+    
+    # Öğrenilmiş seçici önde - bilinen alan adlarında tek seçici geçişi yeterli (seçiciler önceden derlenmiş)
+    content = ""
+    for selector in selectors or ARTICLE_CONTENT_SELECTORS:
+        paragraphs = select_all(article_soup, selector)
+        if paragraphs:
+            content = "\n".join([p.text.strip() for p in paragraphs if p.text.strip()])
+            if len(content) > ARTICLE_SELECTOR_MIN_CONTENT:  # Yeterli içerik bulundu
+                return title, content, selector
+    
+    # Eğer hala içerik bulunamadıysa, tüm p etiketlerini dene
+    if not content:
+        all_paragraphs = article_soup.find_all('p')
+        content = "\n".join([p.text.strip() for p in all_paragraphs if len(p.text.strip()) > 50])
+    
+    return title, content, None
+
+def _readability_class_weight(element):
+    """Sınıf ve id adlarına göre blok ağırlığı (içerik +25, menü/yorum/paylaşım -25)"""
+    weight = 0
+    for value in (" ".join(element.get("class") or []), element.get("id") or ""):
+        if not value:
+            continue
+        if READABILITY_NEGATIVE_PATTERN.search(value):
+            weight -= 25
+        if READABILITY_POSITIVE_PATTERN.search(value):
+            weight += 25
+    return weight
+
+def _learnable_selector(element):
+    """Blok için tekrar kullanılabilir seçici (etiket#id ya da etiket.sınıf); üretilemezse None"""
+    element_id = element.get("id") or ""
+    if LEARNABLE_NAME_PATTERN.match(element_id):
+        return f"{element.name}#{element_id} p"
+    classes = [name for name in element.get("class") or [] if LEARNABLE_NAME_PATTERN.match(name)]
+    if classes:
+        return f"{element.name}.{'.'.join(classes[:2])} p"
+    if element.name in ("article", "main"):
+        return f"{element.name} p"
+    return None
+
+def extract_main_content(soup):
+    """Readability benzeri ana içerik çıkarma: blokları paragraf metin yoğunluğuna göre puanla
+    
+    Her paragraf puanını (1 + virgül sayısı + her 100 karakter için 1, en fazla 3) üst
+    bloğuna, yarısını bir üstüne ekler; sınıf/id ağırlığı eklenir ve link yoğunluğu
+    kadar düşülür. Dönüş: (içerik, kazanan blok için seçici ya da None)
+    """
+    candidates = {}
+    for paragraph in soup.find_all("p"):
+        text = " ".join(paragraph.get_text(" ").split())
+        if len(text) < READABILITY_MIN_PARAGRAPH_LENGTH:
+            continue
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        parent = paragraph.parent
+        grandparent = parent.parent if parent is not None else None
+        for element, share in ((parent, 1.0), (grandparent, 0.5)):
+            if element is None or element.name not in READABILITY_CANDIDATE_TAGS:
+                continue
+            entry = candidates.get(id(element))
+            if entry is None:
+                entry = candidates[id(element)] = [element, _readability_class_weight(element)]
+            entry[1] += score * share
+    
+    best, best_score = None, 0
+    for element, score in candidates.values():
+        text_length = len(element.get_text())
+        link_length = sum(len(link.get_text()) for link in element.find_all("a"))
+        score *= 1 - link_length / max(text_length, 1)
+        if score > best_score:
+            best, best_score = element, score
+    
+    if best is None:
+        return "", None
+    
+    selector = _learnable_selector(best)
+    paragraphs = select_all(soup, selector) if selector else best.find_all("p")
+    texts = (" ".join(p.get_text(" ").split()) for p in paragraphs)
+    return "\n".join(text for text in texts if text), selector
+
+def fetch_article_content_advanced_fallback(url):
+    """Fallback makale içeriği çekme - akışlı ayrıştırma, gerekirse BeautifulSoup (URL bazlı önbellekli)
+    
+    Alan adı için daha önce kazanan içerik seçicisi önce denenir; genel seçiciler
+    yetmezse metin yoğunluğu puanlaması devreye girer ve kazanan seçici öğrenilir.
+    """
+    cached = article_cache.get(url)
+    if cached:
+        print(f"💾 Önbellekten makale içeriği: {url[:50]}...")
+        return dict(cached)
+    
+    try:
+        settings = get_content_extraction_settings()
+        max_length = settings["max_content_length"]
+        headers = {'User-Agent': 'Mozilla/5.0'}
+        domain = _content_domain(url)
+        learned_selector = content_selector_cache.get(domain)
+        selectors = _ordered_content_selectors(learned_selector)
+        
+        if settings["streaming"]:
+            extractor, article_html, downloaded, complete = stream_article_html(
+                url, max_length, settings["max_download_bytes"], headers=headers, selectors=selectors)
+            title = extractor.title
+            content, selector = extractor.best_content()
+            canonical_url = extractor.canonical_url(url)
+            if not complete:
+                print(f"✂️ İndirme {downloaded // 1024} KB'ta kesildi: {url[:50]}...")
+        else:
+            response = http_get(url, headers=headers)
+            # Hata sayfaları (403/404/5xx) ayrıştırılmaz ve önbelleğe girmez
+            if response.status_code != 200:
+                print(f"⚠️ Makale sayfası HTTP {response.status_code} döndü, atlanıyor: {url[:50]}...")
+                return None
+            article_html = response.text
+            # Makale sayfası tam ağaç olarak bir kez ayrıştırılır: seçici kapsayıcıları div
+            # olduğundan etiket kapsamı lxml'de ölçülebilir kazanç sağlamıyor, ağaç
+            # metin yoğunluğu puanlamasında da yeniden kullanılır
+            article_soup = parse_html(article_html)
+            title, content, selector = _extract_article_from_soup(article_soup, selectors)
+            canonical_url = extract_canonical_url(article_soup, url)
+        
+        # Hiçbir seçici yetmediyse indirilen sayfa tam ağaç olarak metin yoğunluğuna göre puanlanır
+        if selector is None:
+            full_soup = parse_html(article_html) if settings["streaming"] else article_soup
+            main_content, main_selector = extract_main_content(full_soup)
+            if len(main_content) > min(len(content), ARTICLE_SELECTOR_MIN_CONTENT):
+                content, selector = main_content, main_selector
+            title = title or _extract_article_title(full_soup)
+        
+        content = content[:max_length]  # İçeriği sınırla
+        
+        # Kazanan seçici alan adı için hatırlanır, bir sonraki makalede ilk o denenir
+        if selector and selector != learned_selector and len(content) > ARTICLE_SELECTOR_MIN_CONTENT:
+            content_selector_cache.set(domain, selector)
+            print(f"🧠 {domain} için içerik seçicisi öğrenildi: {selector}")
+        
+        result = {
             "title": title or "Başlık bulunamadı",
             "content": content,
-            "source": "firecrawl_mcp"
+            "canonical_url": canonical_url,
+            "source": "fallback"
         }
         
+        # Sadece içerik bulunan sonuçları önbelleğe al
+        if content:
+            article_cache.set(url, result)
+        
+        return result
+        
     except Exception as e:
-        print(f"❌ Firecrawl MCP hatası ({url}): {e}")
-        print("🔄 Fallback yönteme geçiliyor...")
-        return fetch_article_content_advanced_fallback(url)
+        print(f"Fallback makale içeriği çekme hatası ({url}): {e}")
+        return None
+
+def fetch_article_content_advanced(url, headers):
+    """Geriye dönük uyumluluk için eski fonksiyon"""
+    result = fetch_article_content_advanced_fallback(url)
+    return result.get("content", "") if result else ""
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_file_locks_held = threading.local()
+
+@contextmanager
+def file_lock(path):
+    """path için süreçler arası kilit (path.lock dosyası üzerinden), aynı thread'de tekrar girilebilir"""
+    held = getattr(_file_locks_held, "paths", None)
+    if held is None:
+        held = _file_locks_held.paths = {}
+    
+    lock_path = os.path.abspath(path) + ".lock"
+    if held.get(lock_path):
+        held[lock_path] += 1
+        try:
+            yield
+        finally:
+            held[lock_path] -= 1
+        return
+    
+    with open(lock_path, "a+") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        held[lock_path] = 1
+        try:
+            yield
+        finally:
+            held[lock_path] = 0
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def get_file_version(path):
+    """Karşılaştır-ve-yaz için dosya sürümü (mtime_ns:boyut), dosya yoksa boş"""
+    try:
+        stat = os.stat(path)
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+    except OSError:
+        return ""
+
+def atomic_write_file(path, write):
+    """Dosyayı atomik yaz: write(f) geçici dosyaya yazar, fsync, sonra yeniden adlandır
+    
+    Kilit çağıranın sorumluluğundadır (file_lock).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding='utf-8') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+class JsonFileStorage:
+    """Varsayılan depolama: her durum dosyası ayrı bir JSON dosyası"""
+    
+    name = "json"
+    
+    def has_table(self, path):
+        """Dosya sorgulanabilir bir tabloda mı tutuluyor"""
+        return False
+    
+    def load(self, path):
+        if not os.path.exists(path):
+            return []
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def save(self, path, data):
+        """JSON'u kilit altında atomik yaz"""
+        with file_lock(path):
+            atomic_write_file(path, lambda f: json.dump(data, f, indent=2, ensure_ascii=False))
+    
+    def version(self, path):
+        return get_file_version(path)
+    
+    def load_versioned(self, path):
+        with file_lock(path):
+            return self.load(path), self.version(path)
+    
+    def save_if_unchanged(self, path, data, expected_version):
+        with file_lock(path):
+            if self.version(path) != expected_version:
+                return False
+            self.save(path, data)
+            return True
+    
+    def update(self, path, mutator, default=None):
+        with file_lock(path):
+            data = self.load(path) if os.path.exists(path) else default
+            if data is None:
+                data = []
+            result = mutator(data)
+            if result is not None:
+                data = result
+            self.save(path, data)
+            return data
+
+class SQLiteStorage:
+    """SQLite (WAL) depolama arka ucu
+    
+    Paylaşım geçmişi ve bekleyen tweet'ler durum/tarih/hash indeksli tipli
+    tablolarda, diğer durum dosyaları documents tablosunda JSON olarak tutulur.
+    Tanınmayan dosyalar (önbellekler, MCP ayarları) JSON dosyası olarak kalır.
+    Veritabanı ilk açıldığında mevcut JSON dosyaları bir kez içeri aktarılır.
+    """
+    
+    name = "sqlite"
+    
+    TABLE_FILES = {
+        HISTORY_FILE: "posted_articles",
+        PENDING_FILE: "pending_tweets",
+    }
+    DOCUMENT_FILES = (SUMMARY_FILE, HASHTAG_FILE, ACCOUNT_FILE, AUTOMATION_SETTINGS_FILE)
+    
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS posted_articles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL DEFAULT '',
+        url TEXT NOT NULL DEFAULT '',
+        hash TEXT NOT NULL DEFAULT '',
+        posted_date TEXT NOT NULL DEFAULT '',
+        tweet_id TEXT NOT NULL DEFAULT '',
+        tweet_url TEXT NOT NULL DEFAULT '',
+        data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_posted_articles_hash ON posted_articles(hash);
+    CREATE INDEX IF NOT EXISTS idx_posted_articles_url ON posted_articles(url);
+    CREATE INDEX IF NOT EXISTS idx_posted_articles_date ON posted_articles(posted_date);
+    CREATE TABLE IF NOT EXISTS pending_tweets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        status TEXT NOT NULL DEFAULT '',
+        created_date TEXT NOT NULL DEFAULT '',
+        score REAL,
+        url TEXT NOT NULL DEFAULT '',
+        hash TEXT NOT NULL DEFAULT '',
+        tweet_text TEXT NOT NULL DEFAULT '',
+        data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_pending_tweets_status_date ON pending_tweets(status, created_date);
+    CREATE INDEX IF NOT EXISTS idx_pending_tweets_hash ON pending_tweets(hash);
+    CREATE TABLE IF NOT EXISTS pending_tweets_archive (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        queue_id TEXT NOT NULL DEFAULT '',
+        status TEXT NOT NULL DEFAULT '',
+        created_date TEXT NOT NULL DEFAULT '',
+        archived_date TEXT NOT NULL DEFAULT '',
+        url TEXT NOT NULL DEFAULT '',
+        hash TEXT NOT NULL DEFAULT '',
+        data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_pending_archive_status_date ON pending_tweets_archive(status, archived_date);
+    CREATE INDEX IF NOT EXISTS idx_pending_archive_hash ON pending_tweets_archive(hash);
+    CREATE TABLE IF NOT EXISTS documents (name TEXT PRIMARY KEY, data TEXT NOT NULL);
+    CREATE TABLE IF NOT EXISTS storage_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+    """
+    
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = None
+        self._files = JsonFileStorage()
+    
+    def _connection(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.SCHEMA)
+            self._upgrade_schema(conn)
+            self._conn = conn
+            self._migrate_json_files()
+        return self._conn
+    
+    def _upgrade_schema(self, conn):
+        """Eski veritabanlarına sonradan eklenen kolonları ekle, kuyruğu bölümle
+        
+        Tüm adımlar tek transaction'dadır; hata olursa geri alınır ve yazma kilidi
+        açık kalmaz.
+        """
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(pending_tweets)")}
+            if "queue_id" not in columns:
+                conn.execute("ALTER TABLE pending_tweets ADD COLUMN queue_id TEXT NOT NULL DEFAULT ''")
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_pending_tweets_queue_id "
+                         "ON pending_tweets(queue_id) WHERE queue_id != ''")
+            
+            placeholders = ",".join("?" * len(PENDING_TERMINAL_STATUSES))
+            terminal = conn.execute(
+                f"SELECT id, data FROM pending_tweets WHERE status IN ({placeholders})",
+                PENDING_TERMINAL_STATUSES).fetchall()
+            if terminal:
+                self._archive(conn, [json.loads(data) for _, data in terminal])
+                conn.executemany("DELETE FROM pending_tweets WHERE id = ?", [(row_id,) for row_id, _ in terminal])
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    @contextmanager
+    def _transaction(self):
+        """Yazma işlemi: BEGIN IMMEDIATE ile süreçler arası tek yazar (iç içe çağrılar dıştakine katılır)"""
+        with self._lock:
+            conn = self._connection()
+            if conn.in_transaction:
+                yield conn
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+    
+    def _name(self, path):
+        name = os.path.basename(path)
+        if name in self.TABLE_FILES or name in self.DOCUMENT_FILES:
+            return name
+        return None
+    
+    def has_table(self, path):
+        return os.path.basename(path) in self.TABLE_FILES
+    
+    @staticmethod
+    def _posted_row(record):
+        return (
+            record.get("title") or "",
+            record.get("url") or "",
+            record.get("hash") or "",
+            record.get("posted_date") or "",
+            str(record.get("tweet_id") or ""),
+            record.get("tweet_url") or "",
+            json.dumps(record, ensure_ascii=False)
+        )
+    
+    @staticmethod
+    def _pending_row(record):
+        article = record.get("article") or {}
+        try:
+            score = float(record.get("score"))
+        except (TypeError, ValueError):
+            score = None
+        return (
+            record.setdefault("id", new_pending_id()),
+            record.get("status") or "",
+            record.get("created_date") or record.get("created_at") or "",
+            score,
+            article.get("url") or "",
+            article.get("hash") or "",
+            record.get("tweet_text") or "",
+            json.dumps(record, ensure_ascii=False)
+        )
+    
+    def _insert(self, conn, name, records):
+        table = self.TABLE_FILES[name]
+        if table == "posted_articles":
+            conn.executemany(
+                "INSERT INTO posted_articles (title, url, hash, posted_date, tweet_id, tweet_url, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [self._posted_row(record) for record in records]
+            )
+        else:
+            active = [record for record in records if record.get("status") not in PENDING_TERMINAL_STATUSES]
+            self._archive(conn, [record for record in records if record.get("status") in PENDING_TERMINAL_STATUSES])
+            conn.executemany(
+                "INSERT INTO pending_tweets (queue_id, status, created_date, score, url, hash, tweet_text, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._pending_row(record) for record in active]
+            )
+    
+    def _archive(self, conn, records):
+        """Sonuçlanmış kuyruk kayıtlarını arşiv tablosuna ekle"""
+        now = datetime.now().isoformat()
+        rows = []
+        for record in records:
+            record.setdefault("archived_date", now)
+            strip_pending_content(record)
+            article = record.get("article") or {}
+            rows.append((
+                record.get("id") or "",
+                record.get("status") or "",
+                record.get("created_date") or record.get("created_at") or "",
+                record["archived_date"],
+                article.get("url") or "",
+                article.get("hash") or "",
+                json.dumps(record, ensure_ascii=False)
+            ))
+        conn.executemany(
+            "INSERT INTO pending_tweets_archive (queue_id, status, created_date, archived_date, url, hash, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+    
+    def _read(self, conn, name):
+        """Kayıtları oku - doküman hiç yazılmadıysa None"""
+        table = self.TABLE_FILES.get(name)
+        if table:
+            return [json.loads(row[0]) for row in conn.execute(f"SELECT data FROM {table} ORDER BY id")]
+        row = conn.execute("SELECT data FROM documents WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def _write(self, conn, name, data):
+        table = self.TABLE_FILES.get(name)
+        if table:
+            conn.execute(f"DELETE FROM {table}")
+            self._insert(conn, name, [record for record in data if isinstance(record, dict)])
+        else:
+            conn.execute(
+                "INSERT OR REPLACE INTO documents (name, data) VALUES (?, ?)",
+                (name, json.dumps(data, ensure_ascii=False))
+            )
+        self._bump_version(conn, name)
+    
+    def _bump_version(self, conn, name):
+        conn.execute(
+            "INSERT INTO storage_meta (key, value) VALUES (?, '1') "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+            (f"version:{name}",)
+        )
+    
+    def _migrate_json_files(self):
+        """Mevcut JSON durum dosyalarını tek seferlik içeri aktar (dosyalar yerinde bırakılır)"""
+        with self._transaction() as conn:
+            for name in list(self.TABLE_FILES) + list(self.DOCUMENT_FILES):
+                key = f"migrated:{name}"
+                if conn.execute("SELECT 1 FROM storage_meta WHERE key = ?", (key,)).fetchone():
+                    continue
+                try:
+                    if name == HISTORY_FILE:
+                        data = _load_posted_articles_from_files()
+                    elif os.path.exists(name):
+                        data = self._files.load(name)
+                    else:
+                        data = None
+                except Exception as e:
+                    print(f"[STORAGE] {name} içeri aktarılamadı, sonraki açılışta tekrar denenecek: {e}")
+                    continue
+                if data is not None:
+                    self._write(conn, name, data)
+                    count = len(data) if isinstance(data, list) else 1
+                    print(f"[STORAGE] {name} SQLite'a aktarıldı ({count} kayıt)")
+                conn.execute("INSERT INTO storage_meta (key, value) VALUES (?, ?)", (key, datetime.now().isoformat()))
+    
+    def load(self, path):
+        name = self._name(path)
+        if name is None:
+            return self._files.load(path)
+        with self._lock:
+            data = self._read(self._connection(), name)
+        return [] if data is None else data
+    
+    def save(self, path, data):
+        name = self._name(path)
+        if name is None:
+            return self._files.save(path, data)
+        with self._transaction() as conn:
+            self._write(conn, name, data)
+    
+    def version(self, path):
+        name = self._name(path)
+        if name is None:
+            return self._files.version(path)
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value FROM storage_meta WHERE key = ?", (f"version:{name}",)).fetchone()
+        return row[0] if row else ""
+    
+    def load_versioned(self, path):
+        name = self._name(path)
+        if name is None:
+            return self._files.load_versioned(path)
+        with self._transaction() as conn:
+            data = self._read(conn, name)
+            return ([] if data is None else data), self.version(path)
+    
+    def save_if_unchanged(self, path, data, expected_version):
+        name = self._name(path)
+        if name is None:
+            return self._files.save_if_unchanged(path, data, expected_version)
+        with self._transaction() as conn:
+            if self.version(path) != expected_version:
+                return False
+            self._write(conn, name, data)
+            return True
+    
+    def update(self, path, mutator, default=None):
+        name = self._name(path)
+        if name is None:
+            return self._files.update(path, mutator, default)
+        with self._transaction() as conn:
+            if name in self.TABLE_FILES:
+                return self._update_rows(conn, name, mutator)
+            data = self._read(conn, name)
+            if data is None:
+                data = default if default is not None else []
+            result = mutator(data)
+            if result is not None:
+                data = result
+            self._write(conn, name, data)
+            return data
+    
+    def _update_rows(self, conn, name, mutator):
+        """Tipli tabloda oku-değiştir-yaz: sadece değişen, eklenen ve çıkarılan satırlar yazılır
+        
+        Kayıtlar satırlarına kayıt anahtarıyla eşlenir (kuyrukta pending id'si, geçmişte
+        hash/URL/tarih), böylece mutator'ın kopyaladığı kayıtlar da yerinde güncellenir.
+        Anahtarı eşleşmeyen kayıtlar eklenir, karşılığı kalmayan satırlar silinir.
+        Satır sırası id ile korunur.
+        """
+        table = self.TABLE_FILES[name]
+        if table == "pending_tweets":
+            def key_of(record):
+                return record.get("id") or None
+            rows = conn.execute("SELECT id, data, queue_id FROM pending_tweets ORDER BY id").fetchall()
+        else:
+            key_of = _posted_record_key
+            rows = [row + (None,) for row in conn.execute("SELECT id, data FROM posted_articles ORDER BY id")]
+        records = [json.loads(data) for _, data, _ in rows]
+        originals = {}
+        for record, (row_id, data, queue_id) in zip(records, rows):
+            originals.setdefault(queue_id or key_of(record), []).append((row_id, data))
+        
+        result = mutator(records)
+        if result is not None:
+            records = result
+        
+        kept_ids, inserts, updates, archived = set(), [], [], []
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            key = key_of(record)
+            candidates = originals.get(key) if key else None
+            if not candidates:
+                inserts.append(record)
+                continue
+            row_id, data = candidates.pop(0)
+            if table == "pending_tweets" and record.get("status") in PENDING_TERMINAL_STATUSES:
+                archived.append(record)
+                continue
+            kept_ids.add(row_id)
+            if json.dumps(record, ensure_ascii=False) != data:
+                updates.append((row_id, record))
+        deleted_ids = [row[0] for row in rows if row[0] not in kept_ids]
+        
+        if not (inserts or updates or deleted_ids):
+            return records
+        
+        conn.executemany(f"DELETE FROM {table} WHERE id = ?", [(row_id,) for row_id in deleted_ids])
+        if table == "posted_articles":
+            conn.executemany(
+                "UPDATE posted_articles SET title = ?, url = ?, hash = ?, posted_date = ?, tweet_id = ?, "
+                "tweet_url = ?, data = ? WHERE id = ?",
+                [self._posted_row(record) + (row_id,) for row_id, record in updates]
+            )
+        else:
+            self._archive(conn, archived)
+            conn.executemany(
+                "UPDATE pending_tweets SET queue_id = ?, status = ?, created_date = ?, score = ?, url = ?, "
+                "hash = ?, tweet_text = ?, data = ? WHERE id = ?",
+                [self._pending_row(record) + (row_id,) for row_id, record in updates]
+            )
+        self._insert(conn, name, inserts)
+        self._bump_version(conn, name)
+        return records
+    
+    def append(self, path, record):
+        """Tabloya tek kayıt ekle (tüm tabloyu yeniden yazmadan)"""
+        name = os.path.basename(path)
+        with self._transaction() as conn:
+            self._insert(conn, name, [record])
+            self._bump_version(conn, name)
+    
+    def has_posted_before(self, cutoff_iso):
+        with self._lock:
+            return self._connection().execute(
+                "SELECT 1 FROM posted_articles WHERE posted_date < ? LIMIT 1", (cutoff_iso,)).fetchone() is not None
+    
+    def delete_posted_before(self, cutoff_iso):
+        """posted_date indeksi üzerinden süresi dolan kayıtları sil"""
+        with self._transaction() as conn:
+            deleted = conn.execute("DELETE FROM posted_articles WHERE posted_date < ?", (cutoff_iso,)).rowcount
+            if deleted:
+                self._bump_version(conn, HISTORY_FILE)
+            return deleted
+    
+    def count(self, path):
+        table = self.TABLE_FILES[os.path.basename(path)]
+        with self._lock:
+            return self._connection().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    
+    def query_pending_tweets(self, status):
+        table = "pending_tweets_archive" if status in PENDING_TERMINAL_STATUSES else "pending_tweets"
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT data FROM {table} WHERE status = ? ORDER BY id", (status,)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+    
+    def count_pending_tweets(self):
+        counts = {}
+        with self._lock:
+            conn = self._connection()
+            for table in ("pending_tweets", "pending_tweets_archive"):
+                for status, count in conn.execute(f"SELECT status, COUNT(*) FROM {table} GROUP BY status"):
+                    counts[status] = counts.get(status, 0) + count
+        return counts
+    
+    def transition_pending(self, queue_id, changes):
+        """Kuyruk kaydını id ile güncelle; sonuçlanan kayıt arşive taşınır. Kayıt yoksa None"""
+        with self._transaction() as conn:
+            row = conn.execute("SELECT id, data FROM pending_tweets WHERE queue_id = ?", (queue_id,)).fetchone()
+            if row is None:
+                return None
+            row_id, data = row
+            record = json.loads(data)
+            record.update(changes)
+            if record.get("status") in PENDING_TERMINAL_STATUSES:
+                conn.execute("DELETE FROM pending_tweets WHERE id = ?", (row_id,))
+                self._archive(conn, [record])
+            else:
+                values = self._pending_row(record)
+                conn.execute(
+                    "UPDATE pending_tweets SET status = ?, created_date = ?, score = ?, url = ?, hash = ?, "
+                    "tweet_text = ?, data = ? WHERE id = ?",
+                    values[1:] + (row_id,)
+                )
+            self._bump_version(conn, PENDING_FILE)
+            return record
+    
+    def clear_pending_archive(self):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM pending_tweets_archive")
+    
+    def _queue_payload_bytes(self):
+        with self._lock:
+            conn = self._connection()
+            return sum(
+                conn.execute(f"SELECT COALESCE(SUM(LENGTH(data)), 0) FROM {table}").fetchone()[0]
+                for table in ("pending_tweets", "pending_tweets_archive")
+            )
+    
+    def compact_pending_queue(self, policy, now):
+        """Saklama politikasını uygula - her adım ayrı kısa transaction (yazarları uzun süre bekletmez)
+        
+        (silinen kayıt, içeriği çıkarılan kayıt, kazanılan bayt) döndürür.
+        """
+        before = self._queue_payload_bytes()
+        stripped = removed = 0
+        
+        # Arşivde hâlâ içerik taşıyan eski kayıtlar, id sırasıyla parça parça. Sadece son
+        # çalışmadan sonra arşivlenen satırlar taranır (storage_meta'daki id filigranı)
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value FROM storage_meta WHERE key = 'compacted_archive_id'").fetchone()
+        last_id = int(row[0]) if row else 0
+        while True:
+            with self._transaction() as conn:
+                rows = conn.execute(
+                    "SELECT id, data FROM pending_tweets_archive WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, RETENTION_BATCH_SIZE)).fetchall()
+                updates = []
+                for row_id, data in rows:
+                    record = json.loads(data)
+                    if strip_pending_content(record):
+                        updates.append((json.dumps(record, ensure_ascii=False), row_id))
+                conn.executemany("UPDATE pending_tweets_archive SET data = ? WHERE id = ?", updates)
+                if rows:
+                    last_id = rows[-1][0]
+                    conn.execute(
+                        "INSERT OR REPLACE INTO storage_meta (key, value) VALUES ('compacted_archive_id', ?)",
+                        (str(last_id),))
+            stripped += len(updates)
+            if len(rows) < RETENTION_BATCH_SIZE:
+                break
+        
+        for status, rules in policy.items():
+            if status in PENDING_TERMINAL_STATUSES:
+                table, date_column = "pending_tweets_archive", "archived_date"
+            else:
+                table, date_column = "pending_tweets", "created_date"
+            
+            with self._transaction() as conn:
+                deleted = 0
+                if rules.get("max_age_days") is not None:
+                    cutoff = (now - timedelta(days=rules["max_age_days"])).isoformat()
+                    deleted += conn.execute(
+                        f"DELETE FROM {table} WHERE status = ? AND {date_column} < ?",
+                        (status, cutoff)).rowcount
+                if rules.get("max_entries") is not None:
+                    deleted += conn.execute(
+                        f"DELETE FROM {table} WHERE status = ? AND id NOT IN "
+                        f"(SELECT id FROM {table} WHERE status = ? ORDER BY id DESC LIMIT ?)",
+                        (status, status, max(int(rules["max_entries"]), 0))).rowcount
+                if deleted and table == "pending_tweets":
+                    self._bump_version(conn, PENDING_FILE)
+            removed += deleted
+        
+        return removed, stripped, max(before - self._queue_payload_bytes(), 0)
+    
+    def query_posted_since(self, since_iso):
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT data FROM posted_articles WHERE posted_date > ? ORDER BY id", (since_iso,)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+_storage = None
+_storage_lock = threading.Lock()
+
+def get_storage():
+    """STORAGE_BACKEND ortam değişkenine göre depolama arka ucunu döndür (json | sqlite)"""
+    global _storage
+    if _storage is not None:
+        return _storage
+    with _storage_lock:
+        if _storage is None:
+            backend = os.getenv(STORAGE_BACKEND_ENV, "json").strip().lower()
+            if backend == "sqlite":
+                _storage = SQLiteStorage(os.getenv(STORAGE_DB_ENV, STORAGE_DB_FILE))
+            else:
+                if backend != "json":
+                    print(f"[STORAGE] Bilinmeyen depolama arka ucu '{backend}', JSON kullanılıyor")
+                _storage = JsonFileStorage()
+            print(f"[STORAGE] Depolama arka ucu: {_storage.name}")
+    return _storage
+
+def load_json(path):
+    return get_storage().load(path)
+
+def load_json_versioned(path):
+    """(veri, sürüm) döndür - save_json_if_unchanged ile birlikte kullanılır"""
+    return get_storage().load_versioned(path)
+
+def save_json(path, data):
+    """Veriyi seçili depolama arka ucuna yaz (JSON dosyalarında atomik yeniden adlandırma)"""
+    get_storage().save(path, data)
+
+def save_json_if_unchanged(path, data, expected_version):
+    """Veri okunduğundan beri değişmediyse yaz - değiştiyse False döner"""
+    return get_storage().save_if_unchanged(path, data, expected_version)
+
+def update_json(path, mutator, default=None):
+    """Kilit altında oku-değiştir-yaz
+    
+    mutator mevcut veriyi alır; yeni veriyi döndürür ya da yerinde değiştirip
+    None döndürür. Yazılan veri döner.
+    """
+    return get_storage().update(path, mutator, default)
+
+def new_pending_id():
+    """Onay kuyruğu kaydı için kısa benzersiz id"""
+    return uuid.uuid4().hex[:16]
+
+def _read_pending_archive():
+    """Arşivlenmiş (posted/rejected) kuyruk kayıtları - yarım yazılmış satır atlanır"""
+    records = []
+    if not os.path.exists(PENDING_ARCHIVE_FILE):
+        return records
+    with open(PENDING_ARCHIVE_FILE, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                print(f"[QUEUE] Bozuk arşiv satırı atlandı: {line[:60]}")
+    return records
+
+def _append_pending_archive(records):
+    """Sonuçlanmış kayıtları arşiv günlüğüne ekle (fsync'li)"""
+    if not records:
+        return
+    now = datetime.now().isoformat()
+    lines = []
+    for record in records:
+        record.setdefault("archived_date", now)
+        strip_pending_content(record)
+        lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+    with file_lock(PENDING_ARCHIVE_FILE):
+        with open(PENDING_ARCHIVE_FILE, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+def _partition_pending_queue(tweets):
+    """JSON kuyruğunda sonuçlanmış kayıtları arşive taşı, aktif kuyruğu döndür
+    
+    SQLite arka ucu bölümlemeyi yazarken kendisi yapar.
+    """
+    if get_storage().has_table(PENDING_FILE):
+        return tweets
+    active = [t for t in tweets if t.get("status") not in PENDING_TERMINAL_STATUSES]
+    if len(active) != len(tweets):
+        _append_pending_archive([t for t in tweets if t.get("status") in PENDING_TERMINAL_STATUSES])
+    return active
 
-def fetch_article_content_advanced_fallback(url):
-    """Fallback makale içeriği çekme - BeautifulSoup ile"""
-    try:
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        article_html = requests.get(url, headers=headers, timeout=10).text
-        article_soup = BeautifulSoup(article_html, "html.parser")
-        
-        # Başlığı bul
-        title = ""
-        title_selectors = ["h1", "h1.entry-title", "h1.post-title", ".article-title h1"]
-        for selector in title_selectors:
-            title_elem = article_soup.select_one(selector)
-            if title_elem:
-                title = title_elem.text.strip()
+_pending_archive_counts = {"version": None, "counts": {}}
+
+def _count_pending_archive():
+    """Arşivdeki durum sayıları - dosya değişmedikçe tekrar okunmaz"""
+    version = get_file_version(PENDING_ARCHIVE_FILE)
+    if _pending_archive_counts["version"] != version:
+        counts = {}
+        for record in _read_pending_archive():
+            status = record.get("status", "")
+            counts[status] = counts.get(status, 0) + 1
+        _pending_archive_counts.update(version=version, counts=counts)
+    return dict(_pending_archive_counts["counts"])
+
+def get_pending_tweets(status="pending"):
+    """Belirli durumdaki kuyruk kayıtları
+    
+    Bekleyenler aktif kuyruktan, sonuçlanmışlar arşivden okunur
+    (SQLite'ta durum indeksi üzerinden).
+    """
+    storage = get_storage()
+    if storage.has_table(PENDING_FILE):
+        return storage.query_pending_tweets(status)
+    source = _read_pending_archive() if status in PENDING_TERMINAL_STATUSES else load_json(PENDING_FILE)
+    return [t for t in source if t.get("status") == status]
+
+def count_pending_tweets():
+    """Duruma göre kuyruk sayıları (aktif kuyruk + arşiv): {status: adet}"""
+    storage = get_storage()
+    if storage.has_table(PENDING_FILE):
+        return storage.count_pending_tweets()
+    counts = _count_pending_archive()
+    for tweet in load_json(PENDING_FILE):
+        status = tweet.get("status", "")
+        counts[status] = counts.get(status, 0) + 1
+    return counts
+
+def add_pending_tweet(article, tweet_text, score):
+    """Manuel onay kuyruğuna tweet ekle (SQLite'ta tek satır ekleme)"""
+    pending_tweet = {
+        "id": new_pending_id(),
+        "article": article,
+        "tweet_text": tweet_text,
+        "score": score,
+        "created_date": datetime.now().isoformat(),
+        "status": "pending"
+    }
+    storage = get_storage()
+    if storage.has_table(PENDING_FILE):
+        storage.append(PENDING_FILE, pending_tweet)
+    else:
+        update_json(PENDING_FILE, lambda tweets: _partition_pending_queue(tweets + [pending_tweet]))
+    return pending_tweet
+
+def _same_pending_tweet(a, b):
+    if a.get("id") and b.get("id"):
+        return a["id"] == b["id"]
+    return (a.get("created_date") == b.get("created_date") and
+            a.get("article", {}).get("url") == b.get("article", {}).get("url"))
+
+def update_pending_tweet(pending, **changes):
+    """Kuyruk kaydını güncelle - posted/rejected durumuna geçen kayıt arşive taşınır"""
+    storage = get_storage()
+    if storage.has_table(PENDING_FILE) and pending.get("id"):
+        return storage.transition_pending(pending["id"], changes) is not None
+    
+    found = []
+    
+    def _apply(tweets):
+        for tweet in tweets:
+            if _same_pending_tweet(tweet, pending):
+                tweet.update(changes)
+                found.append(tweet)
                 break
+        return _partition_pending_queue(tweets)
+    
+    update_json(PENDING_FILE, _apply)
+    return bool(found)
+
+def clear_pending_archive():
+    """Onay kuyruğu arşivini boşalt"""
+    storage = get_storage()
+    if storage.has_table(PENDING_FILE):
+        storage.clear_pending_archive()
+        return
+    with file_lock(PENDING_ARCHIVE_FILE):
+        if os.path.exists(PENDING_ARCHIVE_FILE):
+            with open(PENDING_ARCHIVE_FILE, "w", encoding="utf-8") as f:
+                f.flush()
+                os.fsync(f.fileno())
+
+def load_retention_policy(settings=None):
+    """Durum bazında saklama sınırlarını döndür (max_age_days, max_entries)"""
+    if settings is None:
+        settings = load_automation_settings()
+    overrides = settings.get("retention", {}) if isinstance(settings.get("retention"), dict) else {}
+    
+    policy = {}
+    for status, defaults in DEFAULT_RETENTION_POLICY.items():
+        policy[status] = dict(defaults)
+        if isinstance(overrides.get(status), dict):
+            policy[status].update(overrides[status])
+    return policy
+
+def strip_pending_content(record):
+    """Sonuçlanmış kayıttaki makaleden büyük alanları çıkar - değişiklik olduysa True"""
+    article = record.get("article")
+    if not isinstance(article, dict) or not any(field in article for field in RETENTION_STRIPPED_ARTICLE_FIELDS):
+        return False
+    record["article"] = {k: v for k, v in article.items() if k not in RETENTION_STRIPPED_ARTICLE_FIELDS}
+    record["content_stripped"] = True
+    return True
+
+def _retention_date(record):
+    return record.get("archived_date") or record.get("created_date") or record.get("created_at") or ""
+
+def _apply_retention(records, policy, now):
+    """Politikaya göre tutulacak kayıtlar (sıra korunur, en yeniler tutulur)"""
+    by_status = {}
+    for i, record in enumerate(records):
+        by_status.setdefault(record.get("status", ""), []).append(i)
+    
+    keep = set(range(len(records)))
+    for status, indices in by_status.items():
+        rules = policy.get(status) or {}
+        if rules.get("max_age_days") is not None:
+            cutoff = (now - timedelta(days=rules["max_age_days"])).isoformat()
+            keep.difference_update(i for i in indices if _retention_date(records[i]) < cutoff)
+        if rules.get("max_entries") is not None:
+            alive = [i for i in indices if i in keep]
+            overflow = len(alive) - max(int(rules["max_entries"]), 0)
+            if overflow > 0:
+                keep.difference_update(alive[:overflow])
+    return [records[i] for i in sorted(keep)]
+
+def _rewrite_pending_archive(records):
+    """Arşiv günlüğünü atomik olarak yeniden yaz (çağıran kilidi tutar)"""
+    atomic_write_file(PENDING_ARCHIVE_FILE, lambda f: f.writelines(
+        json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def compact_pending_queue(policy=None):
+    """Onay kuyruğuna saklama politikasını uygula
+    
+    Arşivden yaşı/sayısı sınırı aşan kayıtlar silinir, kalanlardan makale
+    içeriği çıkarılır; pending için sınır tanımlıysa aktif kuyruk da kırpılır.
+    Kazanılan bayt ve kayıt sayıları raporlanır.
+    """
+    try:
+        if policy is None:
+            policy = load_retention_policy()
+        now = datetime.now()
+        storage = get_storage()
         
-        # Çoklu selector deneme - daha kapsamlı içerik çekme
-        content_selectors = [
-            "div.article-content p",
-            "div.entry-content p", 
-            "div.post-content p",
-            "article p",
-            "div.content p",
-            ".article-body p"
-        ]
-        
-        content = ""
-        for selector in content_selectors:
-            paragraphs = article_soup.select(selector)
-            if paragraphs:
-                content = "\n".join([p.text.strip() for p in paragraphs if p.text.strip()])
-                if len(content) > 200:  # Yeterli içerik bulundu
-                    break
-        
-        # Eğer hala içerik bulunamadıysa, tüm p etiketlerini dene
-        if not content:
-            all_paragraphs = article_soup.find_all('p')
-            content = "\n".join([p.text.strip() for p in all_paragraphs if len(p.text.strip()) > 50])
-        
-        content = content[:2000]  # İçeriği sınırla
+        if storage.has_table(PENDING_FILE):
+            removed, stripped, reclaimed = storage.compact_pending_queue(policy, now)
+        else:
+            before = _file_size(PENDING_ARCHIVE_FILE) + _file_size(PENDING_FILE)
+            removed = stripped = 0
+            
+            with file_lock(PENDING_ARCHIVE_FILE):
+                records = _read_pending_archive()
+                stripped = sum(1 for record in records if strip_pending_content(record))
+                kept = _apply_retention(records, policy, now)
+                removed = len(records) - len(kept)
+                if removed or stripped:
+                    _rewrite_pending_archive(kept)
+            
+            pending_rules = policy.get("pending") or {}
+            if pending_rules.get("max_age_days") is not None or pending_rules.get("max_entries") is not None:
+                counts = {}
+                
+                def _trim(tweets):
+                    kept_tweets = _apply_retention(tweets, policy, now)
+                    counts["removed"] = len(tweets) - len(kept_tweets)
+                    return kept_tweets
+                
+                update_json(PENDING_FILE, _trim)
+                removed += counts["removed"]
+            
+            reclaimed = max(before - _file_size(PENDING_ARCHIVE_FILE) - _file_size(PENDING_FILE), 0)
         
+        message = (f"✅ {removed} kayıt silindi, {stripped} kayıttan içerik çıkarıldı, "
+                   f"{reclaimed / 1024:.1f} KB kazanıldı")
+        print(f"[RETENTION] {message}")
         return {
-            "title": title or "Başlık bulunamadı",
-            "content": content,
-            "source": "fallback"
+            "success": True,
+            "message": message,
+            "removed_entries": removed,
+            "stripped_entries": stripped,
+            "reclaimed_bytes": reclaimed
         }
-        
+    
     except Exception as e:
-        print(f"Fallback makale içeriği çekme hatası ({url}): {e}")
-        return None
-
-def fetch_article_content_advanced(url, headers):
-    """Geriye dönük uyumluluk için eski fonksiyon"""
-    result = fetch_article_content_advanced_fallback(url)
-    return result.get("content", "") if result else ""
+        print(f"[RETENTION] Sıkıştırma hatası: {e}")
+        return {
+            "success": False,
+            "message": f"❌ Sıkıştırma hatası: {str(e)}",
+            "removed_entries": 0,
+            "stripped_entries": 0,
+            "reclaimed_bytes": 0
+        }
 
-def load_json(path):
-    return json.load(open(path, 'r', encoding='utf-8')) if os.path.exists(path) else []
+_pending_compaction_running = threading.Event()
 
-def save_json(path, data):
-    with open(path, "w", encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+def compact_pending_queue_async():
+    """Kuyruk sıkıştırmasını arka plan thread'inde başlat (aynı anda tek sıkıştırma)"""
+    if _pending_compaction_running.is_set():
+        return
+    _pending_compaction_running.set()
+    
+    def _run():
+        try:
+            compact_pending_queue()
+        finally:
+            _pending_compaction_running.clear()
+    
+    threading.Thread(target=_run, name="pending-queue-compaction", daemon=True).start()
 
 def summarize_article(article_content, api_key):
     """LLM ile gelişmiş makale özetleme"""
@@ -358,46 +3444,185 @@ Seçenekler: Developer, Investor, General
 Cevap:"""
     return gemini_call(prompt, api_key, max_tokens=10).strip()
 
-def gemini_call(prompt, api_key, max_tokens=100):
-    """Google Gemini API çağrısı"""
+def llm_cache_key(model_name, prompt, max_tokens, temperature, response_schema=None):
+    """(model, prompt hash, max_tokens, temperature) için önbellek anahtarı"""
+    key_source = prompt
+    if response_schema is not None:
+        key_source += "\n" + json.dumps(response_schema, sort_keys=True)
+    prompt_hash = hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+    return f"{model_name}|{prompt_hash}|{max_tokens}|{temperature}"
+
+def get_ai_analysis_settings():
+    """Gemini model, sıcaklık ve token ayarlarını döndür (dosya değişmedikçe önbellekten)
+    
+    ai_analysis.model bir Gemini modeli değilse (örn. eski OpenRouter değeri)
+    uyarı verilir ve varsayılan Gemini modeli kullanılır.
+    """
+    try:
+        mtime = os.path.getmtime(MCP_CONFIG_FILE) if os.path.exists(MCP_CONFIG_FILE) else None
+    except OSError:
+        mtime = None
+    
+    cached = _ai_settings_cache["settings"]
+    if cached is not None and _ai_settings_cache["mtime"] == mtime:
+        return cached
+    
+    try:
+        ai_config = load_mcp_config().get("ai_analysis", {})
+    except Exception:
+        ai_config = {}
+    
+    model_name = str(ai_config.get("model", "") or "")
+    if not model_name.startswith("gemini"):
+        if model_name:
+            print(f"[AI] Desteklenmeyen model '{model_name}' (sadece Gemini), {GEMINI_MODEL} kullanılıyor")
+        model_name = GEMINI_MODEL
+    
+    try:
+        temperature = float(ai_config.get("temperature", GEMINI_TEMPERATURE))
+    except (TypeError, ValueError):
+        temperature = GEMINI_TEMPERATURE
+    try:
+        max_tokens = int(ai_config.get("max_tokens", GEMINI_MAX_TOKENS))
+    except (TypeError, ValueError):
+        max_tokens = GEMINI_MAX_TOKENS
+    try:
+        structured_max_tokens = int(ai_config.get("structured_max_tokens", GEMINI_STRUCTURED_MAX_TOKENS))
+    except (TypeError, ValueError):
+        structured_max_tokens = GEMINI_STRUCTURED_MAX_TOKENS
+    
+    try:
+        max_concurrency = max(1, int(ai_config.get("max_concurrency", GEMINI_MAX_CONCURRENCY)))
+    except (TypeError, ValueError):
+        max_concurrency = GEMINI_MAX_CONCURRENCY
+    
+    settings = {
+        "model": model_name,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "structured_max_tokens": structured_max_tokens,
+        "max_concurrency": max_concurrency
+    }
+    _ai_settings_cache["mtime"] = mtime
+    _ai_settings_cache["settings"] = settings
+    return settings
+
+def get_gemini_model(api_key, model_name):
+    """Model için GenerativeModel nesnesini ilk kullanımda oluştur ve yeniden kullan
+    
+    genai.configure süreç genelinde tek bir anahtar tuttuğundan kayıt sadece model
+    adıyla tutulur; anahtar değişince yeniden configure edilir ve eski anahtarla
+    kurulmuş model nesneleri atılır.
+    """
+    global _gemini_configured_key
+    with _gemini_lock:
+        if _gemini_configured_key != api_key:
+            import google.generativeai as genai
+            
+            genai.configure(api_key=api_key)
+            _gemini_configured_key = api_key
+            _gemini_models.clear()
+        
+        model = _gemini_models.get(model_name)
+        if model is None:
+            import google.generativeai as genai
+            
+            model = genai.GenerativeModel(model_name)
+            _gemini_models[model_name] = model
+        return model
+
+def get_gemini_semaphore():
+    """Tüm thread'ler için ortak Gemini eşzamanlılık sınırlayıcısı
+    
+    ai_analysis.max_concurrency değişince yeni boyutla yeniden kurulur; eski
+    semaphore'u tutan çağrılar onu serbest bırakarak biter.
+    """
+    global _gemini_semaphore, _gemini_semaphore_size
+    size = get_ai_analysis_settings()["max_concurrency"]
+    if _gemini_semaphore is None or _gemini_semaphore_size != size:
+        with _gemini_lock:
+            if _gemini_semaphore is None or _gemini_semaphore_size != size:
+                _gemini_semaphore = threading.BoundedSemaphore(size)
+                _gemini_semaphore_size = size
+    return _gemini_semaphore
+
+def gemini_call(prompt, api_key, max_tokens=None, use_cache=True, response_schema=None, cache_info=None):
+    """Google Gemini API çağrısı - aynı istek için önbellekten yanıt döner
+    
+    response_schema verilirse yanıt bu şemaya uygun JSON olarak istenir.
+    max_tokens verilmezse mcp_config.json'daki ai_analysis.max_tokens kullanılır.
+    Tweet metni gibi her seferinde yeni üretilmesi gereken çağrılar use_cache=False
+    ile yapılır. cache_info (dict) verilirse "hit" alanına yanıtın önbellekten
+    gelip gelmediği yazılır.
+    """
+    if cache_info is not None:
+        cache_info["hit"] = False
     if not api_key:
         print("Gemini API anahtarı bulunamadı")
         return "API anahtarı eksik"
     
+    ai_settings = get_ai_analysis_settings()
+    model_name = ai_settings["model"]
+    temperature = ai_settings["temperature"]
+    if max_tokens is None:
+        max_tokens = ai_settings["max_tokens"]
+    cache_key = llm_cache_key(model_name, prompt, max_tokens, temperature, response_schema)
+    
+    if use_cache:
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            print(f"[DEBUG] Gemini yanıtı önbellekten alındı ({len(cached)} karakter)")
+            if cache_info is not None:
+                cache_info["hit"] = True
+            return cached
+    
     try:
         import google.generativeai as genai
         
-        # API anahtarını yapılandır
-        genai.configure(api_key=api_key)
+        # Paylaşılan model nesnesini al
+        model = get_gemini_model(api_key, model_name)
         
-        # Modeli oluştur
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        
-        print(f"[DEBUG] Gemini API çağrısı yapılıyor... Model: gemini-2.0-flash")
+        print(f"[DEBUG] Gemini API çağrısı yapılıyor... Model: {model_name}")
         
         # Generation config
-        generation_config = genai.types.GenerationConfig(
-            max_output_tokens=max_tokens,
-            temperature=0.7,
-        )
+        config_kwargs = {
+            "max_output_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        if response_schema is not None:
+            config_kwargs["response_mime_type"] = "application/json"
+            config_kwargs["response_schema"] = response_schema
+        generation_config = genai.types.GenerationConfig(**config_kwargs)
+        
+        # Dakikalık bütçe - sadece gerekli süre kadar bekle
+        if get_rate_limiter("gemini").acquire() is None:
+            print("[DEBUG] Gemini rate limit bütçesi aşıldı, çağrı atlanıyor")
+            return "API hatası"
         
-        # API çağrısı
-        response = model.generate_content(
-            prompt,
-            generation_config=generation_config
-        )
+        # API çağrısı - global eşzamanlılık sınırı içinde
+        with get_gemini_semaphore():
+            response = model.generate_content(
+                prompt,
+                generation_config=generation_config
+            )
         
         print(f"[DEBUG] Gemini API Yanıtı alındı")
         
         if response.text:
             content = response.text.strip()
             print(f"[DEBUG] İçerik alındı: {len(content)} karakter")
+            # Sadece başarılı yanıtları önbelleğe al
+            if use_cache:
+                llm_cache.set(cache_key, content)
             return content
         else:
             print("[DEBUG] Gemini API yanıtında metin bulunamadı")
             return "API hatası"
             
     except Exception as e:
+        # 429 / ResourceExhausted - bütçeyi geçici olarak kilitle
+        if "429" in str(e) or type(e).__name__ == "ResourceExhausted":
+            get_rate_limiter("gemini").block_for(GEMINI_RATE_LIMIT_BACKOFF)
         print(f"[DEBUG] Gemini API çağrı hatası: {e}")
         return "API hatası"
 
@@ -505,78 +3730,142 @@ def generate_smart_emojis(title, content):
     # En fazla 3 emoji seç
     return emojis[:3]
 
-def generate_comprehensive_analysis(article_data, api_key):
-    """Makale için kapsamlı AI analizi - Ayrı ayrı çağrılar ile güvenilir sonuç"""
-    title = article_data.get("title", "")
-    content = article_data.get("content", "")
+# Tek çağrılık yapılandırılmış analiz için JSON şeması
+STRUCTURED_ANALYSIS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "innovation": {"type": "STRING"},
+        "companies": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "impact_level": {"type": "INTEGER"},
+        "audience": {"type": "STRING", "enum": ["Developer", "Investor", "General"]},
+        "hashtags": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "emojis": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "score": {"type": "INTEGER"},
+        "tweet_text": {"type": "STRING"}
+    },
+    "required": ["innovation", "companies", "impact_level", "audience", "hashtags", "emojis", "score", "tweet_text"]
+}
+
+EMOJI_PATTERN = re.compile(r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F900-\U0001F9FF\U0001F1E0-\U0001F1FF\U00002702-\U000027B0\U000024C2-\U0001F251]+')
+
+def is_structured_analysis_enabled():
+    """Tek çağrılık yapılandırılmış analiz modu açık mı (mcp_config.json > ai_analysis)"""
+    try:
+        return bool(load_mcp_config().get("ai_analysis", {}).get("structured_output", True))
+    except Exception:
+        return True
+
+def _parse_score(text):
+    """LLM yanıtından 1-10 arası skor çıkar, geçersizse None"""
+    try:
+        value = int(str(text).strip().split()[0])
+    except (ValueError, IndexError):
+        return None
+    return value if 1 <= value <= 10 else None
+
+def _extract_hashtags(text):
+    """Metinden en fazla 3 hashtag çıkar"""
+    clean_text = text.replace("Hashtag'ler:", "").replace("Hashtag'ler", "").strip()
     
-    print(f"🔍 Kapsamlı AI analizi başlatılıyor...")
+    # Virgül veya boşlukla ayrılmış hashtag'leri bul
+    hashtag_matches = re.findall(r'#\w+', clean_text)
     
-    analysis_result = {
-        "innovation": "",
-        "companies": [],
-        "impact_level": 5,
-        "audience": "General",
-        "hashtags": [],
-        "emojis": [],
-        "tweet_text": ""
-    }
+    # Eğer # ile başlayan bulunamazsa, kelimeleri hashtag yap
+    if not hashtag_matches:
+        ai_hashtags = []
+        words = re.findall(r'\b[A-Za-z][A-Za-z0-9]*\b', clean_text)
+        for word in words[:3]:
+            if len(word) > 2:
+                ai_hashtags.append(f"#{word}")
+        return ai_hashtags
+    return hashtag_matches[:3]
+
+def _extract_emojis(text):
+    """Metinden en fazla 3 tekil emoji çıkar"""
+    ai_emojis = []
+    for emoji in EMOJI_PATTERN.findall(text):
+        for single_emoji in emoji:
+            if single_emoji not in ai_emojis and len(ai_emojis) < 3:
+                ai_emojis.append(single_emoji)
+    return ai_emojis
+
+def _combine_hashtags(ai_hashtags, title, content):
+    """AI ve akıllı hashtag'leri birleştir (AI öncelikli, 3 hashtag)"""
+    combined_hashtags = []
+    for tag in ai_hashtags[:3]:  # AI'den en fazla 3
+        if tag not in combined_hashtags:
+            combined_hashtags.append(tag)
     
-    try:
-        # 1. Ana yenilik/buluş analizi
-        innovation_prompt = f"""Bu AI/teknoloji haberindeki ana yenilik veya buluşu kısaca açıkla (maksimum 50 kelime):
+    # Eksik varsa akıllı sistemden tamamla
+    for tag in generate_smart_hashtags(title, content):
+        if tag not in combined_hashtags and len(combined_hashtags) < 3:
+            combined_hashtags.append(tag)
+    
+    return combined_hashtags[:3]
+
+def _combine_emojis(ai_emojis, title, content):
+    """AI ve akıllı emoji'leri birleştir (AI'den en fazla 2)"""
+    combined_emojis = ai_emojis[:2]
+    for emoji in generate_smart_emojis(title, content):
+        if emoji not in combined_emojis and len(combined_emojis) < 3:
+            combined_emojis.append(emoji)
+    return combined_emojis[:3]
+
+def analyze_innovation(title, content, api_key):
+    """Ana yenilik/buluş analizi"""
+    innovation_prompt = f"""Bu AI/teknoloji haberindeki ana yenilik veya buluşu kısaca açıkla (maksimum 50 kelime):
 
 Başlık: {title}
 İçerik: {content[:800]}
 
 Ana yenilik:"""
-        
-        innovation = gemini_call(innovation_prompt, api_key, max_tokens=80)
-        analysis_result["innovation"] = innovation.strip() if innovation != "API hatası" else "Teknoloji gelişimi"
-        
-        # 2. Şirket analizi
-        company_prompt = f"""Bu haberde bahsedilen ana şirketleri listele (maksimum 3 şirket, virgülle ayır):
+    
+    innovation = gemini_call(innovation_prompt, api_key, max_tokens=80)
+    return innovation.strip() if innovation != "API hatası" else "Teknoloji gelişimi"
+
+def analyze_companies(title, content, api_key):
+    """Haberde geçen ana şirketler (en fazla 3) - API hatasında None"""
+    company_prompt = f"""Bu haberde bahsedilen ana şirketleri listele (maksimum 3 şirket, virgülle ayır):
 
 Başlık: {title}
 İçerik: {content[:600]}
 
 Şirketler:"""
-        
-        companies_text = gemini_call(company_prompt, api_key, max_tokens=50)
-        if companies_text != "API hatası":
-            companies = [c.strip() for c in companies_text.split(",") if c.strip()]
-            analysis_result["companies"] = companies[:3]
-        
-        # 3. Etki seviyesi analizi
-        impact_prompt = f"""Bu haberin teknoloji sektöründeki etkisini 1-10 arasında değerlendir (sadece sayı):
+    
+    companies_text = gemini_call(company_prompt, api_key, max_tokens=50)
+    if companies_text == "API hatası":
+        return None
+    companies = [c.strip() for c in companies_text.split(",") if c.strip()]
+    return companies[:3]
+
+def analyze_impact(title, content, api_key):
+    """Etki seviyesi analizi (1-10) - geçersizse None"""
+    impact_prompt = f"""Bu haberin teknoloji sektöründeki etkisini 1-10 arasında değerlendir (sadece sayı):
 
 Başlık: {title}
 İçerik: {content[:600]}
 
 Etki skoru (1-10):"""
-        
-        impact_text = gemini_call(impact_prompt, api_key, max_tokens=10)
-        try:
-            impact_level = int(impact_text.strip().split()[0])
-            if 1 <= impact_level <= 10:
-                analysis_result["impact_level"] = impact_level
-        except:
-            analysis_result["impact_level"] = 5
-        
-        # 4. Hedef kitle analizi
-        audience_prompt = f"""Bu haberin hedef kitlesini belirle (Developer/Investor/General):
+    
+    return _parse_score(gemini_call(impact_prompt, api_key, max_tokens=10))
+
+def analyze_audience(title, content, api_key):
+    """Hedef kitle analizi - geçersizse None"""
+    audience_prompt = f"""Bu haberin hedef kitlesini belirle (Developer/Investor/General):
 
 Başlık: {title}
 İçerik: {content[:500]}
 
 Hedef kitle:"""
-        
-        audience = gemini_call(audience_prompt, api_key, max_tokens=15)
-        if audience != "API hatası" and audience.strip() in ["Developer", "Investor", "General"]:
-            analysis_result["audience"] = audience.strip()
-        
-        # 5. Hashtag analizi - AI + akıllı sistem kombinasyonu
-        hashtag_prompt = f"""Bu haber için en alakalı 3 hashtag öner. Sadece hashtag'leri yaz, virgülle ayır:
+    
+    audience = gemini_call(audience_prompt, api_key, max_tokens=15)
+    if audience != "API hatası" and audience.strip() in ["Developer", "Investor", "General"]:
+        return audience.strip()
+    return None
+
+def analyze_hashtags(title, content, api_key):
+    """AI hashtag önerileri (ham, birleştirilmemiş)"""
+    hashtag_prompt = f"""Bu haber için en alakalı 3 hashtag öner. Sadece hashtag'leri yaz, virgülle ayır:
 
 Başlık: {title}
 İçerik: {content[:800]}
@@ -584,74 +3873,240 @@ Başlık: {title}
 Örnek: #AI, #Technology, #Innovation
 
 Hashtag'ler:"""
-        
-        ai_hashtags_text = gemini_call(hashtag_prompt, api_key, max_tokens=50)
-        ai_hashtags = []
-        
-        if ai_hashtags_text != "API hatası":
-            # AI'den gelen hashtag'leri temizle ve parse et
-            clean_text = ai_hashtags_text.replace("Hashtag'ler:", "").replace("Hashtag'ler", "").strip()
-            
-            # Virgül veya boşlukla ayrılmış hashtag'leri bul
-            import re
-            hashtag_matches = re.findall(r'#\w+', clean_text)
-            
-            # Eğer # ile başlayan bulunamazsa, kelimeleri hashtag yap
-            if not hashtag_matches:
-                words = re.findall(r'\b[A-Za-z][A-Za-z0-9]*\b', clean_text)
-                for word in words[:3]:
-                    if len(word) > 2:
-                        ai_hashtags.append(f"#{word}")
-            else:
-                ai_hashtags = hashtag_matches[:3]
-        
-        # Akıllı hashtag sistemi ile birleştir
-        smart_hashtags = generate_smart_hashtags(title, content)
-        
-        # AI ve akıllı hashtag'leri birleştir (AI öncelikli, 3 hashtag)
-        combined_hashtags = []
-        for tag in ai_hashtags[:3]:  # AI'den en fazla 3
-            if tag not in combined_hashtags:
-                combined_hashtags.append(tag)
-        
-        # Eksik varsa akıllı sistemden tamamla
-        for tag in smart_hashtags:
-            if tag not in combined_hashtags and len(combined_hashtags) < 3:
-                combined_hashtags.append(tag)
-        
-        analysis_result["hashtags"] = combined_hashtags[:3]
-        
-        # 6. Emoji analizi
-        emoji_prompt = f"""Bu haber için en uygun 3 emoji öner (sadece emojiler, boşluksuz):
+    
+    ai_hashtags_text = gemini_call(hashtag_prompt, api_key, max_tokens=50)
+    if ai_hashtags_text == "API hatası":
+        return []
+    return _extract_hashtags(ai_hashtags_text)
+
+def analyze_emojis(title, content, api_key):
+    """AI emoji önerileri (ham, birleştirilmemiş)"""
+    emoji_prompt = f"""Bu haber için en uygun 3 emoji öner (sadece emojiler, boşluksuz):
 
 Başlık: {title}
 İçerik: {content[:500]}
 
 Emojiler:"""
+    
+    ai_emojis_text = gemini_call(emoji_prompt, api_key, max_tokens=20)
+    if ai_emojis_text == "API hatası":
+        return []
+    return _extract_emojis(ai_emojis_text)
+
+def _take_structured_tweet_draft(prompt, tweet_text=None):
+    """Yapılandırılmış yanıttaki tweet metnini tek kullanımlık taslak olarak sakla/al
+    
+    tweet_text verilirse taslak saklanır; verilmezse varsa alınır ve silinir.
+    """
+    key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    with _structured_tweet_drafts_lock:
+        if tweet_text is None:
+            return _structured_tweet_drafts.pop(key, None)
+        _structured_tweet_drafts[key] = tweet_text
+        while len(_structured_tweet_drafts) > STRUCTURED_TWEET_DRAFT_MAX_ENTRIES:
+            del _structured_tweet_drafts[next(iter(_structured_tweet_drafts))]
+        return tweet_text
+
+def generate_structured_analysis(article_data, api_key, consume_tweet=False):
+    """Tek Gemini çağrısı ile tüm analiz alanları, skor ve tweet metni
+    
+    Yanıt JSON şemasıyla istenir ve alan alan doğrulanır. Geçersiz veya eksik
+    alanlar sonuçta yer almaz; çağıran taraf sadece onlar için ayrı prompt kullanır.
+    
+    Analiz önbelleğe alınır ama tweet metni tek kullanımlıktır: sadece
+    consume_tweet=True ise ve yanıt yeni üretildiyse (ya da aynı süreçte skor
+    için yapılan yeni çağrıdan kalan taslak varsa) sonuçta yer alır. Böylece
+    tweet yeniden oluşturulduğunda önbellekteki aynı metin dönmez.
+    """
+    title = article_data.get("title", "")
+    content = article_data.get("content", "")
+    
+    prompt = f"""Analyze this AI/technology news article and return a single JSON object.
+
+Title: {title}
+Content: {content[:1500]}
+
+Fields:
+- innovation: the main innovation or breakthrough, in Turkish, maximum 50 words
+- companies: main companies mentioned (maximum 3)
+- impact_level: impact on the tech industry, integer 1-10
+- audience: one of Developer, Investor, General
+- hashtags: 3 most relevant hashtags, each starting with #
+- emojis: 3 fitting emojis, one emoji per item
+- score: importance of the news, integer 1-10 (novelty, industry impact, importance for developers, general interest)
+- tweet_text: compelling English tweet, maximum 200 characters, focus on WHAT changed and WHY it matters, active voice, no hashtags, emojis, URLs or impact ratings"""
+    
+    cache_info = {}
+    raw = gemini_call(
+        prompt, api_key,
+        max_tokens=get_ai_analysis_settings()["structured_max_tokens"],
+        response_schema=STRUCTURED_ANALYSIS_SCHEMA,
+        cache_info=cache_info
+    )
+    if raw in ("API hatası", "API anahtarı eksik"):
+        return {}
+    
+    try:
+        # Olası ```json bloklarını temizle
+        cleaned = raw.strip()
+        if cleaned.startswith("```"):
+            cleaned = cleaned.strip("`")
+            if cleaned.lower().startswith("json"):
+                cleaned = cleaned[4:]
+        data = json.loads(cleaned)
+    except (ValueError, TypeError) as e:
+        print(f"⚠️ Yapılandırılmış analiz JSON hatası: {e}")
+        return {}
+    
+    if not isinstance(data, dict):
+        return {}
+    
+    result = {}
+    
+    innovation = data.get("innovation")
+    if isinstance(innovation, str) and innovation.strip():
+        result["innovation"] = innovation.strip()
+    
+    companies = data.get("companies")
+    if isinstance(companies, list):
+        result["companies"] = [str(c).strip() for c in companies if str(c).strip()][:3]
+    
+    for field in ("impact_level", "score"):
+        value = _parse_score(data.get(field))
+        if value is not None:
+            result[field] = value
+    
+    audience = data.get("audience")
+    if isinstance(audience, str) and audience.strip() in ["Developer", "Investor", "General"]:
+        result["audience"] = audience.strip()
+    
+    hashtags = data.get("hashtags")
+    if isinstance(hashtags, list):
+        parsed_hashtags = _extract_hashtags(" ".join(str(h) for h in hashtags))
+        if parsed_hashtags:
+            result["hashtags"] = parsed_hashtags
+    
+    emojis = data.get("emojis")
+    if isinstance(emojis, list):
+        parsed_emojis = _extract_emojis("".join(str(e) for e in emojis))
+        if parsed_emojis:
+            result["emojis"] = parsed_emojis
+    
+    tweet_text = data.get("tweet_text")
+    if not isinstance(tweet_text, str) or len(tweet_text.strip()) <= 10:
+        tweet_text = None
+    elif cache_info.get("hit"):
+        tweet_text = _take_structured_tweet_draft(prompt) if consume_tweet else None
+    elif not consume_tweet:
+        _take_structured_tweet_draft(prompt, tweet_text.strip())
+        tweet_text = None
+    if tweet_text:
+        result["tweet_text"] = tweet_text.strip()
+    
+    missing = [f for f in STRUCTURED_ANALYSIS_SCHEMA["required"] if f not in result and f != "tweet_text"]
+    if missing:
+        print(f"⚠️ Yapılandırılmış analizde eksik alanlar: {', '.join(missing)}")
+    
+    return result
+
+def score_article_data(article_data, api_key):
+    """Makale skoru - yapılandırılmış modda tek çağrılık analizden alınır"""
+    if is_structured_analysis_enabled():
+        score = generate_structured_analysis(article_data, api_key).get("score")
+        if score is not None:
+            return score
+    return score_article(article_data.get("content", ""), api_key)
+
+def is_parallel_analysis_enabled():
+    """Bağımsız analiz prompt'ları paralel mi çalışsın (mcp_config.json > ai_analysis)"""
+    try:
+        return bool(load_mcp_config().get("ai_analysis", {}).get("parallel_analysis", True))
+    except Exception:
+        return True
+
+def run_analysis_tasks(tasks):
+    """{alan: (fonksiyon, argümanlar)} görevlerini çalıştır ve {alan: sonuç} döndür
+    
+    Paralel modda görevler thread havuzunda eşzamanlı çalışır; Gemini'ye giden
+    gerçek istek sayısı gemini_call içindeki global semaphore ile sınırlıdır.
+    Hata veren görevin sonucu None olur.
+    """
+    def _run(field):
+        func, args = tasks[field]
+        try:
+            return func(*args)
+        except Exception as e:
+            print(f"❌ Analiz görevi hatası ({field}): {e}")
+            return None
+    
+    fields = list(tasks)
+    if len(fields) <= 1 or not is_parallel_analysis_enabled():
+        return {field: _run(field) for field in fields}
+    
+    with ThreadPoolExecutor(max_workers=len(fields), thread_name_prefix="ai-analysis") as executor:
+        return dict(zip(fields, executor.map(_run, fields)))
+
+def generate_comprehensive_analysis(article_data, api_key):
+    """Makale için kapsamlı AI analizi
+    
+    Yapılandırılmış modda tek çağrı yapılır, sadece eksik alanlar için ayrı
+    prompt'lara düşülür. Aksi halde her alan ayrı çağrı ile analiz edilir.
+    """
+    title = article_data.get("title", "")
+    content = article_data.get("content", "")
+    
+    print(f"🔍 Kapsamlı AI analizi başlatılıyor...")
+    
+    analysis_result = {
+        "innovation": "",
+        "companies": [],
+        "impact_level": 5,
+        "audience": "General",
+        "hashtags": [],
+        "emojis": [],
+        "tweet_text": ""
+    }
+    
+    try:
+        structured = {}
+        if is_structured_analysis_enabled():
+            structured = generate_structured_analysis(article_data, api_key, consume_tweet=True)
+            if structured.get("tweet_text"):
+                analysis_result["tweet_text"] = structured["tweet_text"]
+            if "score" in structured:
+                analysis_result["score"] = structured["score"]
+        
+        # Yapılandırılmış yanıtta eksik kalan alanlar için bağımsız prompt'lar
+        field_analyzers = {
+            "innovation": analyze_innovation,    # 1. Ana yenilik/buluş analizi
+            "companies": analyze_companies,      # 2. Şirket analizi
+            "impact_level": analyze_impact,      # 3. Etki seviyesi analizi
+            "audience": analyze_audience,        # 4. Hedef kitle analizi
+            "hashtags": analyze_hashtags,        # 5. Hashtag analizi
+            "emojis": analyze_emojis             # 6. Emoji analizi
+        }
+        tasks = {
+            field: (analyzer, (title, content, api_key))
+            for field, analyzer in field_analyzers.items()
+            if structured.get(field) is None
+        }
+        fields = dict(structured)
+        fields.update(run_analysis_tasks(tasks))
         
-        ai_emojis_text = gemini_call(emoji_prompt, api_key, max_tokens=20)
-        ai_emojis = []
+        analysis_result["innovation"] = fields.get("innovation") or "Teknoloji gelişimi"
         
-        if ai_emojis_text != "API hatası":
-            # Emoji'leri çıkar
-            import re
-            emoji_pattern = re.compile(r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF\U00002702-\U000027B0\U000024C2-\U0001F251]+')
-            found_emojis = emoji_pattern.findall(ai_emojis_text)
-            for emoji in found_emojis:
-                for single_emoji in emoji:
-                    if single_emoji not in ai_emojis and len(ai_emojis) < 3:
-                        ai_emojis.append(single_emoji)
-        
-        # Akıllı emoji sistemi ile birleştir
-        smart_emojis = generate_smart_emojis(title, content)
+        if fields.get("companies") is not None:
+            analysis_result["companies"] = fields["companies"][:3]
         
-        # AI ve akıllı emoji'leri birleştir
-        combined_emojis = ai_emojis[:2]  # AI'den en fazla 2
-        for emoji in smart_emojis:
-            if emoji not in combined_emojis and len(combined_emojis) < 3:
-                combined_emojis.append(emoji)
+        impact_level = fields.get("impact_level")
+        analysis_result["impact_level"] = impact_level if impact_level is not None else 5
         
-        analysis_result["emojis"] = combined_emojis[:3]
+        if fields.get("audience"):
+            analysis_result["audience"] = fields["audience"]
+        
+        # Hashtag ve emojiler - AI + akıllı sistem kombinasyonu
+        analysis_result["hashtags"] = _combine_hashtags(fields.get("hashtags") or [], title, content)
+        analysis_result["emojis"] = _combine_emojis(fields.get("emojis") or [], title, content)
         
         print(f"✅ Kapsamlı analiz tamamlandı:")
         print(f"🔬 Yenilik: {analysis_result['innovation'][:50]}...")
@@ -720,7 +4175,8 @@ Examples of good style:
 
 Tweet text:"""
         
-        tweet_text = gemini_call(tweet_prompt, api_key, max_tokens=80)
+        # Yapılandırılmış analiz tweet metnini zaten ürettiyse ayrı çağrı yapma
+        tweet_text = analysis.get("tweet_text") or gemini_call(tweet_prompt, api_key, max_tokens=80, use_cache=False)
         
         if tweet_text == "API hatası" or not tweet_text.strip():
             # Fallback tweet metni - daha anlamlı
@@ -893,7 +4349,7 @@ Examples of good style:
 Tweet text (max {MAX_CONTENT_LENGTH} chars):"""
 
     try:
-        tweet_text = gemini_call(prompt, api_key, max_tokens=150)
+        tweet_text = gemini_call(prompt, api_key, max_tokens=150, use_cache=False)
         
         if tweet_text and len(tweet_text.strip()) > 10:
             # Tweet metnini temizle
@@ -1140,7 +4596,10 @@ def setup_twitter_api():
             consumer_secret=api_secret,
             access_token=access_token,
             access_token_secret=access_token_secret,
-            wait_on_rate_limit=True
+            # Rate limit bekleme işi paylaşılan token bucket'ta - thread'i 15 dk kilitleme
+            wait_on_rate_limit=False,
+            # Ham yanıt: başarılı isteklerde de x-rate-limit-* başlıkları okunabilsin
+            return_type=requests.Response
         )
         
         return client
@@ -1178,10 +4637,33 @@ def post_tweet(tweet_text, article_title=""):
         
         print(f"[DEBUG] Final tweet uzunluğu: {len(tweet_text)} karakter")
         
-        response = client.create_tweet(text=tweet_text)
+        # Twitter create_tweet bütçesi
+        twitter_limiter = get_rate_limiter("twitter")
+        if twitter_limiter.acquire() is None:
+            return {"success": False, "error": "Twitter rate limit bütçesi doldu, daha sonra tekrar deneyin"}
+        
+        try:
+            response = client.create_tweet(text=tweet_text)
+        except tweepy.TooManyRequests as rate_error:
+            headers = getattr(getattr(rate_error, "response", None), "headers", {}) or {}
+            twitter_limiter.update_from_headers(
+                headers.get("x-rate-limit-remaining", 0),
+                headers.get("x-rate-limit-reset")
+            )
+            return {"success": False, "error": f"Twitter rate limit aşıldı: {rate_error}"}
+        
+        # Başarılı yanıttaki kalan limit ile bucket'ı güncelle
+        twitter_limiter.update_from_headers(
+            response.headers.get("x-rate-limit-remaining"),
+            response.headers.get("x-rate-limit-reset")
+        )
+        try:
+            tweet_data = response.json().get("data") or {}
+        except ValueError:
+            tweet_data = {}
         
-        if response.data:
-            tweet_id = response.data['id']
+        if tweet_data.get("id"):
+            tweet_id = tweet_data['id']
             tweet_url = f"https://twitter.com/user/status/{tweet_id}"
             
             # Telegram bildirimi gönder
@@ -1215,7 +4697,8 @@ def post_tweet(tweet_text, article_title=""):
 def mark_article_as_posted(article_data, tweet_result):
     """Makaleyi paylaşıldı olarak işaretle"""
     try:
-        posted_articles = load_json(HISTORY_FILE)
+        # Dışarıdan yapılmış değişiklikleri yazmadan önce indekse al
+        posted_index.sync()
         
         posted_article = {
             "title": article_data.get("title", ""),
@@ -1223,41 +4706,116 @@ def mark_article_as_posted(article_data, tweet_result):
             "hash": article_data.get("hash", ""),
             "posted_date": datetime.now().isoformat(),
             "tweet_id": tweet_result.get("tweet_id", ""),
-            "tweet_url": tweet_result.get("url", "")
+            "tweet_url": tweet_result.get("url", ""),
+            "canonical_url": article_data.get("canonical_url", ""),
+            "simhash": article_data.get("simhash") or
+                       f"{compute_simhash(article_data.get('title', ''), article_data.get('content', '')):016x}"
         }
         
-        posted_articles.append(posted_article)
-        save_json(HISTORY_FILE, posted_articles)
+        # Önce tekrar indeksi: URL/hash zaten kayıtlıysa geçmişe ikinci satır yazılmaz
+        if not posted_index.add(posted_article["url"], posted_article["hash"], posted_article["posted_date"],
+                                posted_article["simhash"], canonical_url=posted_article["canonical_url"]):
+            print(f"[INDEX] Makale zaten paylaşılmış olarak kayıtlı: {posted_article['title'][:50]}...")
+            return True
+        
+        # Tüm dosyayı yeniden yazmak yerine günlüğe tek satır ekle
+        append_posted_article(posted_article)
+        posted_index.mark_source_synced()
         
         return True
     except Exception as e:
         print(f"Makale kaydetme hatası: {e}")
         return False
 
+def get_history_retention_settings(settings=None):
+    """Paylaşım geçmişi saklama ayarları (gün sayısı, süresi dolan hash'ler indekste kalsın mı)"""
+    if settings is None:
+        settings = load_automation_settings()
+    try:
+        retention_days = max(int(settings.get("history_retention_days", DEFAULT_HISTORY_RETENTION_DAYS)), 1)
+    except (TypeError, ValueError):
+        retention_days = DEFAULT_HISTORY_RETENTION_DAYS
+    return {
+        "retention_days": retention_days,
+        "archive_expired_hashes": bool(settings.get("archive_expired_hashes", True))
+    }
+
+_posted_snapshot_oldest = {"version": None, "oldest": None}
+
+def _oldest_posted_date():
+    """JSON geçmişindeki en eski posted_date (yoksa None)
+    
+    Anlık görüntünün en eski tarihi dosya sürümüne göre önbellekte tutulur, sadece
+    dosya değişince yeniden okunur; günlükten sadece ilk (en eski) satır okunur.
+    """
+    version = get_file_version(HISTORY_FILE)
+    if _posted_snapshot_oldest["version"] != version:
+        with _posted_journal_lock:
+            snapshot = JsonFileStorage().load(HISTORY_FILE)
+        dates = [article.get("posted_date") or "" for article in snapshot if isinstance(article, dict)]
+        _posted_snapshot_oldest.update(version=version, oldest=min(dates) if dates else None)
+    
+    dates = [] if _posted_snapshot_oldest["oldest"] is None else [_posted_snapshot_oldest["oldest"]]
+    try:
+        with open(POSTED_JOURNAL_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    dates.append(json.loads(line).get("posted_date") or "")
+                    break
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return min(dates) if dates else None
+
 def check_duplicate_articles():
-    """Tekrarlanan makaleleri temizle"""
+    """Süresi dolan paylaşım kayıtlarını temizle
+    
+    Süresi dolan kayıt olup olmadığına en eski posted_date ile bakılır (JSON'da
+    dosya değişmedikçe geçmiş tekrar okunmaz); süresi dolan yoksa hiçbir şey
+    okunmaz ve yazılmaz.
+    """
     try:
-        posted_articles = load_json(HISTORY_FILE)
-        
-        # Son 30 günlük makaleleri tut
-        cutoff_date = datetime.now() - timedelta(days=30)
-        
-        filtered_articles = []
-        seen_hashes = set()
-        
-        for article in posted_articles:
-            try:
-                posted_date = datetime.fromisoformat(article.get("posted_date", ""))
-                article_hash = article.get("hash", "")
+        retention = get_history_retention_settings()
+        cutoff_iso = (datetime.now() - timedelta(days=retention["retention_days"])).isoformat()
+        storage = get_storage()
+        removed_count = 0
+        
+        if storage.has_table(HISTORY_FILE):
+            if storage.has_posted_before(cutoff_iso):
+                # Silinecek kayıtlar uzun süreli tekrar kontrolü için önce indekse alınır
+                posted_index.sync()
+                removed_count = storage.delete_posted_before(cutoff_iso)
+                posted_index.mark_source_synced()
+        elif (_oldest_posted_date() or cutoff_iso) < cutoff_iso:
+            posted_index.sync()
+            
+            with _posted_journal_lock, file_lock(POSTED_JOURNAL_FILE):
+                posted_articles = load_posted_articles()
                 
-                if posted_date > cutoff_date and article_hash not in seen_hashes:
-                    filtered_articles.append(article)
+                # Yeniden yazarken tarih sırasını ve hash tekilliğini de düzelt; tekrar
+                # kontrolleri posted_index'in URL/hash kümeleri üzerinden yapılır
+                kept_articles = []
+                seen_hashes = set()
+                for article in sorted(posted_articles, key=lambda a: a.get("posted_date") or ""):
+                    article_hash = article.get("hash", "")
+                    if (article.get("posted_date") or "") < cutoff_iso:
+                        continue
+                    if article_hash and article_hash in seen_hashes:
+                        continue
                     seen_hashes.add(article_hash)
-            except:
-                continue
+                    kept_articles.append(article)
+                
+                rewrite_posted_articles(kept_articles)
+                removed_count = len(posted_articles) - len(kept_articles)
+            
+            posted_index.mark_source_synced()
         
-        save_json(HISTORY_FILE, filtered_articles)
-        return len(posted_articles) - len(filtered_articles)
+        # Varsayılan olarak indeks süresi dolan hash'leri saklar (uzun süreli tekrar kontrolü)
+        if removed_count and not retention["archive_expired_hashes"]:
+            posted_index.expire_before(cutoff_iso)
+        
+        return removed_count
         
     except Exception as e:
         print(f"Tekrar temizleme hatası: {e}")
@@ -1291,22 +4849,11 @@ def create_pdf(summaries, filename="daily_digest.pdf"):
 def get_posted_articles_summary():
     """Paylaşılmış makalelerin özetini döndür"""
     try:
-        posted_articles = load_json(HISTORY_FILE)
-        
         # Son 7 günlük makaleleri al
-        cutoff_date = datetime.now() - timedelta(days=7)
-        recent_articles = []
-        
-        for article in posted_articles:
-            try:
-                posted_date = datetime.fromisoformat(article.get("posted_date", ""))
-                if posted_date > cutoff_date:
-                    recent_articles.append(article)
-            except:
-                continue
+        recent_articles = get_recent_posted_articles(days=7)
         
         return {
-            "total_posted": len(posted_articles),
+            "total_posted": count_posted_articles(),
             "recent_posted": len(recent_articles),
             "recent_articles": recent_articles[-5:]  # Son 5 makale
         }
@@ -1323,7 +4870,8 @@ def reset_all_data():
             "pending_tweets.json", 
             "summaries.json",
             "hashtags.json",
-            "accounts.json"
+            "accounts.json",
+            LISTING_CACHE_FILE
         ]
         
         reset_count = 0
@@ -1337,6 +4885,12 @@ def reset_all_data():
                 save_json(file_path, [])
                 print(f"🆕 {file_path} oluşturuldu")
         
+        # Paylaşım günlüğünü ve indeksini de sıfırla
+        rewrite_posted_articles([])
+        posted_index.clear()
+        clear_pending_archive()
+        feed_seen_cache.clear()
+        
         return {
             "success": True,
             "message": f"✅ {reset_count} dosya sıfırlandı",
@@ -1353,14 +4907,17 @@ def reset_all_data():
 def clear_pending_tweets():
     """Sadece bekleyen tweet'leri temizle"""
     try:
-        pending_tweets = load_json("pending_tweets.json")
+        counts = {}
         
-        # Sadece posted olanları tut, pending olanları sil
-        posted_tweets = [t for t in pending_tweets if t.get("status") == "posted"]
+        def _clear(pending_tweets):
+            # Sonuçlanmış kayıtlar arşivde kalır, aktif kuyruk boşaltılır
+            active = _partition_pending_queue(pending_tweets)
+            counts["cleared"] = len([t for t in active if t.get("status") not in PENDING_TERMINAL_STATUSES])
+            return []
         
-        save_json("pending_tweets.json", posted_tweets)
+        update_json(PENDING_FILE, _clear)
         
-        cleared_count = len(pending_tweets) - len(posted_tweets)
+        cleared_count = counts["cleared"]
         
         return {
             "success": True,
@@ -1381,15 +4938,12 @@ def get_data_statistics():
         stats = {}
         
         # Paylaşılan makaleler
-        posted_articles = load_json("posted_articles.json")
-        stats["posted_articles"] = len(posted_articles)
+        stats["posted_articles"] = count_posted_articles()
         
         # Bekleyen tweet'ler
-        pending_tweets = load_json("pending_tweets.json")
-        pending_count = len([t for t in pending_tweets if t.get("status") == "pending"])
-        posted_count = len([t for t in pending_tweets if t.get("status") == "posted"])
-        stats["pending_tweets"] = pending_count
-        stats["posted_tweets_in_pending"] = posted_count
+        pending_counts = count_pending_tweets()
+        stats["pending_tweets"] = pending_counts.get("pending", 0)
+        stats["posted_tweets_in_pending"] = pending_counts.get("posted", 0)
         
         # Özetler
         summaries = load_json("summaries.json")
@@ -1419,7 +4973,7 @@ def get_data_statistics():
 def load_automation_settings():
     """Otomatikleştirme ayarlarını yükle"""
     try:
-        settings_data = load_json("automation_settings.json")
+        settings_data = load_json(AUTOMATION_SETTINGS_FILE)
         
         # Eğer liste ise (eski format), boş dict döndür
         if isinstance(settings_data, list):
@@ -1440,6 +4994,10 @@ def load_automation_settings():
             "working_hours_end": "18:00",
             "weekend_enabled": True,
             "rate_limit_delay": 2,
+            "history_retention_days": DEFAULT_HISTORY_RETENTION_DAYS,
+            "archive_expired_hashes": True,
+            "near_duplicate_detection": True,
+            "near_duplicate_max_distance": DEFAULT_NEAR_DUPLICATE_MAX_DISTANCE,
             "last_updated": datetime.now().isoformat()
         }
         
@@ -1465,6 +5023,10 @@ def load_automation_settings():
             "working_hours_end": "18:00",
             "weekend_enabled": True,
             "rate_limit_delay": 2,
+            "history_retention_days": DEFAULT_HISTORY_RETENTION_DAYS,
+            "archive_expired_hashes": True,
+            "near_duplicate_detection": True,
+            "near_duplicate_max_distance": DEFAULT_NEAR_DUPLICATE_MAX_DISTANCE,
             "last_updated": datetime.now().isoformat()
         }
 
@@ -1472,7 +5034,7 @@ def save_automation_settings(settings):
     """Otomatikleştirme ayarlarını kaydet"""
     try:
         settings["last_updated"] = datetime.now().isoformat()
-        save_json("automation_settings.json", settings)
+        save_json(AUTOMATION_SETTINGS_FILE, settings)
         return {"success": True, "message": "✅ Ayarlar başarıyla kaydedildi"}
     except Exception as e:
         return {"success": False, "message": f"❌ Ayarlar kaydedilemedi: {e}"}
@@ -1630,7 +5192,19 @@ def send_telegram_notification(message, tweet_url="", article_title=""):
             "disable_web_page_preview": False
         }
         
-        response = requests.post(url, json=payload, timeout=10)
+        telegram_limiter = get_rate_limiter("telegram")
+        if telegram_limiter.acquire() is None:
+            return {"success": False, "reason": "rate_limited"}
+        
+        response = http_post(url, json=payload)
+        
+        if response.status_code == 429:
+            # Telegram bekleme süresini parameters.retry_after ile bildirir
+            try:
+                retry_after = response.json().get("parameters", {}).get("retry_after", 30)
+            except ValueError:
+                retry_after = response.headers.get("Retry-After", 30)
+            telegram_limiter.update_from_headers(None, retry_after=retry_after)
         
         if response.status_code == 200:
             print(f"[SUCCESS] Telegram bildirimi gönderildi: {chat_id}")
@@ -1671,7 +5245,7 @@ def test_telegram_connection():
         
         # Bot bilgilerini al
         url = f"https://api.telegram.org/bot{bot_token}/getMe"
-        response = requests.get(url, timeout=10)
+        response = http_get(url)
         
         if response.status_code != 200:
             return {"success": False, "error": f"Bot token geçersiz: {response.status_code}"}
@@ -1688,7 +5262,10 @@ def test_telegram_connection():
             "parse_mode": "Markdown"
         }
         
-        send_response = requests.post(send_url, json=payload, timeout=10)
+        if get_rate_limiter("telegram").acquire() is None:
+            return {"success": False, "error": "Telegram rate limit bütçesi doldu"}
+        
+        send_response = http_post(send_url, json=payload)
         
         if send_response.status_code == 200:
             return {
@@ -1771,7 +5348,7 @@ def get_telegram_chat_id(bot_token=None):
             }
         
         url = f"https://api.telegram.org/bot{bot_token}/getUpdates"
-        response = requests.get(url, timeout=10)
+        response = http_get(url)
         
         if response.status_code != 200:
             return {"success": False, "error": "Bot token geçersiz"}
@@ -1898,18 +5475,25 @@ def load_mcp_config():
                     "fallback_enabled": True
                 },
                 "content_extraction": {
-                    "max_content_length": 2500,
-                    "min_content_length": 100,
+                    "max_content_length": DEFAULT_MAX_CONTENT_LENGTH,
+                    "min_content_length": DEFAULT_MIN_CONTENT_LENGTH,
                     "wait_time": 3000,
                     "remove_base64_images": True,
-                    "only_main_content": True
+                    "only_main_content": True,
+                    "max_workers": DEFAULT_FETCH_MAX_WORKERS,
+                    "per_host_limit": DEFAULT_FETCH_PER_HOST_LIMIT,
+                    "streaming": True,
+                    "max_download_bytes": DEFAULT_MAX_DOWNLOAD_BYTES
                 },
                 "ai_analysis": {
                     "enabled": True,
                     "max_tokens": 300,
                     "temperature": 0.7,
-                    "model": "deepseek/deepseek-chat-v3-0324:free",
-                    "fallback_enabled": True
+                    "model": "gemini-2.0-flash",
+                    "fallback_enabled": True,
+                    "structured_output": True,
+                    "parallel_analysis": True,
+                    "max_concurrency": GEMINI_MAX_CONCURRENCY
                 },
                 "last_updated": datetime.now().isoformat()
             }
@@ -2007,8 +5591,6 @@ def test_mcp_connection():
                 "details": "Konfigürasyonda server_url ayarlanmalı"
             }
         
-        # Gerçek MCP implementasyonunda burada MCP server'a test çağrısı yapılacak
-        # Şimdilik simüle ediyoruz
         print(f"[TEST] MCP server test ediliyor: {server_url}")
         
         # Test URL'si ile basit scrape denemesi